@@ -0,0 +1,231 @@
+# Block archives are a plain sequence of serialized blocks in height order, each prefixed with its length as a
+# little endian u32, the same framing the P2P protocol uses. `export` writes one from an explorer database, `import`
+# loads one into a new database without going through the network.
+#
+# Usage: python archive.py export <file> [--start 0] [--end <height>]
+#        python archive.py import <file> [--batch-size 50] [--workers <cpus>]
+
+import argparse
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator
+
+import psycopg
+from dotenv import load_dotenv
+
+from db import Database
+from explorer import Explorer, Request, Message as ExplorerMessage
+from node.types import Block
+
+ARCHIVE_BATCH_SIZE = 50
+EXPORT_CONCURRENCY = 4
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pg_dump.sql")
+# non-unique indexes the finalize queries rely on, built before the import instead of after it
+IMPORT_INDEXES = {"program_program_id_index", "transition_program_id_index"}
+
+
+def read_archive(f: BinaryIO) -> Iterator[bytes]:
+    while True:
+        size = f.read(4)
+        if not size:
+            return
+        if len(size) != 4:
+            raise ValueError("truncated archive")
+        data = f.read(int.from_bytes(size, "little"))
+        if len(data) != int.from_bytes(size, "little"):
+            raise ValueError("truncated archive")
+        yield data
+
+
+def write_archive(f: BinaryIO, data: bytes):
+    f.write(len(data).to_bytes(4, "little"))
+    f.write(data)
+
+
+def decode_blocks(records: list[bytes], start_height: int) -> list[Block]:
+    # runs in the decode pool, the importing process only unpickles the decoded blocks
+    blocks = []
+    for data in records:
+        block = Block.load(bytearray(data))
+        if block.header.metadata.height < start_height:
+            continue
+        blocks.append(block)
+    return blocks
+
+
+def split_schema(sql: str, schema: str) -> tuple[str, list[str], list[str]]:
+    """Splits pg_dump.sql into the objects, the keys needed while loading and what can be built afterwards.
+
+    Primary keys and unique indexes stay ahead of the import, as ON CONFLICT and the duplicate checks need them.
+    Foreign keys and the other indexes are deferred, except IMPORT_INDEXES.
+    """
+    sql = sql.replace("CREATE SCHEMA explorer;", f"CREATE SCHEMA {schema};").replace("explorer.", f"{schema}.")
+    post_data = re.search(r"^ALTER TABLE ONLY \S+\n    ADD CONSTRAINT ", sql, re.MULTILINE)
+    if post_data is None:
+        raise ValueError("no constraints found in the schema file")
+    before_load = []
+    after_load = []
+    for statement in sql[post_data.start():].split(";\n"):
+        statement = "\n".join(line for line in statement.splitlines() if not line.startswith("--")).strip()
+        if not statement:
+            continue
+        index = re.match(r"CREATE INDEX (\w+) ", statement)
+        if "PRIMARY KEY" in statement or statement.startswith("CREATE UNIQUE INDEX") or (
+                index is not None and index.group(1) in IMPORT_INDEXES):
+            before_load.append(statement)
+        else:
+            after_load.append(statement)
+    return sql[:post_data.start()], before_load, after_load
+
+
+async def connect() -> psycopg.AsyncConnection:
+    # pg_dump output resets the search_path, so the schema is loaded on its own connection instead of the pool
+    return await psycopg.AsyncConnection.connect(
+        f"host={os.environ['DB_HOST']} user={os.environ['DB_USER']} password={os.environ['DB_PASS']} "
+        f"dbname={os.environ['DB_DATABASE']}",
+        autocommit=True,
+    )
+
+
+async def create_schema(schema: str) -> list[str]:
+    with open(SCHEMA_FILE) as f:
+        objects, before_load, after_load = split_schema(f.read(), schema)
+    async with await connect() as conn:
+        cur = await conn.execute("SELECT 1 FROM information_schema.schemata WHERE schema_name = %s", (schema,))
+        if await cur.fetchone() is None:
+            print(f"creating schema {schema}, {len(after_load)} indexes and foreign keys are built after the import")
+            await conn.execute(objects)
+            for statement in before_load:
+                await conn.execute(statement)
+        else:
+            print(f"importing into the existing schema {schema}")
+    return after_load
+
+
+async def finish_schema(schema: str, after_load: list[str]):
+    async with await connect() as conn:
+        for statement in after_load:
+            constraint = re.search(r"ADD CONSTRAINT (\w+) ", statement)
+            if constraint is not None:
+                cur = await conn.execute(
+                    "SELECT 1 FROM pg_constraint c JOIN pg_namespace n ON n.oid = c.connamespace "
+                    "WHERE n.nspname = %s AND c.conname = %s",
+                    (schema, constraint.group(1))
+                )
+                if await cur.fetchone() is not None:
+                    continue
+                print(f"adding {constraint.group(1)}")
+            else:
+                statement = statement.replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1)
+                print(f"building {statement.split()[5]}")
+            await conn.execute(statement)
+
+
+async def report_error(msg: ExplorerMessage):
+    if msg.type in (ExplorerMessage.Type.DatabaseConnectError, ExplorerMessage.Type.DatabaseError):
+        print("database error:", msg.data)
+
+
+async def import_archive(path: str, batch_size: int, workers: int):
+    schema = os.environ["DB_SCHEMA"]
+    after_load = await create_schema(schema)
+    explorer = Explorer()
+    # nothing reads the explorer message queue here, only errors are worth printing
+    explorer.db.message_callback = report_error
+    await explorer.db.connect()
+    await explorer.db.migrate()
+    await explorer.check_genesis()
+    await explorer.db.load_chain_tip()
+    explorer.latest_height = explorer.db.chain_tip.latest_height
+    explorer.latest_block_hash = explorer.db.chain_tip.get_hash(explorer.latest_height)
+    start_height = explorer.latest_height + 1
+    print(f"importing from block {start_height}")
+
+    loop = asyncio.get_running_loop()
+    decodes: deque[asyncio.Future] = deque()
+    start = time.time()
+    imported = 0
+    with open(path, "rb") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        records = read_archive(f)
+        exhausted = False
+        while decodes or not exhausted:
+            # a couple of batches per worker in flight bounds the memory used by decoded blocks
+            while not exhausted and len(decodes) < workers * 2:
+                batch = [data for _, data in zip(range(batch_size), records)]
+                if not batch:
+                    exhausted = True
+                    break
+                decodes.append(loop.run_in_executor(pool, decode_blocks, batch, start_height))
+            if not decodes:
+                break
+            blocks = await decodes.popleft()
+            if not blocks:
+                continue
+            # raises on the first block that does not extend the chain. The rows are written with COPY, see CopyWriter
+            await explorer.node_request(Request.ProcessBlocks(blocks, bulk=True))
+            imported += len(blocks)
+            print(f"imported up to block {explorer.latest_height}, {imported / (time.time() - start):.1f} blocks/s")
+    await explorer.db.pool.close()
+    await finish_schema(schema, after_load)
+
+
+async def stored_blocks(db: Database, start: int, end: int) -> list[bytes]:
+    # the bytes the blocks were received as. Blocks rebuilt from their rows do not encode back to them
+    heights = list(range(start, end))
+    stored = await db.get_block_bytes(heights)
+    for height in heights:
+        if height not in stored:
+            raise ValueError(f"block {height} has no stored bytes, it was saved before the block_data table existed")
+    return [stored[height] for height in heights]
+
+
+async def export_archive(path: str, start: int, end: int | None):
+    db = Database(server=os.environ["DB_HOST"], user=os.environ["DB_USER"], password=os.environ["DB_PASS"],
+                  database=os.environ["DB_DATABASE"], schema=os.environ["DB_SCHEMA"],
+                  message_callback=report_error)
+    await db.connect()
+    latest_height = await db.get_latest_height()
+    end = latest_height if end is None else min(end, latest_height)
+    # ranges are read from the database concurrently and written in order
+    fetches: deque[asyncio.Task] = deque()
+    next_start = start
+    written = start - 1
+    with open(path, "wb") as f:
+        while fetches or next_start <= end:
+            while len(fetches) < EXPORT_CONCURRENCY and next_start <= end:
+                batch_end = min(next_start + ARCHIVE_BATCH_SIZE, end + 1)
+                fetches.append(asyncio.create_task(stored_blocks(db, next_start, batch_end)))
+                next_start = batch_end
+            for data in await fetches.popleft():
+                write_archive(f, data)
+                written += 1
+            print(f"exported up to block {written}")
+    await db.pool.close()
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Import or export length-prefixed block archives")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="write the blocks in the database to an archive")
+    export_parser.add_argument("file")
+    export_parser.add_argument("--start", type=int, default=0)
+    export_parser.add_argument("--end", type=int, default=None, help="last height, the latest block by default")
+    import_parser = commands.add_parser("import", help="load an archive into the database")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE,
+                               help="blocks per decode task and per transaction")
+    import_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    if args.command == "export":
+        asyncio.run(export_archive(args.file, args.start, args.end))
+    else:
+        asyncio.run(import_archive(args.file, args.batch_size, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Measures how fast the explorer writes a catch-up run of blocks into Postgres, committing every block on its own
+# (ProcessBlock, as at the tip) and committing --batch-size blocks per transaction (ProcessBlocks, as the sync does
+# while the queue is full). Blocks are copies of the testnet3 genesis block with their own height, hashes and
+# transaction and transition ids, so every block inserts the same rows. Blocks are written one INSERT per row
+# unless DB_BULK_WRITE=1 is set, which measures the COPY writer instead.
+#
+# Needs the DB_HOST, DB_USER, DB_PASS and DB_DATABASE settings of the explorer, and a scratch schema loaded from
+# pg_dump.sql. The schema is TRUNCATED before each run, never point --schema at a live explorer.
+#
+# Usage: python -m benchmark.batch_commit --schema explorer_bench [--blocks 1000] [--batch-size 50]
+
+import argparse
+import asyncio
+import os
+import time
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+
+def synthetic_blocks(count: int) -> list[Block]:
+    genesis = Testnet3.genesis_block
+    template = Block.load(bytearray(genesis.dump()))
+    blocks = []
+    previous_hash = genesis.block_hash
+    for height in range(1, count + 1):
+        template.header.metadata.height = u32(height)
+        template.block_hash = BlockHash(height.to_bytes(32, "little"))
+        template.previous_hash = previous_hash
+        for index, confirmed_transaction in enumerate(template.transactions):
+            transaction = confirmed_transaction.transaction
+            # ids have unique indexes, keep them apart from the genesis ones with the high byte
+            transaction.id = TransactionID((height << 8 | index).to_bytes(31, "little") + b"\x01")
+            transitions = list(transaction.execution.transitions)
+            if transaction.additional_fee.value is not None:
+                transitions.append(transaction.additional_fee.value.transition)
+            for transition_index, transition in enumerate(transitions):
+                transition.id = TransitionID(
+                    (height << 16 | index << 8 | transition_index).to_bytes(31, "little") + b"\x01"
+                )
+        blocks.append(LazyBlock.load(bytearray(template.dump())))
+        previous_hash = template.block_hash
+    return blocks
+
+
+async def run(blocks: list[Block], batch_size: int) -> float:
+    from explorer import Explorer, Request
+
+    explorer = Explorer()
+    await explorer.db.connect()
+    await explorer.db.clear_database()
+    await explorer.check_genesis()
+    await explorer.db.load_chain_tip()
+    explorer.latest_height = explorer.db.chain_tip.latest_height
+    explorer.latest_block_hash = explorer.db.chain_tip.get_hash(explorer.latest_height)
+    try:
+        start = time.perf_counter()
+        if batch_size == 1:
+            for block in blocks:
+                await explorer.node_request(Request.ProcessBlock(block))
+        else:
+            for i in range(0, len(blocks), batch_size):
+                await explorer.node_request(Request.ProcessBlocks(blocks[i:i + batch_size]))
+        elapsed = time.perf_counter() - start
+    finally:
+        await explorer.db.pool.close()
+    if explorer.latest_height != len(blocks):
+        raise ValueError(f"wrote up to block {explorer.latest_height} instead of {len(blocks)}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block commit rate with and without multi-block transactions")
+    parser.add_argument("--schema", required=True, help="scratch schema, truncated before each run")
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    os.environ["DB_SCHEMA"] = args.schema
+
+    blocks = synthetic_blocks(args.blocks)
+    print(f"{'blocks / commit':>15} {'blocks / s':>11}")
+    for batch_size in (1, args.batch_size):
+        elapsed = asyncio.run(run(blocks, batch_size))
+        print(f"{batch_size:>15} {len(blocks) / elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Measures Block.dump time against block size, for re-serializing stored blocks.
+# Uses the same synthesized blocks as block_load.
+#
+# Usage: python -m benchmark.block_dump
+
+import time
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+from .block_load import SCALES, ROUNDS, scaled_block
+
+
+def main():
+    genesis = Testnet3.genesis_block
+    print(f"{'transactions':>12} {'size (KB)':>10} {'dump (ms)':>10} {'us / KB':>8}")
+    for scale in SCALES:
+        block = Block.load(bytearray(scaled_block(genesis, scale)))
+        best = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            data = block.dump()
+            best = min(best, time.perf_counter() - start)
+        size_kb = len(data) / 1024
+        print(f"{len(block.transactions.transactions):>12} {size_kb:>10.1f} {best * 1000:>10.2f} "
+              f"{best * 1e6 / size_kb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Measures Block.load time against block size, next to LazyBlock.load which only locates the transactions.
+# Blocks are synthesized by repeating the genesis transactions, so the time per KB should stay flat
+# as the block grows.
+#
+# Usage: python -m benchmark.block_load
+
+import time
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+SCALES = [1, 10, 50, 100, 200, 400]
+ROUNDS = 3
+
+
+def scaled_block(block: Block, scale: int) -> bytes:
+    transactions = list(block.transactions) * scale
+    return Block(
+        block_hash=block.block_hash,
+        previous_hash=block.previous_hash,
+        header=block.header,
+        transactions=Transactions(transactions=Vec[ConfirmedTransaction, u32](transactions)),
+        coinbase=block.coinbase,
+        signature=block.signature,
+    ).dump()
+
+
+def best_load_time(type_, data: bytes) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        type_.load(bytearray(data))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    genesis = Testnet3.genesis_block
+    print(f"{'transactions':>12} {'size (KB)':>10} {'load (ms)':>10} {'us / KB':>8} {'lazy (ms)':>10}")
+    for scale in SCALES:
+        data = scaled_block(genesis, scale)
+        best = best_load_time(Block, data)
+        lazy = best_load_time(LazyBlock, data)
+        size_kb = len(data) / 1024
+        print(f"{len(genesis.transactions.transactions) * scale:>12} {size_kb:>10.1f} {best * 1000:>10.2f} "
+              f"{best * 1e6 / size_kb:>8.1f} {lazy * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
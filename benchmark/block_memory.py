@@ -0,0 +1,42 @@
+# Measures the memory held by fully decoded Block object graphs.
+# Several copies of each synthesized block are decoded and kept alive, and the retained size is reported per block,
+# like the sync path and the web UI do when they hold many blocks at once.
+#
+# Usage: python -m benchmark.block_memory
+
+import gc
+import tracemalloc
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+from .block_load import scaled_block
+
+SCALES = [1, 10, 50]
+BLOCKS = 20
+
+
+def retained_per_block(data: bytes) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    blocks = [Block.load(bytearray(data)) for _ in range(BLOCKS)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del blocks
+    return (after - before) / BLOCKS
+
+
+def main():
+    genesis = Testnet3.genesis_block
+    print(f"{'transactions':>12} {'wire (KB)':>10} {'held (KB)':>10} {'ratio':>6}")
+    for scale in SCALES:
+        data = scaled_block(genesis, scale)
+        held = retained_per_block(data)
+        print(f"{len(genesis.transactions.transactions) * scale:>12} {len(data) / 1024:>10.1f} {held / 1024:>10.1f} "
+              f"{held / len(data):>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
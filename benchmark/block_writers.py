@@ -0,0 +1,72 @@
+# Writes the same run of blocks into Postgres once with InsertWriter (one INSERT per row) and once with CopyWriter
+# (COPY per table), checks that both leave the same rows in every table a block is saved to, and reports the write
+# rate of each. Blocks are the synthetic copies of the genesis block from benchmark/batch_commit.py.
+#
+# Needs the DB_HOST, DB_USER, DB_PASS and DB_DATABASE settings of the explorer, and a scratch schema loaded from
+# pg_dump.sql and migrated. The schema is TRUNCATED before each run, never point --schema at a live explorer.
+#
+# Usage: python -m benchmark.block_writers --schema explorer_bench [--blocks 200] [--batch-size 50]
+
+import argparse
+import asyncio
+import os
+import time
+
+import db
+from node.testnet3 import Testnet3
+from node.types import *
+
+from .batch_commit import synthetic_blocks
+
+
+async def run(blocks: list[Block], batch_size: int, bulk: bool) -> tuple[float, dict[str, list]]:
+    async def message(_): pass
+
+    database = db.Database(server=os.environ["DB_HOST"], user=os.environ["DB_USER"], password=os.environ["DB_PASS"],
+                           database=os.environ["DB_DATABASE"], schema=os.environ["DB_SCHEMA"],
+                           message_callback=message)
+    await database.connect()
+    try:
+        # ids restart at 1, so both writers hand out the same ones
+        await database.clear_database()
+        await database.save_block(Testnet3.genesis_block, bulk)
+        start = time.perf_counter()
+        for i in range(0, len(blocks), batch_size):
+            async with database.batch():
+                for block in blocks[i:i + batch_size]:
+                    await database.save_block(block, bulk)
+        elapsed = time.perf_counter() - start
+        rows = {}
+        async with database.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                for table in (*db.BLOCK_TABLES, "program_function"):
+                    await cur.execute(f"SELECT * FROM {table}")
+                    rows[table] = sorted((await cur.fetchall()), key=repr)
+    finally:
+        await database.pool.close()
+    return elapsed, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rows and write rate of the INSERT and COPY block writers")
+    parser.add_argument("--schema", required=True, help="scratch schema, truncated before each run")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    os.environ["DB_SCHEMA"] = args.schema
+
+    blocks = synthetic_blocks(args.blocks)
+    insert_elapsed, insert_rows = asyncio.run(run(blocks, args.batch_size, False))
+    copy_elapsed, copy_rows = asyncio.run(run(blocks, args.batch_size, True))
+    for table in insert_rows:
+        if insert_rows[table] != copy_rows[table]:
+            raise ValueError(f"writers differ in table {table}: "
+                             f"{len(insert_rows[table])} rows with INSERT, {len(copy_rows[table])} rows with COPY")
+    print(f"{'writer':>7} {'blocks / s':>11}")
+    print(f"{'insert':>7} {len(blocks) / insert_elapsed:>11.1f}")
+    print(f"{'copy':>7} {len(blocks) / copy_elapsed:>11.1f}")
+    print(f"same rows in {len(insert_rows)} tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Crawls a local network of simulated peers (benchmark/peer.py --listeners N, in its own process) with
+# LightNodeState, starting from one of them. Every peer advertises all the others, so the crawler has to dedup
+# the addresses and queue them behind its connection limit. Reports how long discovery and the first height from
+# each peer take, and the longest the event loop went without running a 10 ms ticker, which is what the explorer
+# would feel while crawling.
+#
+# Usage: python -m benchmark.crawler [--listeners 500] [--timeout 60]
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+
+from node.light_node import LightNodeState, LIGHT_NODE_MAX_CONNECTIONS
+
+TICK_IN_SECS = 0.01
+
+
+async def ticker(stalls: list[float]):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_IN_SECS)
+        stalls.append(time.perf_counter() - start - TICK_IN_SECS)
+
+
+async def run(port: int, listeners: int, timeout: float):
+    state = LightNodeState()
+    stalls = []
+    tick_task = asyncio.create_task(ticker(stalls))
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    discovered_at = reported_at = None
+    # peers beyond the connection limit stay queued until a connection frees up
+    reachable = min(listeners, LIGHT_NODE_MAX_CONNECTIONS)
+    state.connect("127.0.0.1", port)
+    while time.perf_counter() - start < timeout:
+        await asyncio.sleep(0.05)
+        if discovered_at is None and len(state.states) >= listeners:
+            discovered_at = time.perf_counter() - start
+        reported = sum(1 for peer in state.states.values() if peer.height is not None)
+        if reported >= reachable:
+            reported_at = time.perf_counter() - start
+            break
+    tick_task.cancel()
+    for node in list(state.nodes.values()):
+        await node.close()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def seconds(value: float | None) -> str:
+        return "not reached" if value is None else f"{value:.2f}s"
+
+    print(f"peers: {listeners}, connection limit: {LIGHT_NODE_MAX_CONNECTIONS}")
+    print(f"all addresses known after {seconds(discovered_at)}, {len(state.states)} in the table")
+    print(f"height from {reachable} peers after {seconds(reported_at)}")
+    stalls.sort()
+    print(f"event loop stall p50 {stalls[len(stalls) // 2] * 1000:.2f} ms, max {stalls[-1] * 1000:.2f} ms")
+    # ru_maxrss is in KB on Linux
+    print(f"peak RSS grew by {(rss_after - rss_before) / 1024:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peer crawler benchmark against simulated peers")
+    parser.add_argument("--listeners", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    peer = subprocess.Popen(
+        [sys.executable, "-m", "benchmark.peer", "--blocks", "100", "--port", "0",
+         "--listeners", str(args.listeners)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        port = int(peer.stdout.readline())
+        asyncio.run(run(port, args.listeners, args.timeout))
+    finally:
+        peer.terminate()
+        peer.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# Offline fixtures for the benchmark suite: the testnet3 genesis block, synthetic blocks full of executions or
+# deployments, and synthetic programs of varying size. Everything is built from the genesis block and
+# hand-assembled values, so no node, database or network is needed.
+
+import os
+
+from node.testnet3 import Testnet3, param
+from node.types import *
+
+from .block_load import scaled_block
+
+# any valid address works here, the deployments are never verified
+OWNER = "aleo1rhgdu77hgyqd3xjj8ucu3jj9r2krwz6mnzyd80gncr5fxcwlh5rsvzp9px"
+GENESIS = os.path.join(os.path.dirname(param.__file__), "block.genesis")
+
+
+def _identifier(name: str) -> Identifier:
+    return Identifier(value=name)
+
+
+def _register(locator: int) -> Register:
+    return LocatorRegister(locator=VarInt[u64](u64(locator)))
+
+
+def _u64_type() -> PlaintextType:
+    return LiteralPlaintextType(literal_type=LiteralType.U64)
+
+
+def _function(name: str, instructions: int) -> Function:
+    body = []
+    for i in range(instructions):
+        literals = Literals[2](
+            operands=Vec[Operand | NoneType, 3]([
+                RegisterOperand(register=_register(i)),
+                LiteralOperand(literal=Literal(type_=Literal.Type.U64, primitive=u64(i))),
+                None,
+            ]),
+            destination=_register(instructions + i),
+        )
+        body.append(Instruction(type_=Instruction.Type.Add, literals=literals))
+    finalize = Finalize(
+        name=_identifier(name),
+        inputs=Vec[FinalizeInput, u16]([FinalizeInput(register=_register(0), plaintext_type=_u64_type())]),
+        commands=Vec[Command, u16]([
+            SetCommand(mapping=_identifier("account"), key=RegisterOperand(register=_register(0)),
+                       value=RegisterOperand(register=_register(1))),
+        ]),
+    )
+    return Function(
+        name=_identifier(name),
+        inputs=Vec[FunctionInput, u16]([
+            FunctionInput(register=_register(0), value_type=PublicValueType(plaintext_type=_u64_type())),
+        ]),
+        instructions=Vec[Instruction, u32](body),
+        outputs=Vec[FunctionOutput, u16]([
+            FunctionOutput(operand=RegisterOperand(register=_register(instructions)),
+                           value_type=PrivateValueType(plaintext_type=_u64_type())),
+        ]),
+        finalize=Option[Tuple[FinalizeCommand, Finalize]](Tuple[FinalizeCommand, Finalize]((
+            FinalizeCommand(operands=Vec[Operand, u8]([RegisterOperand(register=_register(0))])),
+            finalize,
+        ))),
+    )
+
+
+def program(name: str, functions: int, instructions: int = 20) -> Program:
+    account = _identifier("account")
+    point = _identifier("point")
+    return Program(
+        id_=ProgramID(name=_identifier(name), network=_identifier("aleo")),
+        imports=Vec[Import, u8]([]),
+        mappings={account: Mapping(name=account, key=MapKey(name=_identifier("owner"), plaintext_type=_u64_type()),
+                                   value=MapValue(name=_identifier("amount"), plaintext_type=_u64_type()))},
+        structs={point: Struct(name=point, members=Vec[Tuple[Identifier, PlaintextType], u16]([
+            Tuple[Identifier, PlaintextType]((_identifier("x"), _u64_type())),
+        ]))},
+        records={},
+        closures={},
+        functions={
+            _identifier(f"f{i}"): _function(f"f{i}", instructions) for i in range(functions)
+        },
+    )
+
+
+def _g1(value: int) -> G1Affine:
+    return G1Affine(x=Fq(value=value), flags=False)
+
+
+def _g2(value: int) -> G2Affine:
+    return G2Affine(x=Fq2(c0=Fq(value=value), c1=Fq(value=value + 1), flags=False))
+
+
+def _verifying_key() -> VerifyingKey:
+    return VerifyingKey(
+        circuit_info=CircuitInfo(num_public_inputs=usize(8), num_variables=usize(1 << 12),
+                                 num_constraints=usize(1 << 12), num_non_zero_a=usize(1 << 13),
+                                 num_non_zero_b=usize(1 << 13), num_non_zero_c=usize(1 << 13)),
+        circuit_commitments=Vec[KZGCommitment, u64]([KZGCommitment(element=_g1(i)) for i in range(12)]),
+        verifier_key=SonicVerifierKey(
+            vk=KZGVerifierKey(g=_g1(1), gamma_g=_g1(2), h=_g2(3), beta_h=_g2(5)),
+            degree_bounds_and_neg_powers_of_h=Option[Vec[Tuple[usize, G2Affine], u64]](None),
+            supported_degree=usize(1 << 16),
+            max_degree=usize(1 << 16),
+        ),
+        id_=Vec[u8, 32]([u8(i) for i in range(32)]),
+    )
+
+
+def _certificate() -> Certificate:
+    return Certificate(pc_proof=BatchLCProof(
+        proof=BatchProof(proof=Vec[KZGProof, u64]([KZGProof(w=_g1(7), random_v=Option[Field](None))])),
+        evaluations=Option[Vec[Field, u64]](None),
+    ))
+
+
+def _deploy(index: int, functions: int) -> ConfirmedTransaction:
+    genesis = Testnet3.genesis_block
+    execution = genesis.transactions.transactions[0].transaction.execution
+    deployed = program(f"bench_{index}", functions)
+    verifying_keys = [
+        Tuple[Identifier, VerifyingKey, Certificate]((name, _verifying_key(), _certificate()))
+        for name in deployed.functions
+    ]
+    transaction = DeployTransaction(
+        id_=TransactionID(index.to_bytes(32, "little")),
+        owner=ProgramOwner(address=Address.loads(OWNER), signature=genesis.signature),
+        deployment=Deployment(edition=u16(0), program=deployed,
+                              verifying_keys=Vec[Tuple[Identifier, VerifyingKey, Certificate], u16](verifying_keys)),
+        fee=Fee(transition=execution.transitions[0], global_state_root=execution.global_state_root,
+                inclusion_proof=Option[Proof](None)),
+    )
+    return AcceptedDeploy(index=u32(index), transaction=transaction, finalize=Vec[FinalizeOperation, u16]([]))
+
+
+def deployment_block(deployments: int, functions: int) -> bytes:
+    genesis = Testnet3.genesis_block
+    return Block(
+        block_hash=genesis.block_hash,
+        previous_hash=genesis.previous_hash,
+        header=genesis.header,
+        transactions=Transactions(transactions=Vec[ConfirmedTransaction, u32](
+            [_deploy(i, functions) for i in range(deployments)]
+        )),
+        coinbase=genesis.coinbase,
+        signature=genesis.signature,
+    ).dump()
+
+
+def blocks() -> dict[str, bytes]:
+    genesis = Testnet3.genesis_block
+    return {
+        "genesis": open(GENESIS, "rb").read(),
+        "execution_x10": scaled_block(genesis, 10),
+        "execution_x100": scaled_block(genesis, 100),
+        "deployment_4x5": deployment_block(4, 5),
+        "deployment_16x20": deployment_block(16, 20),
+    }
+
+
+def programs() -> dict[str, bytes]:
+    return {
+        f"program_{functions}": program("bench", functions).dump()
+        for functions in [1, 10, 50]
+    }
@@ -0,0 +1,83 @@
+# Measures Frame parsing throughput over a recorded stream of length-prefixed messages, the way Node reads them.
+# The control stream holds only the small handshake and keepalive messages, where per-frame dispatch dominates;
+# the mixed stream adds a block response and a ping carrying block locators every few frames.
+#
+# Usage: python -m benchmark.frame_parse
+
+import time
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+FRAMES = 20_000
+ROUNDS = 5
+# one batch of bulk messages per this many frames in the mixed stream
+BULK_EVERY = 50
+
+
+def control_messages() -> list[Message]:
+    return [
+        ChallengeRequest(version=Testnet3.version, listener_port=u16(14133), node_type=NodeType.Client,
+                         address=Address.loads("aleo1rhgdu77hgyqd3xjj8ucu3jj9r2krwz6mnzyd80gncr5fxcwlh5rsvzp9px"),
+                         nonce=u64(1)),
+        Ping(version=Testnet3.version, node_type=NodeType.Client, block_locators=Option[BlockLocators](None)),
+        Pong(is_fork=Option[bool_](bool_())),
+        BlockRequest(start_height=u32(0), end_height=u32(1)),
+        PeerRequest(),
+        PuzzleRequest(),
+        Disconnect(reason=DisconnectReason.NoReasonGiven),
+    ]
+
+
+def bulk_messages() -> list[Message]:
+    genesis = Testnet3.genesis_block
+    recents = {u32(height): genesis.block_hash for height in range(100)}
+    checkpoints = {u32(height * 10000): genesis.block_hash for height in range(10)}
+    return [
+        Ping(version=Testnet3.version, node_type=NodeType.Validator,
+             block_locators=Option[BlockLocators](BlockLocators(recents=recents, checkpoints=checkpoints))),
+        BlockResponse(request=BlockRequest(start_height=u32(0), end_height=u32(1)), blocks=Vec[Block, u8]([genesis])),
+    ]
+
+
+def record(messages: list[Message], count: int) -> tuple[bytes, int]:
+    frames = []
+    for i in range(count):
+        message = messages[i % len(messages)]
+        data = Frame(type_=message.type, message=message).dump()
+        frames.append(len(data).to_bytes(4, "little") + data)
+    return b"".join(frames), count
+
+
+def parse_stream(stream: bytes):
+    view = memoryview(stream)
+    offset = 0
+    while offset < len(stream):
+        size = int.from_bytes(view[offset:offset + 4], "little")
+        offset += 4
+        Frame.load(bytearray(view[offset:offset + size]))
+        offset += size
+
+
+def best_time(stream: bytes) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        parse_stream(stream)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    control = control_messages()
+    mixed = control * (BULK_EVERY // len(control)) + bulk_messages()
+    print(f"{'stream':>8} {'frames':>7} {'size (KB)':>10} {'frames / s':>11} {'MB / s':>8}")
+    for name, messages, count in [("control", control, FRAMES), ("mixed", mixed, FRAMES // 10)]:
+        stream, frames = record(messages, count)
+        best = best_time(stream)
+        print(f"{name:>8} {frames:>7} {len(stream) / 1024:>10.1f} {frames / best:>11.0f} "
+              f"{len(stream) / best / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
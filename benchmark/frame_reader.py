@@ -0,0 +1,94 @@
+# Measures framing throughput over a local socket pair: a writer task streams length-prefixed frames and the
+# reader splits them the way each node implementation does. Frames are only split and sliced, not decoded, so
+# the numbers show the cost of buffering alone.
+#
+#   readexactly  Node before FrameReader, two readexactly calls and a bytearray copy per frame
+#   buffer       LightNode before FrameReader, 4 KB reads into util.buffer.Buffer
+#   frame_reader util.buffer.FrameReader
+#
+# FrameReader only gains on small frames, many of which arrive in one read, and on frames of 128 KB and more, which
+# readexactly gathers in chunks of the StreamReader limit. 64 KB frames come out even with readexactly, run to run
+# noise is larger than the difference.
+#
+# Usage: python -m benchmark.frame_reader
+
+import asyncio
+import socket
+import time
+
+from util.buffer import Buffer, FrameReader
+
+ROUNDS = 3
+# (name, frame size, frame count), small keepalive frames and block responses of a few sizes
+STREAMS = [
+    ("small", 64, 50_000),
+    ("medium", 64 * 1024, 2_000),
+    ("large", 2 * 1024 * 1024, 100),
+]
+
+
+async def read_readexactly(reader: asyncio.StreamReader, count: int):
+    for _ in range(count):
+        size = int.from_bytes(await reader.readexactly(4), "little")
+        bytearray(await reader.readexactly(size))
+
+
+async def read_buffer(reader: asyncio.StreamReader, count: int):
+    buffer = Buffer()
+    while count:
+        data = await reader.read(4096)
+        if not data:
+            raise Exception("connection closed")
+        buffer.write(data)
+        while buffer.count() >= 4:
+            size = int.from_bytes(buffer.peek(4), byteorder="little")
+            if buffer.count() < size + 4:
+                break
+            buffer.read(4)
+            buffer.read(size)
+            count -= 1
+
+
+async def read_frame_reader(reader: asyncio.StreamReader, count: int):
+    frames = FrameReader(reader)
+    for _ in range(count):
+        await frames.read_frame()
+
+
+READERS = {
+    "readexactly": read_readexactly,
+    "buffer": read_buffer,
+    "frame_reader": read_frame_reader,
+}
+
+
+async def write_stream(writer: asyncio.StreamWriter, frame: bytes, count: int):
+    for _ in range(count):
+        writer.write(frame)
+        await writer.drain()
+    writer.close()
+
+
+async def run(read, size: int, count: int) -> float:
+    left, right = socket.socketpair()
+    # both ends are kept, a dropped StreamWriter closes its socket
+    reader, reader_writer = await asyncio.open_connection(sock=left)
+    _, writer = await asyncio.open_connection(sock=right)
+    frame = size.to_bytes(4, "little") + bytes(size)
+    start = time.perf_counter()
+    await asyncio.gather(read(reader, count), write_stream(writer, frame, count))
+    elapsed = time.perf_counter() - start
+    reader_writer.close()
+    return elapsed
+
+
+async def main():
+    print(f"{'stream':>8} {'reader':>13} {'frames / s':>11} {'MB / s':>9}")
+    for name, size, count in STREAMS:
+        for reader_name, read in READERS.items():
+            best = min([await run(read, size, count) for _ in range(ROUNDS)])
+            print(f"{name:>8} {reader_name:>13} {count / best:>11.0f} {count * (size + 4) / best / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
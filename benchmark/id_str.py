@@ -0,0 +1,79 @@
+# Measures str() on the IDs of a decoded block, the way _save_block and the web routes use them.
+# The first pass pays for bech32m encoding; later passes hit the memoized string.
+#
+# Usage: python -m benchmark.id_str
+
+import time
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+from .block_load import SCALES, ROUNDS, scaled_block
+
+# _save_block and the routes stringify the same ID several times
+REPEATS = 5
+
+
+def block_ids(block: Block):
+    # the IDs and addresses of a block that are stringified when it is saved
+    yield block.block_hash
+    yield block.previous_hash
+    fees = []
+    executions = []
+    for confirmed_transaction in block.transactions:
+        transaction = confirmed_transaction.transaction
+        yield transaction.id
+        if isinstance(transaction, DeployTransaction):
+            yield transaction.owner.address
+            fees.append(transaction.fee)
+        elif isinstance(transaction, ExecuteTransaction):
+            executions.append(transaction.execution)
+            if transaction.additional_fee.value is not None:
+                fees.append(transaction.additional_fee.value)
+        elif isinstance(transaction, FeeTransaction):
+            fees.append(transaction.fee)
+        if isinstance(confirmed_transaction, RejectedExecute):
+            executions.append(confirmed_transaction.rejected)
+    for execution in executions:
+        yield execution.global_state_root
+        for transition in execution.transitions:
+            yield transition.id
+    for fee in fees:
+        yield fee.global_state_root
+        yield fee.transition.id
+    if block.coinbase.value is not None:
+        for partial_solution in block.coinbase.value.partial_solutions:
+            yield partial_solution.address
+
+
+def measure(data: bytes) -> tuple[float, float]:
+    first = 0.
+    rest = 0.
+    for _ in range(ROUNDS):
+        block = Block.load(bytearray(data))
+        ids = list(block_ids(block))
+        start = time.perf_counter()
+        for i in ids:
+            str(i)
+        first += time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(REPEATS - 1):
+            for i in ids:
+                str(i)
+        rest += time.perf_counter() - start
+    return first / ROUNDS, rest / ROUNDS
+
+
+def main():
+    genesis = Testnet3.genesis_block
+    print(f"{'transactions':>12} {'ids':>6} {'first (ms)':>11} {'cached (ms)':>12}")
+    for scale in SCALES:
+        data = scaled_block(genesis, scale)
+        count = len(list(block_ids(Block.load(bytearray(data)))))
+        first, cached = measure(data)
+        print(f"{len(genesis.transactions.transactions) * scale:>12} {count:>6} {first * 1000:>11.3f} "
+              f"{cached * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
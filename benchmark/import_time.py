@@ -0,0 +1,66 @@
+# Measures cold-start import time of the entry points, each in a fresh interpreter like the explorer and the
+# webui / api uvicorn processes start, plus the cost of the first Testnet3.genesis_block access.
+#
+# Usage: python -m benchmark.import_time
+
+import os
+import subprocess
+import sys
+
+ROUNDS = 5
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# what each process imports: main.py the Explorer, uvicorn "webui:app" and "api:app"
+ENTRY_POINTS = {
+    "node.types": "import node.types",
+    "db": "import db",
+    "main": "from explorer import Explorer",
+    "webui": "import webui",
+    "api": "import api",
+}
+
+TIMED_IMPORT = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+TIMED_GENESIS = """
+import time
+from node.testnet3 import param
+data = open(param.GENESIS_PATH, "rb").read()
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def best_of(code: str) -> float | None:
+    best = None
+    for _ in range(ROUNDS):
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{'import':>12} {'cold (ms)':>10}")
+    for name, statement in ENTRY_POINTS.items():
+        elapsed = best_of(TIMED_IMPORT.format(statement=statement))
+        print(f"{name:>12} {'unavailable' if elapsed is None else f'{elapsed * 1000:.1f}':>10}")
+
+    print(f"{'genesis':>12} {'first (ms)':>10}")
+    for name, statement in [
+        ("decode", "param.Block.load(bytearray(data))"),
+        ("access", "param.Testnet3.genesis_block"),
+    ]:
+        elapsed = best_of(TIMED_GENESIS.format(statement=statement))
+        print(f"{name:>12} {'unavailable' if elapsed is None else f'{elapsed * 1000:.2f}':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Compares the checked Int constructor used for user-supplied values with the trusted path the decoder takes.
+# The block column decodes the genesis block, which creates most of its Int values through read().
+#
+# Usage: python -m benchmark.int_construct
+
+import time
+
+from node.testnet3 import Testnet3
+from node.types import *
+
+COUNT = 200_000
+ROUNDS = 3
+
+
+def best_time(func) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'type':>6} {'checked (ns)':>13} {'trusted (ns)':>13} {'read (ns)':>10}")
+    for type_ in [u8, u16, u32, u64, u128, i64]:
+        values = [type_.max - i % (type_.max - type_.min + 1) for i in range(COUNT)]
+        data = b"".join(type_(v).dump() for v in values)
+
+        def checked():
+            for v in values:
+                type_(v)
+
+        def trusted():
+            for v in values:
+                type_.trusted(v)
+
+        def read():
+            cursor = Cursor(data)
+            for _ in range(COUNT):
+                type_.read(cursor)
+
+        print(f"{type_.__name__:>6} {best_time(checked) * 1e9 / COUNT:>13.1f} {best_time(trusted) * 1e9 / COUNT:>13.1f} "
+              f"{best_time(read) * 1e9 / COUNT:>10.1f}")
+
+    data = Testnet3.genesis_block.dump()
+    block = best_time(lambda: Block.load(bytearray(data)))
+    print(f"genesis Block.load: {block * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# Syncs a Node from the simulated peer in benchmark/peer.py, started in its own process so serving blocks does not
+# compete with the node for the event loop. The explorer is replaced by an in-memory stand-in that keeps block
+# hashes for the Ping fork check and spends --apply-delay seconds per block in place of the database.
+#
+# Reports blocks/s and, per block, the latency of each stage:
+#   request  BlockRequest sent until its BlockResponse is decoded (network, peer and frame decoding)
+#   queue    decoded until the explorer starts applying it (reorder buffer and ingest queue)
+#   apply    the ProcessBlock request
+# plus the growth of the peak resident memory of this process.
+#
+# Usage: python -m benchmark.p2p_sync --blocks 2000 [--scale 10] [--apply-delay 0.001]
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+
+import explorer
+from node.node import Node
+from node.testnet3 import Testnet3
+from node.types import *
+
+
+class InMemoryExplorer:
+    def __init__(self, apply_delay: float):
+        self.apply_delay = apply_delay
+        self.height = 0
+        self.hashes = {0: Testnet3.genesis_block.block_hash}
+        self.done = asyncio.Event()
+        self.target = 0
+        self.apply_started: dict[int, float] = {}
+        self.apply_finished: dict[int, float] = {}
+
+    async def message(self, msg):
+        pass
+
+    async def request(self, request):
+        match type(request):
+            case explorer.Request.GetLatestHeight:
+                return self.height
+            case explorer.Request.GetBlockHashByHeight:
+                return self.hashes.get(request.height)
+            case explorer.Request.GetDevMode:
+                return False
+            case explorer.Request.ProcessBlock:
+                await self.apply(request.block)
+            case explorer.Request.ProcessBlocks:
+                for block in request.blocks:
+                    await self.apply(block)
+
+    async def apply(self, block: Block):
+        height = block.header.metadata.height
+        self.apply_started[height] = time.perf_counter()
+        if block.previous_hash != self.hashes[self.height]:
+            raise ValueError(f"block {height} does not extend the chain")
+        if self.apply_delay:
+            await asyncio.sleep(self.apply_delay)
+        self.height = height
+        self.hashes[height] = block.block_hash
+        self.apply_finished[height] = time.perf_counter()
+        if height >= self.target:
+            self.done.set()
+
+
+class InstrumentedNode(Node):
+    # records when each height was requested and when it arrived
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested: dict[int, float] = {}
+        self.received: dict[int, float] = {}
+
+    async def send_message(self, message: Message):
+        if isinstance(message, BlockRequest):
+            now = time.perf_counter()
+            for height in range(message.start_height, message.end_height):
+                self.requested[height] = now
+        await super().send_message(message)
+
+    async def parse_message(self, frame: Frame):
+        if frame.type == Message.Type.BlockResponse:
+            now = time.perf_counter()
+            for block in frame.message.blocks:
+                self.received.setdefault(block.header.metadata.height, now)
+        await super().parse_message(frame)
+
+
+def percentiles(values: list[float]) -> str:
+    if not values:
+        return "-"
+    values = sorted(values)
+    p50 = values[len(values) // 2]
+    p95 = values[min(len(values) - 1, len(values) * 95 // 100)]
+    return f"{p50 * 1000:>9.2f} {p95 * 1000:>9.2f} {values[-1] * 1000:>9.2f}"
+
+
+async def run(port: int, blocks: int, apply_delay: float):
+    fake = InMemoryExplorer(apply_delay)
+    fake.target = blocks
+    node = InstrumentedNode(explorer_message=fake.message, explorer_request=fake.request)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    await node.connect("127.0.0.1", port)
+    try:
+        await fake.done.wait()
+        elapsed = time.perf_counter() - start
+    finally:
+        for task in (node.worker_task, node.ping_task, node.sync.apply_task):
+            if task is not None:
+                task.cancel()
+        if node.writer is not None:
+            node.writer.close()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    heights = range(1, blocks + 1)
+    stages = {
+        "request": [node.received[h] - node.requested[h] for h in heights if h in node.requested],
+        "queue": [fake.apply_started[h] - node.received[h] for h in heights if h in node.received],
+        "apply": [fake.apply_finished[h] - fake.apply_started[h] for h in heights],
+    }
+    print(f"synced {blocks} blocks in {elapsed:.2f}s, {blocks / elapsed:.1f} blocks/s "
+          f"(including the handshake and the first ping)")
+    print(f"{'stage':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    for name, values in stages.items():
+        print(f"{name:>8} {percentiles(values)}")
+    # ru_maxrss is in KB on Linux
+    print(f"peak RSS grew by {(rss_after - rss_before) / 1024:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end P2P sync benchmark against a simulated peer")
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--scale", type=int, default=1,
+                        help="times the genesis transactions are repeated in each block")
+    parser.add_argument("--apply-delay", type=float, default=0., help="seconds spent applying each block")
+    args = parser.parse_args()
+
+    peer = subprocess.Popen(
+        [sys.executable, "-m", "benchmark.peer", "--blocks", str(args.blocks), "--scale", str(args.scale),
+         "--port", "0"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        port = int(peer.stdout.readline())
+        asyncio.run(run(port, args.blocks, args.apply_delay))
+    finally:
+        peer.terminate()
+        peer.wait()
+
+
+if __name__ == "__main__":
+    main()
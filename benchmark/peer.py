@@ -0,0 +1,165 @@
+# A local stand-in for a snarkOS peer, for measuring sync without a live network. It speaks the side of the
+# protocol Node talks to: answers the ChallengeRequest with a ChallengeResponse and its own ChallengeRequest,
+# sends Pings with BlockLocators for its chain, answers Pings with Pongs and serves BlockRequests with packed
+# BlockResponses, and answers PeerRequests with the addresses of the other simulated peers. The chain is synthetic: the testnet3 genesis block followed by copies of a template block
+# with their own height and hashes, linked through previous_hash.
+#
+# Usage: python -m benchmark.peer --blocks 2000 [--scale 10] [--port 4133] [--listeners 1]
+#
+# The listening port is printed as the first line of output, so --port 0 picks a free one. With --listeners N,
+# N peers sharing the chain listen on consecutive ports from the printed one, each advertising all the others.
+
+import argparse
+import asyncio
+import socket
+import struct
+
+from node.testnet3 import Testnet3
+from node.types import *
+from util.buffer import FrameReader
+
+from .block_load import scaled_block
+from .fixtures import OWNER
+
+PING_INTERVAL_IN_SECS = 5
+# a BlockResponse holds at most 255 blocks
+MAX_BLOCKS_PER_RESPONSE = 255
+
+
+class SyntheticChain:
+    # blocks are generated once and kept, serve_forever generates all of them before accepting connections
+
+    def __init__(self, height: int, scale: int):
+        self.height = height
+        genesis = Testnet3.genesis_block
+        data = genesis.dump() if scale <= 1 else scaled_block(genesis, scale)
+        self.template = Block.load(bytearray(data))
+        self.blocks: dict[int, bytes] = {0: genesis.dump()}
+
+    @staticmethod
+    def block_hash(height: int) -> BlockHash:
+        if height == 0:
+            return Testnet3.genesis_block.block_hash
+        return BlockHash(height.to_bytes(32, "little"))
+
+    def block(self, height: int) -> bytes:
+        data = self.blocks.get(height)
+        if data is None:
+            self.template.header.metadata.height = u32(height)
+            self.template.block_hash = self.block_hash(height)
+            self.template.previous_hash = self.block_hash(height - 1)
+            data = self.template.dump()
+            self.blocks[height] = data
+        return data
+
+    def locators(self) -> BlockLocators:
+        recents_start = max(0, self.height - Testnet3.block_locator_num_recents + 1)
+        recents = {u32(height): self.block_hash(height) for height in range(recents_start, self.height + 1)}
+        checkpoints = {
+            u32(height): self.block_hash(height)
+            for height in range(0, self.height + 1, Testnet3.block_locator_checkpoint_interval)
+        }
+        return BlockLocators(recents=recents, checkpoints=checkpoints)
+
+
+class SimulatedPeer:
+    def __init__(self, chain: SyntheticChain, peers: list[tuple[str, int]] | None = None):
+        self.chain = chain
+        # peers advertised in PeerResponse, as (ip, port)
+        self.peers = peers if peers is not None else []
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        ping_task = None
+
+        async def send(message: Message):
+            data = Frame(type_=message.type, message=message).dump()
+            writer.write(len(data).to_bytes(4, "little") + data)
+            await writer.drain()
+
+        async def ping():
+            while True:
+                await send(Ping(version=Testnet3.version, node_type=NodeType.Validator,
+                                block_locators=Option[BlockLocators](self.chain.locators())))
+                await asyncio.sleep(PING_INTERVAL_IN_SECS)
+
+        frames = FrameReader(reader)
+        try:
+            while True:
+                frame = Frame.load(await frames.read_frame())
+                match frame.type:
+                    case Message.Type.ChallengeRequest:
+                        genesis = Testnet3.genesis_block
+                        await send(ChallengeResponse(genesis_header=genesis.header, signature=genesis.signature))
+                        await send(ChallengeRequest(version=Testnet3.version, listener_port=u16(4133),
+                                                    node_type=NodeType.Validator, address=Address.loads(OWNER),
+                                                    nonce=u64(0)))
+                    case Message.Type.ChallengeResponse:
+                        ping_task = asyncio.create_task(ping())
+                    case Message.Type.Ping:
+                        await send(Pong(is_fork=Option[bool_](None)))
+                    case Message.Type.BlockRequest:
+                        await self.serve(frame.message, send)
+                    case Message.Type.PeerRequest:
+                        await send(PeerResponse(peers=Vec[SocketAddr, u64]([
+                            SocketAddr(ip=struct.unpack("<L", socket.inet_aton(ip))[0], port=port)
+                            for ip, port in self.peers
+                        ])))
+        except Exception as e:
+            print("peer disconnected:", e)
+        finally:
+            if ping_task is not None:
+                ping_task.cancel()
+            writer.close()
+
+    async def serve(self, request: BlockRequest, send):
+        end_height = min(int(request.end_height), self.chain.height + 1)
+        for start in range(int(request.start_height), end_height, MAX_BLOCKS_PER_RESPONSE):
+            end = min(start + MAX_BLOCKS_PER_RESPONSE, end_height)
+            blocks = [LazyBlock.load(bytearray(self.chain.block(height))) for height in range(start, end)]
+            await send(BlockResponse(request=BlockRequest(start_height=u32(start), end_height=u32(end)),
+                                     blocks=Vec[Block, u8](blocks)))
+
+
+async def listen(chain: SyntheticChain, port: int, listeners: int, peers: list) -> list[asyncio.Server]:
+    # binds a run of consecutive ports, starting over elsewhere if one of them is taken
+    while True:
+        first = await asyncio.start_server(SimulatedPeer(chain, peers).handle, "127.0.0.1", port)
+        servers = [first]
+        base = first.sockets[0].getsockname()[1]
+        try:
+            for i in range(1, listeners):
+                servers.append(await asyncio.start_server(SimulatedPeer(chain, peers).handle, "127.0.0.1", base + i))
+            return servers
+        except OSError:
+            for server in servers:
+                server.close()
+            if port != 0:
+                raise
+
+
+async def serve_forever(blocks: int, scale: int, port: int, listeners: int):
+    chain = SyntheticChain(blocks, scale)
+    for height in range(1, blocks + 1):
+        chain.block(height)
+    # shared by all listeners, filled in once the ports are known
+    peers: list[tuple[str, int]] = []
+    servers = await listen(chain, port, listeners, peers)
+    base = servers[0].sockets[0].getsockname()[1]
+    peers.extend(("127.0.0.1", base + i) for i in range(listeners))
+    print(base, flush=True)
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated snarkOS peer serving a synthetic chain")
+    parser.add_argument("--blocks", type=int, default=2000, help="height of the chain")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="times the genesis transactions are repeated in each block")
+    parser.add_argument("--port", type=int, default=4133)
+    parser.add_argument("--listeners", type=int, default=1, help="simulated peers, on consecutive ports")
+    args = parser.parse_args()
+    asyncio.run(serve_forever(args.blocks, args.scale, args.port, args.listeners))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Measures REST sync throughput against a local HTTP stand-in for the node REST API. The stand-in serves
+# /testnet3/latest/height and /testnet3/blocks with a fixed delay per request, and the explorer is replaced by a
+# callback that spends a fixed time per applied block, so the run shows how much downloading, decoding and
+# applying overlap. Blocks are served as {"hex": <serialized block>} and decoded with Block.load in the decode
+# pool, which stands in for Block.load_json.
+#
+# Usage: python -m benchmark.rest_sync
+
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import aiohttp
+
+import explorer
+from node.rest_node import RESTNode, REST_MAX_BATCH_SIZE, REST_SYNC_CONCURRENCY
+from node.sync import BatchTuner
+from node.testnet3 import Testnet3
+from node.types import *
+
+BLOCKS = 500
+# time the stand-in takes per /blocks request, and the explorer per applied block
+REQUEST_DELAY_IN_SECS = 0.05
+APPLY_DELAY_IN_SECS = 0.002
+
+
+def load_hex_block(data: dict) -> Block:
+    return Block.load(bytearray.fromhex(data["hex"]))
+
+
+def build_blocks(count: int) -> dict[int, str]:
+    blocks = {}
+    for height in range(1, count + 1):
+        block = Block.load(bytearray(Testnet3.genesis_block.dump()))
+        block.header.metadata.height = u32(height)
+        blocks[height] = json.dumps({"hex": block.dump().hex()})
+    return blocks
+
+
+class RESTStandIn:
+    # just enough HTTP/1.1 with keep-alive for aiohttp
+    def __init__(self, blocks: dict[int, str]):
+        self.blocks = blocks
+        self.server: asyncio.Server | None = None
+        self.port = 0
+        self.connections: set[asyncio.Task] = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass
+                url = urlsplit(request_line.split()[1].decode())
+                if url.path == "/testnet3/latest/height":
+                    body = str(max(self.blocks)).encode()
+                elif url.path == "/testnet3/blocks":
+                    query = parse_qs(url.query)
+                    start, end = int(query["start"][0]), int(query["end"][0])
+                    await asyncio.sleep(REQUEST_DELAY_IN_SECS)
+                    body = ("[" + ",".join(self.blocks[height] for height in range(start, end)) + "]").encode()
+                else:
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                    continue
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+            self.connections.discard(asyncio.current_task())
+
+    async def close(self):
+        self.server.close()
+        for connection in list(self.connections):
+            connection.cancel()
+        await asyncio.gather(*self.connections)
+        await self.server.wait_closed()
+
+
+class FakeExplorer:
+    def __init__(self):
+        self.height = 0
+
+    async def message(self, msg):
+        pass
+
+    async def request(self, request):
+        if isinstance(request, explorer.Request.GetLatestHeight):
+            return self.height
+        if isinstance(request, explorer.Request.ProcessBlock):
+            height = request.block.header.metadata.height
+            if height != self.height + 1:
+                raise ValueError(f"block {height} applied out of order")
+            await asyncio.sleep(APPLY_DELAY_IN_SECS)
+            self.height = height
+
+
+async def run(stand_in: RESTStandIn, windows: int) -> float:
+    fake = FakeExplorer()
+    node = RESTNode(fake.message, fake.request, None, load_json=load_hex_block)
+    node.tuner = BatchTuner(max_batch_size=REST_MAX_BATCH_SIZE, max_windows=windows)
+    node.decode_pool = ProcessPoolExecutor()
+    base_url = f"http://127.0.0.1:{stand_in.port}/testnet3"
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=windows + 1)) as session:
+            start = time.perf_counter()
+            await node.sync(session, base_url, 1, BLOCKS)
+            elapsed = time.perf_counter() - start
+    finally:
+        node.decode_pool.shutdown()
+    if fake.height != BLOCKS:
+        raise ValueError(f"synced to {fake.height} instead of {BLOCKS}")
+    return elapsed
+
+
+async def main():
+    stand_in = RESTStandIn(build_blocks(BLOCKS))
+    await stand_in.start()
+    print(f"{'requests in flight':>18} {'blocks / s':>11}")
+    try:
+        for windows in sorted({1, REST_SYNC_CONCURRENCY}):
+            elapsed = await run(stand_in, windows)
+            print(f"{windows:>18} {BLOCKS / elapsed:>11.1f}")
+    finally:
+        await stand_in.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
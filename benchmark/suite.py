@@ -0,0 +1,184 @@
+# Runs the serialization benchmarks over every fixture set and reports the results as JSON, so runs from
+# different commits can be compared. All fixtures are built offline, see benchmark/fixtures.py.
+#
+# Usage:
+#   python -m benchmark.suite                          # print a table
+#   python -m benchmark.suite --output before.json     # also save the results
+#   python -m benchmark.suite --compare before.json    # print the ratio of each metric against a saved run
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from node.types import *
+
+from . import fixtures
+from .id_str import block_ids
+
+ROUNDS = 5
+# decoded copies held at once when measuring memory
+COPIES = 10
+
+
+def best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def retained(func) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [func() for _ in range(COPIES)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / COPIES
+
+
+def transition_json(block: Block) -> list[tuple[type, dict]]:
+    # the REST JSON shape of the inputs and outputs that have a load_json
+    transitions = []
+    for confirmed_transaction in block.transactions:
+        transaction = confirmed_transaction.transaction
+        if isinstance(transaction, ExecuteTransaction):
+            transitions.extend(transaction.execution.transitions)
+        elif isinstance(transaction, (DeployTransaction, FeeTransaction)):
+            transitions.append(transaction.fee.transition)
+    entries = []
+    for transition in transitions:
+        for input_ in transition.inputs:
+            if isinstance(input_, PrivateTransitionInput):
+                data = {"type": "private", "id": str(input_.ciphertext_hash)}
+                if input_.ciphertext.value is not None:
+                    data["value"] = str(input_.ciphertext.value)
+                entries.append((TransitionInput, data))
+            elif isinstance(input_, RecordTransitionInput):
+                entries.append((TransitionInput, {"type": "record", "id": str(input_.serial_number),
+                                                  "tag": str(input_.tag)}))
+        for output in transition.outputs:
+            if isinstance(output, RecordTransitionOutput):
+                data = {"type": "record", "id": str(output.commitment), "checksum": str(output.checksum)}
+                if output.record_ciphertext.value is not None:
+                    data["value"] = str(output.record_ciphertext.value)
+                entries.append((TransitionOutput, data))
+    return entries
+
+
+def bench_block(data: bytes, rounds: int) -> dict:
+    block = Block.load(bytearray(data))
+    result = {
+        "bytes": len(data),
+        "transactions": block.transaction_count,
+        "load_s": best_time(lambda: Block.load(bytearray(data)), rounds),
+        "lazy_load_s": best_time(lambda: LazyBlock.load(bytearray(data)), rounds),
+        "dump_s": best_time(block.dump, rounds),
+    }
+
+    entries = transition_json(block)
+    if entries:
+        def load_json():
+            for type_, entry in entries:
+                type_.load_json(entry)
+        result["load_json_s"] = best_time(load_json, rounds)
+        result["load_json_count"] = len(entries)
+
+    # str() is memoized, so every round needs freshly decoded IDs
+    best = float("inf")
+    for _ in range(rounds):
+        ids = list(block_ids(Block.load(bytearray(data))))
+        start = time.perf_counter()
+        for i in ids:
+            str(i)
+        best = min(best, time.perf_counter() - start)
+    result["id_str_s"] = best
+    result["id_count"] = len(ids)
+
+    result["memory_bytes"] = retained(lambda: Block.load(bytearray(data)))
+    return result
+
+
+def bench_program(data: bytes, rounds: int) -> dict:
+    program = Program.load(bytearray(data))
+    return {
+        "bytes": len(data),
+        "functions": len(program.functions),
+        "load_s": best_time(lambda: Program.load(bytearray(data)), rounds),
+        "dump_s": best_time(program.dump, rounds),
+        "memory_bytes": retained(lambda: Program.load(bytearray(data))),
+    }
+
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__), capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(rounds: int) -> dict:
+    results = {}
+    for name, data in fixtures.blocks().items():
+        results[name] = bench_block(data, rounds)
+    for name, data in fixtures.programs().items():
+        results[name] = bench_program(data, rounds)
+    return {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "time": time.time(),
+        "rounds": rounds,
+        "results": results,
+    }
+
+
+def print_table(report: dict, baseline: dict | None):
+    metrics = ["load_s", "lazy_load_s", "dump_s", "load_json_s", "id_str_s", "memory_bytes"]
+    print(f"{'fixture':>18} {'KB':>8} " + " ".join(f"{m:>14}" for m in metrics))
+    for name, result in report["results"].items():
+        cells = []
+        for metric in metrics:
+            value = result.get(metric)
+            if value is None:
+                cells.append(f"{'-':>14}")
+                continue
+            if baseline is not None:
+                old = baseline["results"].get(name, {}).get(metric)
+                cells.append(f"{value / old:>13.2f}x" if old else f"{'-':>14}")
+            elif metric == "memory_bytes":
+                cells.append(f"{value / 1024:>12.1f}KB")
+            else:
+                cells.append(f"{value * 1000:>12.3f}ms")
+        print(f"{name:>18} {result['bytes'] / 1024:>8.1f} " + " ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization benchmark suite")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="print ratios against the results in this JSON file (lower is better)")
+    args = parser.parse_args()
+
+    report = run(args.rounds)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import os
+from abc import ABCMeta, abstractmethod
 
 import psycopg
 import time
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
@@ -10,6 +14,415 @@ from explorer.types import Message as ExplorerMessage
 from node.types import *
 
 
+CHAIN_TIP_SIZE = int(os.environ.get("CHAIN_TIP_SIZE", "100"))
+# how long a process that does not save blocks itself (the web UI) trusts its copy of the tip
+CHAIN_TIP_MAX_AGE_IN_SECS = float(os.environ.get("CHAIN_TIP_MAX_AGE", "5"))
+# write block rows with COPY instead of one INSERT per row when the caller of save_block does not choose, see CopyWriter
+DB_BULK_WRITE = os.environ.get("DB_BULK_WRITE", "0") != "0"
+# ids taken from a sequence at a time, unused ones are lost when the explorer stops
+BULK_ID_BATCH_SIZE = int(os.environ.get("DB_BULK_ID_BATCH_SIZE", "1000"))
+
+# tables a block is saved to with their columns, in the order CopyWriter copies them: a table comes after every table
+# it references. Tables starting with id are the ones other rows refer to, the others use the column default
+BLOCK_TABLES: dict[str, tuple[str, ...]] = {
+    "block": ("id", "height", "block_hash", "previous_hash", "previous_state_root", "transactions_root",
+              "coinbase_accumulator_point", "round", "coinbase_target", "proof_target", "last_coinbase_target",
+              "last_coinbase_timestamp", "timestamp", "signature", "total_supply", "cumulative_weight",
+              "finalize_root", "coinbase_reward"),
+    "block_data": ("block_id", "data"),
+    "confirmed_transaction": ("id", "block_id", "index", "type"),
+    "transaction": ("id", "confimed_transaction_id", "transaction_id", "type"),
+    "transaction_deploy": ("id", "transaction_id", "edition"),
+    "program": ("id", "transaction_deploy_id", "program_id", "import", "mapping", "interface", "record", "closure",
+                "function", "raw_data", "is_helloworld", "feature_hash", "owner", "signature"),
+    "program_function": ("program_id", "name", "input", "input_mode", "output", "output_mode", "finalize"),
+    "transaction_execute": ("id", "transaction_id", "global_state_root", "inclusion_proof"),
+    "fee": ("id", "transaction_id", "global_state_root", "inclusion_proof"),
+    "transition": ("id", "transition_id", "transaction_execute_id", "fee_id", "program_id", "function_name", "proof",
+                   "tpk", "tcm", "index"),
+    "transition_input": ("id", "transition_id", "type", "index"),
+    "transition_input_public": ("transition_input_id", "plaintext_hash", "plaintext"),
+    "transition_input_private": ("transition_input_id", "ciphertext_hash", "ciphertext"),
+    "transition_input_record": ("transition_input_id", "serial_number", "tag"),
+    "transition_input_external_record": ("transition_input_id", "commitment"),
+    "transition_output": ("id", "transition_id", "type", "index"),
+    "transition_output_public": ("transition_output_id", "plaintext_hash", "plaintext"),
+    "transition_output_private": ("transition_output_id", "ciphertext_hash", "ciphertext"),
+    "transition_output_record": ("transition_output_id", "commitment", "checksum", "record_ciphertext"),
+    "transition_output_external_record": ("transition_output_id", "commitment"),
+    "transition_finalize": ("id", "transition_id", "type", "index"),
+    "transition_finalize_plaintext": ("transition_finalize_id", "plaintext"),
+    "transition_finalize_record": ("transition_finalize_id", "record"),
+    "finalize_operation": ("id", "confirmed_transaction_id", "type"),
+    "finalize_operation_initialize_mapping": ("finalize_operation_id", "mapping_id"),
+    "finalize_operation_insert_kv": ("finalize_operation_id", "mapping_id", "key_id", "value_id"),
+    "finalize_operation_update_kv": ("finalize_operation_id", "mapping_id", "index", "key_id", "value_id"),
+    "finalize_operation_remove_kv": ("finalize_operation_id", "mapping_id", "index"),
+    "finalize_operation_remove_mapping": ("finalize_operation_id", "mapping_id"),
+    "coinbase_solution": ("id", "block_id", "proof_x", "proof_y_positive", "target_sum"),
+    "partial_solution": ("coinbase_solution_id", "address", "nonce", "commitment", "target", "reward"),
+}
+
+# connection of the batch the current task is in, see Database.batch
+_batch_connection: ContextVar[psycopg.AsyncConnection | None] = ContextVar("batch_connection", default=None)
+
+
+class ChainTip:
+    # hashes and headers of the last blocks, filled by the process saving them
+
+    def __init__(self, size: int):
+        self.size = size
+        self.blocks: OrderedDict[int, tuple[BlockHash, BlockHeader]] = OrderedDict()
+        self.updated_at = 0.
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def add(self, block_hash: BlockHash, header: BlockHeader):
+        height = int(header.metadata.height)
+        # a lower height means the chain was rolled back, anything above it is gone
+        while self.blocks and next(reversed(self.blocks)) >= height:
+            self.blocks.popitem()
+        self.blocks[height] = (block_hash, header)
+        while len(self.blocks) > self.size:
+            self.blocks.popitem(last=False)
+        self.updated_at = time.monotonic()
+
+    def clear(self):
+        self.blocks.clear()
+        self.updated_at = 0.
+
+    @property
+    def latest_height(self) -> int | None:
+        if not self.blocks:
+            return None
+        return next(reversed(self.blocks))
+
+    @property
+    def latest_header(self) -> BlockHeader | None:
+        if not self.blocks:
+            return None
+        return self.blocks[next(reversed(self.blocks))][1]
+
+    def get_hash(self, height: int) -> BlockHash | None:
+        entry = self.blocks.get(height)
+        return None if entry is None else entry[0]
+
+    def get_header(self, height: int) -> BlockHeader | None:
+        entry = self.blocks.get(height)
+        return None if entry is None else entry[1]
+
+
+class BlockWriter(metaclass=ABCMeta):
+    """Turns a block into the rows of BLOCK_TABLES.
+
+    `add` writes a row and returns its id for tables other rows refer to, `add_call` counts a call of a program
+    function. InsertWriter writes everything right away, CopyWriter collects it and writes it in `flush`.
+    """
+
+    def __init__(self, cur: psycopg.AsyncCursor):
+        self.cur = cur
+
+    @abstractmethod
+    async def add(self, table: str, *values) -> int | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_call(self, program_id: str, function_name: str):
+        raise NotImplementedError
+
+    async def flush(self):
+        pass
+
+    async def add_transition(self, exe_tx_db_id: int | None, fee_db_id: int | None, transition: Transition,
+                             ts_index: int):
+        transition_db_id = await self.add(
+            "transition", str(transition.id), exe_tx_db_id, fee_db_id, str(transition.program_id),
+            str(transition.function_name), str(transition.proof), str(transition.tpk), str(transition.tcm), ts_index
+        )
+
+        transition_input: TransitionInput
+        for input_index, transition_input in enumerate(transition.inputs):
+            transition_input_db_id = await self.add(
+                "transition_input", transition_db_id, transition_input.type.name, input_index
+            )
+            match transition_input.type:
+                case TransitionInput.Type.Public:
+                    transition_input: PublicTransitionInput
+                    await self.add("transition_input_public", transition_input_db_id,
+                                   str(transition_input.plaintext_hash), transition_input.plaintext.dump_nullable())
+                case TransitionInput.Type.Private:
+                    transition_input: PrivateTransitionInput
+                    await self.add("transition_input_private", transition_input_db_id,
+                                   str(transition_input.ciphertext_hash), transition_input.ciphertext.dumps())
+                case TransitionInput.Type.Record:
+                    transition_input: RecordTransitionInput
+                    await self.add("transition_input_record", transition_input_db_id,
+                                   str(transition_input.serial_number), str(transition_input.tag))
+                case TransitionInput.Type.ExternalRecord:
+                    transition_input: ExternalRecordTransitionInput
+                    await self.add("transition_input_external_record", transition_input_db_id,
+                                   str(transition_input.input_commitment))
+                case _:
+                    raise NotImplementedError
+
+        transition_output: TransitionOutput
+        for output_index, transition_output in enumerate(transition.outputs):
+            transition_output_db_id = await self.add(
+                "transition_output", transition_db_id, transition_output.type.name, output_index
+            )
+            match transition_output.type:
+                case TransitionOutput.Type.Public:
+                    transition_output: PublicTransitionOutput
+                    await self.add("transition_output_public", transition_output_db_id,
+                                   str(transition_output.plaintext_hash), transition_output.plaintext.dump_nullable())
+                case TransitionOutput.Type.Private:
+                    transition_output: PrivateTransitionOutput
+                    await self.add("transition_output_private", transition_output_db_id,
+                                   str(transition_output.ciphertext_hash), transition_output.ciphertext.dumps())
+                case TransitionOutput.Type.Record:
+                    transition_output: RecordTransitionOutput
+                    await self.add("transition_output_record", transition_output_db_id,
+                                   str(transition_output.commitment), str(transition_output.checksum),
+                                   transition_output.record_ciphertext.dumps())
+                case TransitionOutput.Type.ExternalRecord:
+                    transition_output: ExternalRecordTransitionOutput
+                    await self.add("transition_output_external_record", transition_output_db_id,
+                                   str(transition_output.commitment))
+                case _:
+                    raise NotImplementedError
+
+        if transition.finalize.value is not None:
+            for finalize_index, finalize in enumerate(transition.finalize.value):
+                transition_finalize_db_id = await self.add(
+                    "transition_finalize", transition_db_id, finalize.type.name, finalize_index
+                )
+                match finalize.type:
+                    case Value.Type.Plaintext:
+                        finalize: PlaintextValue
+                        await self.add("transition_finalize_plaintext", transition_finalize_db_id,
+                                       finalize.plaintext.dump())
+                    case Value.Type.Record:
+                        finalize: RecordValue
+                        await self.add("transition_finalize_record", transition_finalize_db_id, str(finalize.record))
+
+        if str(transition.program_id) != "credits.aleo":
+            await self.add_call(str(transition.program_id), str(transition.function_name))
+
+    async def add_fee(self, transaction_db_id: int, fee: Fee):
+        fee_db_id = await self.add("fee", transaction_db_id, str(fee.global_state_root), fee.inclusion_proof.dumps())
+        await self.add_transition(None, fee_db_id, fee.transition, 0)
+
+    async def add_program(self, deploy_transaction_db_id: int, transaction: DeployTransaction):
+        program: Program = transaction.deployment.program
+        program_db_id = await self.add(
+            "program", deploy_transaction_db_id, str(program.id), [str(x.program_id) for x in program.imports],
+            list(map(str, program.mappings.keys())), list(map(str, program.structs.keys())),
+            list(map(str, program.records.keys())), list(map(str, program.closures.keys())),
+            list(map(str, program.functions.keys())), program.dump(), program.is_helloworld(),
+            program.feature_hash(), str(transaction.owner.address), str(transaction.owner.signature)
+        )
+        for function in program.functions.values():
+            inputs = []
+            input_modes = []
+            i: FunctionInput
+            for i in function.inputs:
+                mode, _type = value_type_to_mode_type_str(i.value_type)
+                inputs.append(_type)
+                input_modes.append(mode)
+            outputs = []
+            output_modes = []
+            o: FunctionOutput
+            for o in function.outputs:
+                mode, _type = value_type_to_mode_type_str(o.value_type)
+                outputs.append(_type)
+                output_modes.append(mode)
+            finalizes = []
+            if function.finalize.value is not None:
+                f: FinalizeInput
+                for f in function.finalize.value[1].inputs:
+                    finalizes.append(plaintext_type_to_str(f.plaintext_type))
+            await self.add("program_function", program_db_id, str(function.name), inputs, input_modes, outputs,
+                           output_modes, finalizes)
+
+    async def add_finalize_operation(self, confirmed_transaction_db_id: int, finalize_operation: FinalizeOperation):
+        finalize_operation_db_id = await self.add(
+            "finalize_operation", confirmed_transaction_db_id, finalize_operation.type.name
+        )
+        match finalize_operation.type:
+            case FinalizeOperation.Type.InitializeMapping:
+                finalize_operation: InitializeMapping
+                await self.add("finalize_operation_initialize_mapping", finalize_operation_db_id,
+                               str(finalize_operation.mapping_id))
+            case FinalizeOperation.Type.InsertKeyValue:
+                finalize_operation: InsertKeyValue
+                await self.add("finalize_operation_insert_kv", finalize_operation_db_id,
+                               str(finalize_operation.mapping_id), str(finalize_operation.key_id),
+                               str(finalize_operation.value_id))
+            case FinalizeOperation.Type.UpdateKeyValue:
+                finalize_operation: UpdateKeyValue
+                await self.add("finalize_operation_update_kv", finalize_operation_db_id,
+                               str(finalize_operation.mapping_id), finalize_operation.index,
+                               str(finalize_operation.key_id), str(finalize_operation.value_id))
+            case FinalizeOperation.Type.RemoveKeyValue:
+                finalize_operation: RemoveKeyValue
+                await self.add("finalize_operation_remove_kv", finalize_operation_db_id,
+                               str(finalize_operation.mapping_id), finalize_operation.index)
+            case FinalizeOperation.Type.RemoveMapping:
+                finalize_operation: RemoveMapping
+                await self.add("finalize_operation_remove_mapping", finalize_operation_db_id,
+                               str(finalize_operation.mapping_id))
+
+    async def add_block(self, block: Block, coinbase_reward: int | None) -> int:
+        block_db_id = await self.add(
+            "block", block.header.metadata.height, str(block.block_hash), str(block.previous_hash),
+            str(block.header.previous_state_root), str(block.header.transactions_root),
+            str(block.header.coinbase_accumulator_point), block.header.metadata.round,
+            block.header.metadata.coinbase_target, block.header.metadata.proof_target,
+            block.header.metadata.last_coinbase_target, block.header.metadata.last_coinbase_timestamp,
+            block.header.metadata.timestamp, str(block.signature), block.header.metadata.total_supply_in_microcredits,
+            block.header.metadata.cumulative_weight, str(block.header.finalize_root), coinbase_reward
+        )
+        # the serialized block as received, so peers can be served without rebuilding it from the rows below
+        await self.add("block_data", block_db_id, block.dump())
+
+        confirmed_transaction: ConfirmedTransaction
+        for confirmed_transaction in block.transactions:
+            confirmed_transaction_db_id = await self.add(
+                "confirmed_transaction", block_db_id, confirmed_transaction.index, confirmed_transaction.type.name
+            )
+            transaction: Transaction = confirmed_transaction.transaction
+            match confirmed_transaction.type:
+                case ConfirmedTransaction.Type.AcceptedDeploy:
+                    if transaction.type != Transaction.Type.Deploy:
+                        raise ValueError("expected deploy transaction")
+                    transaction: DeployTransaction
+                    transaction_db_id = await self.add(
+                        "transaction", confirmed_transaction_db_id, str(transaction.id), transaction.type.name
+                    )
+                    deploy_transaction_db_id = await self.add(
+                        "transaction_deploy", transaction_db_id, transaction.deployment.edition
+                    )
+                    await self.add_program(deploy_transaction_db_id, transaction)
+                    await self.add_fee(transaction_db_id, transaction.fee)
+
+                case ConfirmedTransaction.Type.AcceptedExecute:
+                    if transaction.type != Transaction.Type.Execute:
+                        raise ValueError("expected execute transaction")
+                    transaction: ExecuteTransaction
+                    transaction_db_id = await self.add(
+                        "transaction", confirmed_transaction_db_id, str(transaction.id), transaction.type.name
+                    )
+                    execute_transaction_db_id = await self.add(
+                        "transaction_execute", transaction_db_id, str(transaction.execution.global_state_root),
+                        transaction.execution.inclusion_proof.dumps()
+                    )
+                    transition: Transition
+                    for ts_index, transition in enumerate(transaction.execution.transitions):
+                        await self.add_transition(execute_transaction_db_id, None, transition, ts_index)
+                    if transaction.additional_fee.value is not None:
+                        await self.add_fee(transaction_db_id, transaction.additional_fee.value)
+
+                case ConfirmedTransaction.Type.RejectedDeploy:
+                    raise ValueError("transaction type not implemented")
+
+                case ConfirmedTransaction.Type.RejectedExecute:
+                    confirmed_transaction: RejectedExecute
+                    if transaction.type != Transaction.Type.Fee:
+                        raise ValueError("expected fee transaction")
+                    transaction: FeeTransaction
+                    transaction_db_id = await self.add(
+                        "transaction", confirmed_transaction_db_id, str(transaction.id), transaction.type.name
+                    )
+                    await self.add_fee(transaction_db_id, transaction.fee)
+                    execute_transaction_db_id = await self.add(
+                        "transaction_execute", transaction_db_id,
+                        str(confirmed_transaction.rejected.global_state_root),
+                        confirmed_transaction.rejected.inclusion_proof.dumps()
+                    )
+                    for ts_index, transition in enumerate(confirmed_transaction.rejected.transitions):
+                        await self.add_transition(execute_transaction_db_id, None, transition, ts_index)
+
+            if confirmed_transaction.type in [ConfirmedTransaction.Type.AcceptedDeploy, ConfirmedTransaction.Type.AcceptedExecute]:
+                for finalize_operation in confirmed_transaction.finalize:
+                    await self.add_finalize_operation(confirmed_transaction_db_id, finalize_operation)
+
+        return block_db_id
+
+
+class InsertWriter(BlockWriter):
+    # one round trip per row
+
+    async def add(self, table: str, *values) -> int | None:
+        columns = BLOCK_TABLES[table]
+        if columns[0] != "id":
+            await self.cur.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})", values
+            )
+            return None
+        await self.cur.execute(
+            f"INSERT INTO {table} ({', '.join(columns[1:])}) VALUES ({', '.join(['%s'] * (len(columns) - 1))}) "
+            f"RETURNING id",
+            values
+        )
+        return (await self.cur.fetchone())["id"]
+
+    async def add_call(self, program_id: str, function_name: str):
+        await self.cur.execute("SELECT id FROM program WHERE program_id = %s", (program_id,))
+        program_db_id = (await self.cur.fetchone())["id"]
+        await self.cur.execute(
+            "UPDATE program_function SET called = called + 1 WHERE program_id = %s AND name = %s",
+            (program_db_id, function_name)
+        )
+
+
+class CopyWriter(BlockWriter):
+    # Ids come from `ids`, refilled BULK_ID_BATCH_SIZE at a time from the table sequences and kept by the Database
+    # between blocks, so rows can refer to each other before any of them is written
+
+    def __init__(self, cur: psycopg.AsyncCursor, ids: dict[str, deque[int]]):
+        super().__init__(cur)
+        self.ids = ids
+        self.rows: dict[str, list[tuple]] = {table: [] for table in BLOCK_TABLES}
+        # calls of each (program_id, function name), added to program_function.called after the rows are copied
+        self.calls: Counter[tuple[str, str]] = Counter()
+
+    async def add(self, table: str, *values) -> int | None:
+        if BLOCK_TABLES[table][0] != "id":
+            self.rows[table].append(values)
+            return None
+        ids = self.ids.setdefault(table, deque())
+        if not ids:
+            await self.cur.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) AS id FROM generate_series(1, %s)",
+                (table, BULK_ID_BATCH_SIZE)
+            )
+            ids.extend(row["id"] for row in await self.cur.fetchall())
+        db_id = ids.popleft()
+        self.rows[table].append((db_id, *values))
+        return db_id
+
+    async def add_call(self, program_id: str, function_name: str):
+        self.calls[(program_id, function_name)] += 1
+
+    async def flush(self):
+        for table, columns in BLOCK_TABLES.items():
+            rows = self.rows[table]
+            if not rows:
+                continue
+            async with self.cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    await copy.write_row(row)
+            rows.clear()
+        if self.calls:
+            await self.cur.executemany(
+                "UPDATE program_function SET called = called + %s "
+                "WHERE program_id = (SELECT id FROM program WHERE program_id = %s) AND name = %s",
+                [(count, program_id, function_name) for (program_id, function_name), count in self.calls.items()]
+            )
+            self.calls.clear()
+
+
 class Database:
 
     def __init__(self, *, server: str, user: str, password: str, database: str, schema: str,
@@ -21,6 +434,9 @@ class Database:
         self.schema = schema
         self.message_callback = message_callback
         self.pool: AsyncConnectionPool | None = None
+        self.chain_tip = ChainTip(CHAIN_TIP_SIZE)
+        # ids taken from the sequences and not used yet, see CopyWriter
+        self.bulk_ids: dict[str, deque[int]] = {}
 
     async def connect(self):
         try:
@@ -38,381 +454,63 @@ class Database:
             return
         await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseConnected, None))
 
-    @staticmethod
-    async def _insert_transition(conn: psycopg.AsyncConnection, exe_tx_db_id: int | None, fee_db_id: int | None,
-                                 transition: Transition, ts_index: int):
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "INSERT INTO transition (transition_id, transaction_execute_id, fee_id, program_id, "
-                "function_name, proof, tpk, tcm, index) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
-                (str(transition.id), exe_tx_db_id, fee_db_id, str(transition.program_id),
-                str(transition.function_name), str(transition.proof), str(transition.tpk),
-                str(transition.tcm), ts_index)
-            )
-            transition_db_id = (await cur.fetchone())["id"]
-
-            transition_input: TransitionInput
-            for input_index, transition_input in enumerate(transition.inputs):
-                await cur.execute(
-                    "INSERT INTO transition_input (transition_id, type, index) VALUES (%s, %s, %s) RETURNING id",
-                    (transition_db_id, transition_input.type.name, input_index)
-                )
-                transition_input_db_id = (await cur.fetchone())["id"]
-                match transition_input.type:
-                    case TransitionInput.Type.Public:
-                        transition_input: PublicTransitionInput
-                        await cur.execute(
-                            "INSERT INTO transition_input_public (transition_input_id, plaintext_hash, plaintext) "
-                            "VALUES (%s, %s, %s)",
-                            (transition_input_db_id, str(transition_input.plaintext_hash),
-                            transition_input.plaintext.dump_nullable())
-                        )
-                    case TransitionInput.Type.Private:
-                        transition_input: PrivateTransitionInput
-                        await cur.execute(
-                            "INSERT INTO transition_input_private (transition_input_id, ciphertext_hash, ciphertext) "
-                            "VALUES (%s, %s, %s)",
-                            (transition_input_db_id, str(transition_input.ciphertext_hash),
-                            transition_input.ciphertext.dumps())
-                        )
-                    case TransitionInput.Type.Record:
-                        transition_input: RecordTransitionInput
-                        await cur.execute(
-                            "INSERT INTO transition_input_record (transition_input_id, serial_number, tag) "
-                            "VALUES (%s, %s, %s)",
-                            (transition_input_db_id, str(transition_input.serial_number),
-                            str(transition_input.tag))
-                        )
-                    case TransitionInput.Type.ExternalRecord:
-                        transition_input: ExternalRecordTransitionInput
-                        await cur.execute(
-                            "INSERT INTO transition_input_external_record (transition_input_id, commitment) "
-                            "VALUES (%s, %s)",
-                            (transition_input_db_id, str(transition_input.input_commitment))
-                        )
-
-                    case _:
-                        raise NotImplementedError
-
-            transition_output: TransitionOutput
-            for output_index, transition_output in enumerate(transition.outputs):
-                await cur.execute(
-                    "INSERT INTO transition_output (transition_id, type, index) VALUES (%s, %s, %s) RETURNING id",
-                    (transition_db_id, transition_output.type.name, output_index)
-                )
-                transition_output_db_id = (await cur.fetchone())["id"]
-                match transition_output.type:
-                    case TransitionOutput.Type.Public:
-                        transition_output: PublicTransitionOutput
-                        await cur.execute(
-                            "INSERT INTO transition_output_public (transition_output_id, plaintext_hash, plaintext) "
-                            "VALUES (%s, %s, %s)",
-                            (transition_output_db_id, str(transition_output.plaintext_hash),
-                            transition_output.plaintext.dump_nullable())
-                        )
-                    case TransitionOutput.Type.Private:
-                        transition_output: PrivateTransitionOutput
-                        await cur.execute(
-                            "INSERT INTO transition_output_private (transition_output_id, ciphertext_hash, ciphertext) "
-                            "VALUES (%s, %s, %s)",
-                            (transition_output_db_id, str(transition_output.ciphertext_hash),
-                            transition_output.ciphertext.dumps())
-                        )
-                    case TransitionOutput.Type.Record:
-                        transition_output: RecordTransitionOutput
-                        await cur.execute(
-                            "INSERT INTO transition_output_record (transition_output_id, commitment, checksum, record_ciphertext) "
-                            "VALUES (%s, %s, %s, %s)",
-                            (transition_output_db_id, str(transition_output.commitment),
-                            str(transition_output.checksum), transition_output.record_ciphertext.dumps())
-                        )
-                    case TransitionOutput.Type.ExternalRecord:
-                        transition_output: ExternalRecordTransitionOutput
-                        await cur.execute(
-                            "INSERT INTO transition_output_external_record (transition_output_id, commitment) "
-                            "VALUES (%s, %s)",
-                            (transition_output_db_id, str(transition_output.commitment))
-                        )
-                    case _:
-                        raise NotImplementedError
-
-            if transition.finalize.value is not None:
-                for finalize_index, finalize in enumerate(transition.finalize.value):
-                    await cur.execute(
-                       "INSERT INTO transition_finalize (transition_id, type, index) VALUES (%s, %s, %s) "
-                       "RETURNING id",
-                        (transition_db_id, finalize.type.name, finalize_index)
-                    )
-                    transition_finalize_db_id = (await cur.fetchone())["id"]
-                    match finalize.type:
-                        case Value.Type.Plaintext:
-                            finalize: PlaintextValue
-                            await cur.execute(
-                                "INSERT INTO transition_finalize_plaintext (transition_finalize_id, plaintext) "
-                                "VALUES (%s, %s)",
-                                (transition_finalize_db_id, finalize.plaintext.dump())
-                            )
-                        case Value.Type.Record:
-                            finalize: RecordValue
-                            await cur.execute(
-                                "INSERT INTO transition_finalize_record (transition_finalize_id, record) "
-                                "VALUES (%s, %s)",
-                                (transition_finalize_db_id, str(finalize.record))
-                            )
-
-            if str(transition.program_id) != "credits.aleo":
-                await cur.execute(
-                    "SELECT id FROM program WHERE program_id = %s", (str(transition.program_id),)
-                )
-                program_db_id = (await cur.fetchone())["id"]
-                await cur.execute(
-                    "UPDATE program_function SET called = called + 1 WHERE program_id = %s AND name = %s",
-                    (program_db_id, str(transition.function_name))
-                )
-
-    async def _save_block(self, block: Block):
-        async with self.pool.connection() as conn:
+    def _connection(self):
+        conn = _batch_connection.get()
+        if conn is None:
+            return self.pool.connection()
+        return nullcontext(conn)
+
+    @asynccontextmanager
+    async def batch(self):
+        # everything the current task does with the database inside this block runs on one connection in one
+        # transaction, so it is committed together or not at all. Other tasks keep using their own connections and
+        # do not see any of it before the commit
+        try:
+            async with self.pool.connection() as conn:
+                async with conn.transaction():
+                    token = _batch_connection.set(conn)
+                    try:
+                        yield
+                    finally:
+                        _batch_connection.reset(token)
+        except Exception:
+            # chain_tip already has the blocks that were rolled back
+            await self.load_chain_tip()
+            raise
+
+    async def _save_block(self, block: Block, bulk: bool):
+        async with self._connection() as conn:
             conn: psycopg.AsyncConnection
             async with conn.transaction():
                 async with conn.cursor() as cur:
                     try:
-                        await cur.execute(
-                            "INSERT INTO block (height, block_hash, previous_hash, previous_state_root, transactions_root, "
-                            "coinbase_accumulator_point, round, coinbase_target, proof_target, last_coinbase_target, "
-                            "last_coinbase_timestamp, timestamp, signature, total_supply, cumulative_weight, "
-                            "finalize_root) "
-                            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-                            "RETURNING id",
-                            (block.header.metadata.height, str(block.block_hash), str(block.previous_hash),
-                             str(block.header.previous_state_root), str(block.header.transactions_root),
-                             str(block.header.coinbase_accumulator_point), block.header.metadata.round,
-                             block.header.metadata.coinbase_target, block.header.metadata.proof_target,
-                             block.header.metadata.last_coinbase_target, block.header.metadata.last_coinbase_timestamp,
-                             block.header.metadata.timestamp, str(block.signature),
-                             block.header.metadata.total_supply_in_microcredits,
-                             block.header.metadata.cumulative_weight, str(block.header.finalize_root))
-                        )
-                        block_db_id = (await cur.fetchone())["id"]
-
-                        confirmed_transaction: ConfirmedTransaction
-                        for confirmed_transaction in block.transactions:
-                            await cur.execute(
-                                "INSERT INTO confirmed_transaction (block_id, index, type) VALUES (%s, %s, %s) RETURNING id",
-                                (block_db_id, confirmed_transaction.index, confirmed_transaction.type.name)
-                            )
-                            confirmed_transaction_db_id = (await cur.fetchone())["id"]
-                            match confirmed_transaction.type:
-                                case ConfirmedTransaction.Type.AcceptedDeploy:
-                                    confirmed_transaction: AcceptedDeploy
-                                    transaction: Transaction = confirmed_transaction.transaction
-                                    if transaction.type != Transaction.Type.Deploy:
-                                        raise ValueError("expected deploy transaction")
-                                    transaction: DeployTransaction
-                                    transaction_id = transaction.id
-                                    await cur.execute(
-                                        "INSERT INTO transaction (confimed_transaction_id, transaction_id, type) VALUES (%s, %s, %s) RETURNING id",
-                                        (confirmed_transaction_db_id, str(transaction_id), transaction.type.name)
-                                    )
-                                    transaction_db_id = (await cur.fetchone())["id"]
-                                    await cur.execute(
-                                        "INSERT INTO transaction_deploy (transaction_id, edition) "
-                                        "VALUES (%s, %s) RETURNING id",
-                                        (transaction_db_id, transaction.deployment.edition)
-                                    )
-                                    deploy_transaction_db_id = (await cur.fetchone())["id"]
-
-                                    program: Program = transaction.deployment.program
-                                    imports = [str(x.program_id) for x in program.imports]
-                                    mappings = list(map(str, program.mappings.keys()))
-                                    interfaces = list(map(str, program.structs.keys()))
-                                    records = list(map(str, program.records.keys()))
-                                    closures = list(map(str, program.closures.keys()))
-                                    functions = list(map(str, program.functions.keys()))
-                                    await cur.execute(
-                                        "INSERT INTO program "
-                                        "(transaction_deploy_id, program_id, import, mapping, interface, record, "
-                                        "closure, function, raw_data, is_helloworld, feature_hash, owner, signature) "
-                                        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
-                                        (deploy_transaction_db_id, str(program.id), imports, mappings, interfaces, records,
-                                        closures, functions, program.dump(), program.is_helloworld(), program.feature_hash(),
-                                        str(transaction.owner.address), str(transaction.owner.signature))
-                                    )
-                                    program_db_id = (await cur.fetchone())["id"]
-                                    for function in program.functions.values():
-                                        inputs = []
-                                        input_modes = []
-                                        i: FunctionInput
-                                        for i in function.inputs:
-                                            mode, _type = value_type_to_mode_type_str(i.value_type)
-                                            inputs.append(_type)
-                                            input_modes.append(mode)
-                                        outputs = []
-                                        output_modes = []
-                                        o: FunctionOutput
-                                        for o in function.outputs:
-                                            mode, _type = value_type_to_mode_type_str(o.value_type)
-                                            outputs.append(_type)
-                                            output_modes.append(mode)
-                                        finalizes = []
-                                        if function.finalize.value is not None:
-                                            f: FinalizeInput
-                                            for f in function.finalize.value[1].inputs:
-                                                finalizes.append(plaintext_type_to_str(f.plaintext_type))
-                                        await cur.execute(
-                                            "INSERT INTO program_function (program_id, name, input, input_mode, output, output_mode, finalize) "
-                                            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
-                                            (program_db_id, str(function.name), inputs, input_modes, outputs, output_modes, finalizes)
-                                        )
-
-                                    await cur.execute(
-                                        "INSERT INTO fee (transaction_id, global_state_root, inclusion_proof) "
-                                        "VALUES (%s, %s, %s) RETURNING id",
-                                        (transaction_db_id, str(transaction.fee.global_state_root), transaction.fee.inclusion_proof.dumps())
-                                    )
-                                    fee_db_id = (await cur.fetchone())["id"]
-                                    await self._insert_transition(conn, None, fee_db_id, transaction.fee.transition, 0)
-
-                                case ConfirmedTransaction.Type.AcceptedExecute:
-                                    confirmed_transaction: AcceptedExecute
-                                    transaction: Transaction = confirmed_transaction.transaction
-                                    if transaction.type != Transaction.Type.Execute:
-                                        raise ValueError("expected execute transaction")
-                                    transaction: ExecuteTransaction
-                                    transaction_id = transaction.id
-                                    await cur.execute(
-                                        "INSERT INTO transaction (confimed_transaction_id, transaction_id, type) VALUES (%s, %s, %s) RETURNING id",
-                                        (confirmed_transaction_db_id, str(transaction_id), transaction.type.name)
-                                    )
-                                    transaction_db_id = (await cur.fetchone())["id"]
-                                    await cur.execute(
-                                        "INSERT INTO transaction_execute (transaction_id, global_state_root, inclusion_proof) "
-                                        "VALUES (%s, %s, %s) RETURNING id",
-                                        (transaction_db_id, str(transaction.execution.global_state_root),
-                                         transaction.execution.inclusion_proof.dumps())
-                                    )
-                                    execute_transaction_db_id = (await cur.fetchone())["id"]
-
-                                    transition: Transition
-                                    for ts_index, transition in enumerate(transaction.execution.transitions):
-                                        await self._insert_transition(conn, execute_transaction_db_id, None, transition, ts_index)
-
-                                    if transaction.additional_fee.value is not None:
-                                        fee: Fee = transaction.additional_fee.value
-                                        await cur.execute(
-                                            "INSERT INTO fee (transaction_id, global_state_root, inclusion_proof) "
-                                            "VALUES (%s, %s, %s) RETURNING id",
-                                            (transaction_db_id, str(fee.global_state_root), fee.inclusion_proof.dumps())
-                                        )
-                                        fee_db_id = (await cur.fetchone())["id"]
-                                        await self._insert_transition(conn, None, fee_db_id, fee.transition, 0)
-
-                                case ConfirmedTransaction.Type.RejectedDeploy:
-                                    raise ValueError("transaction type not implemented")
-
-                                case ConfirmedTransaction.Type.RejectedExecute:
-                                    confirmed_transaction: RejectedExecute
-                                    transaction: Transaction = confirmed_transaction.transaction
-                                    if transaction.type != Transaction.Type.Fee:
-                                        raise ValueError("expected fee transaction")
-                                    transaction: FeeTransaction
-                                    transaction_id = transaction.id
-                                    await cur.execute(
-                                        "INSERT INTO transaction (confimed_transaction_id, transaction_id, type) VALUES (%s, %s, %s) RETURNING id",
-                                        (confirmed_transaction_db_id, str(transaction_id), transaction.type.name)
-                                    )
-                                    transaction_db_id = (await cur.fetchone())["id"]
-                                    fee = transaction.fee
-                                    await cur.execute(
-                                        "INSERT INTO fee (transaction_id, global_state_root, inclusion_proof) "
-                                        "VALUES (%s, %s, %s) RETURNING id",
-                                        (transaction_db_id, str(fee.global_state_root), fee.inclusion_proof.dumps())
-                                    )
-                                    fee_db_id = (await cur.fetchone())["id"]
-                                    await self._insert_transition(conn, None, fee_db_id, fee.transition, 0)
-
-                                    await cur.execute(
-                                        "INSERT INTO transaction_execute (transaction_id, global_state_root, inclusion_proof) "
-                                        "VALUES (%s, %s, %s) RETURNING id",
-                                        (transaction_db_id, str(confirmed_transaction.rejected.global_state_root),
-                                         confirmed_transaction.rejected.inclusion_proof.dumps())
-                                    )
-                                    execute_transaction_db_id = (await cur.fetchone())["id"]
-                                    for ts_index, transition in enumerate(confirmed_transaction.rejected.transitions):
-                                        await self._insert_transition(conn, execute_transaction_db_id, None, transition, ts_index)
-
-                            if confirmed_transaction.type in [ConfirmedTransaction.Type.AcceptedDeploy, ConfirmedTransaction.Type.AcceptedExecute]:
-                                for finalize_operation in confirmed_transaction.finalize:
-                                    finalize_operation: FinalizeOperation
-                                    await cur.execute(
-                                        "INSERT INTO finalize_operation (confirmed_transaction_id, type) "
-                                        "VALUES (%s, %s) RETURNING id",
-                                        (confirmed_transaction_db_id, finalize_operation.type.name)
-                                    )
-                                    finalize_operation_db_id = (await cur.fetchone())["id"]
-                                    match finalize_operation.type:
-                                        case FinalizeOperation.Type.InitializeMapping:
-                                            finalize_operation: InitializeMapping
-                                            await cur.execute(
-                                                "INSERT INTO finalize_operation_initialize_mapping (finalize_operation_id, "
-                                                "mapping_id) VALUES (%s, %s)",
-                                                (finalize_operation_db_id, str(finalize_operation.mapping_id))
-                                            )
-                                        case FinalizeOperation.Type.InsertKeyValue:
-                                            finalize_operation: InsertKeyValue
-                                            await cur.execute(
-                                                "INSERT INTO finalize_operation_insert_kv (finalize_operation_id, "
-                                                "mapping_id, key_id, value_id) VALUES (%s, %s, %s, %s)",
-                                                (finalize_operation_db_id, str(finalize_operation.mapping_id),
-                                                str(finalize_operation.key_id), str(finalize_operation.value_id))
-                                            )
-                                        case FinalizeOperation.Type.UpdateKeyValue:
-                                            finalize_operation: UpdateKeyValue
-                                            await cur.execute(
-                                                "INSERT INTO finalize_operation_update_kv (finalize_operation_id, "
-                                                "mapping_id, index, key_id, value_id) VALUES (%s, %s, %s, %s, %s)",
-                                                (finalize_operation_db_id, str(finalize_operation.mapping_id),
-                                                finalize_operation.index, str(finalize_operation.key_id),
-                                                str(finalize_operation.value_id))
-                                            )
-                                        case FinalizeOperation.Type.RemoveKeyValue:
-                                            finalize_operation: RemoveKeyValue
-                                            await cur.execute(
-                                                "INSERT INTO finalize_operation_remove_kv (finalize_operation_id, "
-                                                "mapping_id, index) VALUES (%s, %s, %s)",
-                                                (finalize_operation_db_id, str(finalize_operation.mapping_id),
-                                                finalize_operation.index)
-                                            )
-                                        case FinalizeOperation.Type.RemoveMapping:
-                                            finalize_operation: RemoveMapping
-                                            await cur.execute(
-                                                "INSERT INTO finalize_operation_remove_mapping (finalize_operation_id, "
-                                                "mapping_id) VALUES (%s, %s)",
-                                                (finalize_operation_db_id, str(finalize_operation.mapping_id))
-                                            )
-
+                        if bulk:
+                            writer = CopyWriter(cur, self.bulk_ids)
+                        else:
+                            writer = InsertWriter(cur)
+                        coinbase_reward = None
+                        solutions = []
                         if block.coinbase.value is not None and not os.environ.get("DEBUG_SKIP_COINBASE"):
-                            coinbase_reward = block.get_coinbase_reward((await self.get_latest_block()).header.metadata.last_coinbase_timestamp)
-                            await cur.execute(
-                                "UPDATE block SET coinbase_reward = %s WHERE id = %s",
-                                (coinbase_reward, block_db_id)
-                            )
-                            partial_solutions = list(block.coinbase.value.partial_solutions)
-                            solutions = []
-                            partial_solutions = list(zip(partial_solutions,
-                                                    [partial_solution.commitment.to_target() for partial_solution in
-                                                     partial_solutions]))
+                            coinbase_reward = block.get_coinbase_reward((await self.get_latest_header()).metadata.last_coinbase_timestamp)
+                            partial_solutions = [(partial_solution, partial_solution.commitment.to_target())
+                                                 for partial_solution in block.coinbase.value.partial_solutions]
                             target_sum = sum(target for _, target in partial_solutions)
-                            partial_solution: PartialSolution
                             for partial_solution, target in partial_solutions:
                                 solutions.append((partial_solution, target, coinbase_reward * target // (2 * target_sum)))
-
-                            await cur.execute(
-                                "INSERT INTO coinbase_solution (block_id, proof_x, proof_y_positive, target_sum) "
-                                "VALUES (%s, %s, %s, %s) RETURNING id",
-                                (block_db_id, str(block.coinbase.value.proof.w.x), block.coinbase.value.proof.w.flags, target_sum)
+                        block_db_id = await writer.add_block(block, coinbase_reward)
+                        if coinbase_reward is not None:
+                            coinbase_solution_db_id = await writer.add(
+                                "coinbase_solution", block_db_id, str(block.coinbase.value.proof.w.x),
+                                block.coinbase.value.proof.w.flags, target_sum
                             )
-                            coinbase_solution_db_id = (await cur.fetchone())["id"]
+                            partial_solution: PartialSolution
+                            for partial_solution, target, reward in solutions:
+                                await writer.add("partial_solution", coinbase_solution_db_id,
+                                                 str(partial_solution.address), partial_solution.nonce,
+                                                 str(partial_solution.commitment), target, reward)
+                        await writer.flush()
+
+                        if coinbase_reward is not None:
                             await cur.execute("SELECT total_credit FROM leaderboard_total")
                             current_total_credit = await cur.fetchone()
                             if current_total_credit is None:
@@ -420,26 +518,20 @@ class Database:
                                 current_total_credit = 0
                             else:
                                 current_total_credit = current_total_credit["total_credit"]
-                            partial_solution: PartialSolution
-                            for partial_solution, target, reward in solutions:
-                                await cur.execute(
-                                    "INSERT INTO partial_solution (coinbase_solution_id, address, nonce, commitment, target, reward) "
-                                    "VALUES (%s, %s, %s, %s, %s, %s) RETURNING id",
-                                    (coinbase_solution_db_id, str(partial_solution.address), partial_solution.nonce,
-                                    str(partial_solution.commitment), partial_solution.commitment.to_target(), reward)
-                                )
+                            incentive = block.header.metadata.height >= 130888 and block.header.metadata.timestamp < 1675209600 and current_total_credit < 37_500_000_000_000
+                            for partial_solution, _, reward in solutions:
                                 if reward > 0:
                                     await cur.execute(
                                         "INSERT INTO leaderboard (address, total_reward) VALUES (%s, %s) "
                                         "ON CONFLICT (address) DO UPDATE SET total_reward = leaderboard.total_reward + %s",
                                         (str(partial_solution.address), reward, reward)
                                     )
-                                    if block.header.metadata.height >= 130888 and block.header.metadata.timestamp < 1675209600 and current_total_credit < 37_500_000_000_000:
+                                    if incentive:
                                         await cur.execute(
                                             "UPDATE leaderboard SET total_incentive = leaderboard.total_incentive + %s WHERE address = %s",
                                             (reward, str(partial_solution.address))
                                         )
-                            if block.header.metadata.height >= 130888 and block.header.metadata.timestamp < 1675209600 and current_total_credit < 37_500_000_000_000:
+                            if incentive:
                                 await cur.execute(
                                     "UPDATE leaderboard_total SET total_credit = leaderboard_total.total_credit + %s",
                                     (sum(reward for _, _, reward in solutions),)
@@ -451,8 +543,10 @@ class Database:
                         breakpoint()
                         raise
 
-    async def save_block(self, block: Block):
-        await self._save_block(block)
+    async def save_block(self, block: Block, bulk: bool | None = None):
+        # bulk picks CopyWriter over InsertWriter, DB_BULK_WRITE decides when it is not given
+        await self._save_block(block, DB_BULK_WRITE if bulk is None else bulk)
+        self.chain_tip.add(block.block_hash, block.header)
 
     @staticmethod
     def _get_block_header(block: dict):
@@ -463,15 +557,15 @@ class Database:
             coinbase_accumulator_point=Field.loads(block["coinbase_accumulator_point"]),
             metadata=BlockHeaderMetadata(
                 network=u16(3),
-                round_=u64(block["round"]),
-                height=u32(block["height"]),
-                total_supply_in_microcredits=u64(block["total_supply"]),
-                cumulative_weight=u128(block["cumulative_weight"]),
-                coinbase_target=u64(block["coinbase_target"]),
-                proof_target=u64(block["proof_target"]),
-                last_coinbase_target=u64(block["last_coinbase_target"]),
-                last_coinbase_timestamp=i64(block["last_coinbase_timestamp"]),
-                timestamp=i64(block["timestamp"]),
+                round_=u64.trusted(block["round"]),
+                height=u32.trusted(block["height"]),
+                total_supply_in_microcredits=u64.trusted(block["total_supply"]),
+                cumulative_weight=u128.trusted(block["cumulative_weight"]),
+                coinbase_target=u64.trusted(block["coinbase_target"]),
+                proof_target=u64.trusted(block["proof_target"]),
+                last_coinbase_target=u64.trusted(block["last_coinbase_target"]),
+                last_coinbase_timestamp=i64.trusted(block["last_coinbase_timestamp"]),
+                timestamp=i64.trusted(block["timestamp"]),
             )
         )
 
@@ -731,7 +825,7 @@ class Database:
                         program_data = await cur.fetchone()
                         program = program_data["raw_data"]
                         deployment = Deployment(
-                            edition=u16(deploy_transaction["edition"]),
+                            edition=u16.trusted(deploy_transaction["edition"]),
                             program=Program.load(bytearray(program)),
                             verifying_keys=Vec[Tuple[Identifier, VerifyingKey, Certificate], u16]([]),
                         )
@@ -765,7 +859,7 @@ class Database:
                             )
                         )
                         ctxs.append(AcceptedDeploy(
-                            index=u32(confirmed_transaction["index"]),
+                            index=u32.trusted(confirmed_transaction["index"]),
                             transaction=tx,
                             finalize=Vec[FinalizeOperation, u16](f),
                         ))
@@ -812,7 +906,7 @@ class Database:
                             proof = Proof.loads(execute_transaction["inclusion_proof"])
                         if confirmed_transaction["type"] == ConfirmedTransaction.Type.AcceptedExecute.name:
                             ctxs.append(AcceptedExecute(
-                                index=u32(confirmed_transaction["index"]),
+                                index=u32.trusted(confirmed_transaction["index"]),
                                 transaction=ExecuteTransaction(
                                     id_=TransactionID.loads(transaction["transaction_id"]),
                                     execution=Execution(
@@ -826,7 +920,7 @@ class Database:
                             ))
                         else:
                             ctxs.append(RejectedExecute(
-                                index=u32(confirmed_transaction["index"]),
+                                index=u32.trusted(confirmed_transaction["index"]),
                                 transaction=FeeTransaction(
                                     id_=TransactionID.loads(transaction["transaction_id"]),
                                     fee=fee,
@@ -918,7 +1012,7 @@ class Database:
             return [await Database._get_fast_block(block, conn) for block in blocks]
 
     async def get_latest_height(self):
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT height FROM block ORDER BY height DESC LIMIT 1")
@@ -932,7 +1026,7 @@ class Database:
 
     async def get_latest_block(self):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT * FROM block ORDER BY height DESC LIMIT 1")
@@ -944,9 +1038,42 @@ class Database:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def load_chain_tip(self):
+        conn: psycopg.AsyncConnection
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute("SELECT * FROM block ORDER BY height DESC LIMIT %s", (self.chain_tip.size,))
+                    blocks = await cur.fetchall()
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+        self.chain_tip.clear()
+        for block in reversed(blocks):
+            self.chain_tip.add(BlockHash.loads(block["block_hash"]), self._get_block_header(block))
+
+    async def get_latest_header(self, max_age: float | None = None) -> BlockHeader | None:
+        # the saving process keeps chain_tip current, others pass max_age to reload it once it gets older than that
+        if self.chain_tip and (max_age is None or time.monotonic() - self.chain_tip.updated_at < max_age):
+            return self.chain_tip.latest_header
+        conn: psycopg.AsyncConnection
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute("SELECT * FROM block ORDER BY height DESC LIMIT 1")
+                    block = await cur.fetchone()
+                    if block is None:
+                        return None
+                    header = self._get_block_header(block)
+                    self.chain_tip.add(BlockHash.loads(block["block_hash"]), header)
+                    return header
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
     async def get_block_by_height(self, height: u32):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT * FROM block WHERE height = %s", (height,))
@@ -960,7 +1087,7 @@ class Database:
 
     async def get_block_hash_by_height(self, height: u32):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT * FROM block WHERE height = %s", (height,))
@@ -974,7 +1101,7 @@ class Database:
 
     async def get_block_header_by_height(self, height: u32):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT * FROM block WHERE height = %s", (height,))
@@ -988,7 +1115,7 @@ class Database:
 
     async def get_block_by_hash(self, block_hash: BlockHash | str) -> Block | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT * FROM block WHERE block_hash = %s", (str(block_hash),))
@@ -1002,7 +1129,7 @@ class Database:
 
     async def get_block_header_by_hash(self, block_hash: BlockHash) -> BlockHeader | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT * FROM block WHERE block_hash = %s", (str(block_hash),))
@@ -1016,7 +1143,7 @@ class Database:
 
     async def get_recent_blocks_fast(self):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             try:
                 latest_height = await self.get_latest_height()
                 return await Database._get_fast_block_range(latest_height, latest_height - 30, conn)
@@ -1029,7 +1156,7 @@ class Database:
         raise NotImplementedError
         # noinspection PyUnreachableCode
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             try:
                 # noinspection PyUnresolvedReferences,SqlResolve
                 return await conn.fetchval(
@@ -1047,7 +1174,7 @@ class Database:
 
     async def get_block_from_transaction_id(self, transaction_id: TransactionID | str) -> Block | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1066,7 +1193,7 @@ class Database:
 
     async def get_block_from_transition_id(self, transition_id: TransitionID | str) -> Block | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1095,7 +1222,7 @@ class Database:
 
     async def search_block_hash(self, block_hash: str) -> [str]:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT block_hash FROM block WHERE block_hash LIKE %s", (f"{block_hash}%",))
@@ -1107,7 +1234,7 @@ class Database:
 
     async def search_transaction_id(self, transaction_id: str) -> [str]:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT transaction_id FROM transaction WHERE transaction_id LIKE %s", (f"{transaction_id}%",))
@@ -1119,7 +1246,7 @@ class Database:
 
     async def search_transition_id(self, transition_id: str) -> [str]:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT transition_id FROM transition WHERE transition_id LIKE %s", (f"{transition_id}%",))
@@ -1131,16 +1258,32 @@ class Database:
 
     async def get_blocks_range(self, start, end):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             try:
                 return await Database._get_full_block_range(start, end, conn)
             except Exception as e:
                 await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                 raise
 
+    async def get_block_bytes(self, heights: list[int]) -> dict[int, bytes]:
+        # blocks saved before migration 4 have no stored bytes and are left out
+        conn: psycopg.AsyncConnection
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute(
+                        "SELECT b.height, d.data FROM block b JOIN block_data d ON d.block_id = b.id "
+                        "WHERE b.height = ANY(%s)",
+                        (heights,)
+                    )
+                    return {row["height"]: bytes(row["data"]) for row in await cur.fetchall()}
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
     async def get_blocks_range_fast(self, start, end):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             try:
                 return await Database._get_fast_block_range(start, end, conn)
             except Exception as e:
@@ -1149,7 +1292,7 @@ class Database:
 
     async def get_block_coinbase_reward_by_height(self, height: int) -> int | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1163,7 +1306,7 @@ class Database:
 
     async def get_block_target_sum_by_height(self, height: int) -> int | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1179,7 +1322,7 @@ class Database:
 
     async def get_leaderboard_size(self) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT COUNT(*) FROM leaderboard")
@@ -1190,7 +1333,7 @@ class Database:
 
     async def get_leaderboard(self, start: int, end: int) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1206,7 +1349,7 @@ class Database:
 
     async def get_leaderboard_rewards_by_address(self, address: str) -> (int, int):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1220,7 +1363,7 @@ class Database:
 
     async def get_recent_solutions_by_address(self, address: str) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1240,7 +1383,7 @@ class Database:
 
     async def get_solution_count_by_address(self, address: str) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1253,7 +1396,7 @@ class Database:
 
     async def get_solution_by_address(self, address: str, start: int, end: int) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1273,7 +1416,7 @@ class Database:
 
     async def get_solution_by_height(self, height: int, start: int, end: int) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1293,7 +1436,7 @@ class Database:
 
     async def search_address(self, address: str) -> [str]:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1306,7 +1449,7 @@ class Database:
 
     async def get_address_speed(self, address: str) -> (float, int): # (speed, interval)
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 interval_list = [900, 1800, 3600, 14400, 43200, 86400]
                 now = int(time.time())
@@ -1340,7 +1483,7 @@ class Database:
 
     async def get_network_speed(self) -> float:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 now = int(time.time())
                 interval = 900
@@ -1370,7 +1513,7 @@ class Database:
 
     async def get_leaderboard_total(self) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT total_credit FROM leaderboard_total")
@@ -1385,7 +1528,7 @@ class Database:
 
     async def get_puzzle_commitment(self, commitment: str) -> dict | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1408,7 +1551,7 @@ class Database:
 
     async def get_function_definition(self, program_id: str, function_name: str) -> dict | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1424,7 +1567,7 @@ class Database:
 
     async def get_program_count(self, no_helloworld: bool = False) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     if no_helloworld:
@@ -1441,7 +1584,7 @@ class Database:
 
     async def get_programs(self, start, end, no_helloworld: bool = False) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     where = "WHERE feature_hash NOT IN (SELECT hash FROM program_filter_hash) " if no_helloworld else ""
@@ -1465,7 +1608,7 @@ class Database:
 
     async def get_programs_with_feature_hash(self, feature_hash: bytes, start, end) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1490,7 +1633,7 @@ class Database:
 
     async def get_block_by_program_id(self, program_id: str) -> Block | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1513,7 +1656,7 @@ class Database:
 
     async def get_program_called_times(self, program_id: str) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1530,7 +1673,7 @@ class Database:
 
     async def get_program_calls(self, program_id: str, start: int, end: int) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1553,7 +1696,7 @@ class Database:
     # temp method TODO: remove after next reset
     async def program_calls_has_reject(self, program_id: str) -> bool:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1575,7 +1718,7 @@ class Database:
 
     async def get_program_similar_count(self, program_id: str) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1590,7 +1733,7 @@ class Database:
 
     async def get_program_feature_hash(self, program_id: str) -> bytes:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1604,7 +1747,7 @@ class Database:
 
     async def search_program(self, program_id: str) -> [str]:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     # TODO just use LIKE after we disallow uppercase program names
@@ -1618,7 +1761,7 @@ class Database:
 
     async def get_recent_programs_by_address(self, address: str) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1631,7 +1774,7 @@ class Database:
 
     async def get_program_count_by_address(self, address: str) -> int:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT COUNT(*) FROM program WHERE owner = %s", (address,))
@@ -1642,7 +1785,7 @@ class Database:
 
     async def get_program_bytes(self, program_id: str) -> bytes:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT raw_data FROM program WHERE program_id = %s", (program_id,))
@@ -1654,7 +1797,7 @@ class Database:
 
     async def get_program(self, program_id: str) -> bytes:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT raw_data FROM program WHERE program_id = %s", (program_id,))
@@ -1665,7 +1808,7 @@ class Database:
 
     async def get_mapping_cache(self, mapping_id: str) -> list:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1682,7 +1825,7 @@ class Database:
 
     async def get_mapping_value(self, program_id: str, mapping: str, key_id: str) -> bytes | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1701,7 +1844,7 @@ class Database:
 
     async def initialize_mapping(self, mapping_id: str, program_id: str, mapping: str):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     async with conn.transaction():
@@ -1716,7 +1859,7 @@ class Database:
     async def update_mapping_key_value(self, mapping_id: str, index: int, key_id: str, value_id: str,
                                         key: bytes, value: bytes):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     async with conn.transaction():
@@ -1750,7 +1893,7 @@ class Database:
                 
     async def get_program_leo_source_code(self, program_id: str) -> str | None:
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute("SELECT leo_source FROM program WHERE program_id = %s", (program_id,))
@@ -1761,7 +1904,7 @@ class Database:
 
     async def store_program_leo_source_code(self, program_id: str, source_code: str):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
@@ -1777,9 +1920,10 @@ class Database:
             (1, self.migrate_1_add_fee_transaction_type),
             (2, self.migrate_2_program_add_leo_source_column),
             (3, self.migrate_3_add_mapping_tables),
+            (4, self.migrate_4_add_block_data_table),
         ]
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 try:
                     for migrated_id, method in migrations:
@@ -1795,19 +1939,19 @@ class Database:
 
     async def migrate_1_add_fee_transaction_type(self):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute("ALTER TYPE explorer.transaction_type ADD VALUE 'Fee' AFTER 'Execute'")
+                await cur.execute("ALTER TYPE transaction_type ADD VALUE 'Fee' AFTER 'Execute'")
 
     async def migrate_2_program_add_leo_source_column(self):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute("ALTER TABLE program ADD leo_source TEXT")
 
     async def migrate_3_add_mapping_tables(self):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
                     "create table mapping ( "
@@ -1838,14 +1982,30 @@ class Database:
                 )
                 await cur.execute("create index mapping_value_key_id_index on mapping_value (key_id);")
 
+    async def migrate_4_add_block_data_table(self):
+        conn: psycopg.AsyncConnection
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "create table block_data ( "
+                    "block_id integer primary key not null, "
+                    "data bytea not null )"
+                )
+                await cur.execute(
+                    "alter table block_data "
+                    "add constraint block_data_block_id_fk "
+                    "foreign key (block_id) references block"
+                )
+
 
     # debug method
     async def clear_database(self):
         conn: psycopg.AsyncConnection
-        async with self.pool.connection() as conn:
+        async with self._connection() as conn:
             try:
                 await conn.execute("TRUNCATE TABLE block RESTART IDENTITY CASCADE")
                 await conn.execute("TRUNCATE TABLE mapping RESTART IDENTITY CASCADE")
+                self.chain_tip.clear()
             except Exception as e:
                 await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                 raise
\ No newline at end of file
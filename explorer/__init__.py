@@ -1,2 +1,9 @@
-from .explorer import Explorer
 from .types import Message, Request
+
+
+def __getattr__(name):
+    # Explorer imports api, webui and the node; db only needs the message types
+    if name == "Explorer":
+        from .explorer import Explorer
+        return Explorer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 import asyncio
 import os
 import traceback
+from collections import OrderedDict
 from sys import stdout
 
 import api
@@ -8,8 +9,9 @@ import webui
 from db import Database
 from interpreter.interpreter import finalize_block
 from node import Node
+from node.sync import BlockSync
 from node.testnet3 import Testnet3
-from node.types import Block
+from node.types import Block, LazyBlock
 from .types import Request, Message
 
 
@@ -19,6 +21,7 @@ class Explorer:
         self.task = None
         self.message_queue = asyncio.Queue()
         self.node = None
+        self.nodes: list[Node] = []
         self.db = Database(server=os.environ["DB_HOST"], user=os.environ["DB_USER"], password=os.environ["DB_PASS"],
                            database=os.environ["DB_DATABASE"], schema=os.environ["DB_SCHEMA"],
                            message_callback=self.message)
@@ -28,6 +31,11 @@ class Explorer:
         self.latest_height = 0
         self.latest_block_hash = Testnet3.genesis_block.block_hash
         self.db_lock = asyncio.Lock()
+        # serialized blocks by height, recently added or served, so peers syncing from us rarely hit the database
+        self.block_bytes_cache: OrderedDict[int, bytes] = OrderedDict()
+        # limited by total size, heavy blocks are several MB each
+        self.block_bytes_cache_limit = int(os.environ.get("BLOCK_BYTES_CACHE_BYTES", str(256 * 1024 * 1024)))
+        self.block_bytes_cache_used = 0
         #self.light_node_state = LightNodeState()
 
     def start(self):
@@ -37,29 +45,56 @@ class Explorer:
         await self.message_queue.put(msg)
 
     async def node_request(self, request):
-        await self.db_lock.acquire()
-        try:
-            match type(request):
-                case Request.GetLatestHeight:
-                    return self.latest_height
-                case Request.ProcessBlock:
+        # only requests that change the chain wait for db_lock. Reads are answered from the in-memory tip, which
+        # add_block updates in one step, or from the database, which only shows committed blocks
+        match type(request):
+            case Request.ProcessBlock:
+                async with self.db_lock:
                     await self.add_block(request.block)
-                case Request.GetBlockByHeight:
-                    return await self.db.get_block_by_height(request.height)
-                case Request.GetBlockHashByHeight:
-                    if request.height == self.latest_height:
-                        return self.latest_block_hash
-                    return await self.db.get_block_hash_by_height(request.height)
-                case Request.GetBlockHeaderByHeight:
-                    return await self.db.get_block_header_by_height(request.height)
-                case Request.RevertToBlock:
+            case Request.ProcessBlocks:
+                async with self.db_lock:
+                    await self.add_blocks(request.blocks, request.bulk)
+            case Request.RevertToBlock:
+                async with self.db_lock:
                     await self.revert_to_block(request.height)
-                case Request.GetDevMode:
-                    return self.dev_mode
-                case _:
-                    print("unhandled explorer request")
-        finally:
-            self.db_lock.release()
+            case Request.GetLatestHeight:
+                return self.latest_height
+            case Request.GetBlockByHeight:
+                return await self.db.get_block_by_height(request.height)
+            case Request.GetBlockBytesByHeightRange:
+                return await self.get_block_bytes_range(request.start, request.end)
+            case Request.GetBlockHashByHeight:
+                if request.height == self.latest_height:
+                    return self.latest_block_hash
+                # chain_tip can be ahead of latest_height while a batch is being written
+                if request.height < self.latest_height:
+                    block_hash = self.db.chain_tip.get_hash(request.height)
+                    if block_hash is not None:
+                        return block_hash
+                return await self.db.get_block_hash_by_height(request.height)
+            case Request.GetBlockHeaderByHeight:
+                if request.height <= self.latest_height:
+                    header = self.db.chain_tip.get_header(request.height)
+                    if header is not None:
+                        return header
+                return await self.db.get_block_header_by_height(request.height)
+            case Request.GetDevMode:
+                return self.dev_mode
+            case _:
+                print("unhandled explorer request")
+
+    @staticmethod
+    def node_addresses() -> list[tuple[str, int]]:
+        hosts = os.environ.get("P2P_NODE_HOSTS")
+        if not hosts:
+            return [(os.environ.get("P2P_NODE_HOST", "127.0.0.1"), int(os.environ.get("P2P_NODE_PORT", "4133")))]
+        addresses = []
+        for address in hosts.split(","):
+            host, _, port = address.strip().rpartition(":")
+            if not host or not port.isdigit():
+                raise ValueError(f"invalid P2P_NODE_HOSTS entry: {address!r}")
+            addresses.append((host, int(port)))
+        return addresses
 
     async def check_genesis(self):
         height = await self.db.get_latest_height()
@@ -70,13 +105,20 @@ class Explorer:
         try:
             await self.db.connect()
             await self.check_dev_mode()
-            await self.check_genesis()
-            self.latest_height = await self.db.get_latest_height()
-            self.latest_block_hash = await self.db.get_block_hash_by_height(self.latest_height)
+            # saving a block needs the tables added by migrations, genesis included
             await self.db.migrate()
+            await self.check_genesis()
+            await self.db.load_chain_tip()
+            self.latest_height = self.db.chain_tip.latest_height
+            self.latest_block_hash = self.db.chain_tip.get_hash(self.latest_height)
             print(f"latest height: {self.latest_height}")
-            self.node = Node(explorer_message=self.message, explorer_request=self.node_request)
-            await self.node.connect(os.environ.get("P2P_NODE_HOST", "127.0.0.1"), int(os.environ.get("P2P_NODE_PORT", "4133")))
+            # all peers share one sync, so the missing heights are split between them
+            sync = BlockSync(self.node_request)
+            for host, port in self.node_addresses():
+                node = Node(explorer_message=self.message, explorer_request=self.node_request, sync=sync)
+                await node.connect(host, port)
+                self.nodes.append(node)
+            self.node = self.nodes[0]
             asyncio.create_task(webui.run(None))
             asyncio.create_task(api.run())
             while True:
@@ -111,13 +153,74 @@ class Explorer:
             await self.db.save_block(block)
             return
         if not self.dev_mode and block.previous_hash != self.latest_block_hash:
-            print(f"ignoring block {block} because previous block hash does not match")
-        else:
-            print(f"adding block {block}")
-            await finalize_block(self.db, block)
-            await self.db.save_block(block)
+            raise ValueError(f"block {block} does not extend block {self.latest_height}, previous block hash does not match")
+        print(f"adding block {block}")
+        await finalize_block(self.db, block)
+        await self.db.save_block(block)
+        self.latest_height = block.header.metadata.height
+        self.latest_block_hash = block.block_hash
+        if isinstance(block, LazyBlock):
+            # the received bytes are kept anyway, caching them costs nothing
+            self.cache_block_bytes(self.latest_height, block.dump())
+
+    async def add_blocks(self, blocks: list[Block], bulk: bool | None = None):
+        # the whole run is finalized and saved in one transaction, the in-memory tip only moves after the commit.
+        # Blocks before one that does not extend the chain are still committed
+        latest_block_hash = self.latest_block_hash
+        added = []
+        rejected = None
+        async with self.db.batch():
+            for block in blocks:
+                if not self.dev_mode and block.previous_hash != latest_block_hash:
+                    rejected = block
+                    break
+                print(f"adding block {block}")
+                await finalize_block(self.db, block)
+                await self.db.save_block(block, bulk)
+                latest_block_hash = block.block_hash
+                added.append(block)
+        for block in added:
             self.latest_height = block.header.metadata.height
             self.latest_block_hash = block.block_hash
+            if isinstance(block, LazyBlock):
+                self.cache_block_bytes(self.latest_height, block.dump())
+        if rejected is not None:
+            raise ValueError(f"block {rejected} does not extend block {self.latest_height}, previous block hash does not match")
+
+    def cache_block_bytes(self, height: int, data: bytes):
+        old = self.block_bytes_cache.pop(height, None)
+        if old is not None:
+            self.block_bytes_cache_used -= len(old)
+        self.block_bytes_cache[height] = data
+        self.block_bytes_cache_used += len(data)
+        while self.block_bytes_cache_used > self.block_bytes_cache_limit:
+            _, evicted = self.block_bytes_cache.popitem(last=False)
+            self.block_bytes_cache_used -= len(evicted)
+
+    async def get_block_bytes_range(self, start: int, end: int) -> list[bytes]:
+        end = min(end, self.latest_height + 1)
+        cached = {}
+        missing = []
+        for height in range(start, end):
+            data = self.block_bytes_cache.get(height)
+            if data is None:
+                missing.append(height)
+            else:
+                self.block_bytes_cache.move_to_end(height)
+                cached[height] = data
+        if missing:
+            # stored bytes of every height not cached in one query. Blocks rebuilt from their rows do not encode
+            # back to the original bytes, so blocks saved before block_data existed are not served
+            for height, data in (await self.db.get_block_bytes(missing)).items():
+                cached[height] = data
+                self.cache_block_bytes(height, data)
+        # the response stops at the first height without bytes
+        blocks = []
+        for height in range(start, end):
+            if height not in cached:
+                break
+            blocks.append(cached[height])
+        return blocks
 
     async def get_latest_block(self):
         return await self.db.get_latest_block()
@@ -25,6 +25,12 @@ class Request:
         def __init__(self, block: Block):
             self.block = block
 
+    class ProcessBlocks:
+        # consecutive blocks, committed together. bulk is passed on to Database.save_block
+        def __init__(self, blocks: list[Block], bulk: bool | None = None):
+            self.blocks = blocks
+            self.bulk = bulk
+
     class GetLatestHeight:
         pass
 
@@ -38,6 +44,12 @@ class Request:
         def __init__(self, height: int):
             self.height = height
 
+    class GetBlockBytesByHeightRange:
+        # serialized blocks start <= height < end, in height order, for serving BlockRequest
+        def __init__(self, start: int, end: int):
+            self.start = start
+            self.end = end
+
     class GetBlockHashByHeight:
         def __init__(self, height: int):
             self.height = height
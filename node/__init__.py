@@ -1,2 +1,6 @@
-# from .node import Node
-from .node import Node
+def __getattr__(name):
+    # Node pulls in the explorer, which processes that only need node.types (db, webui, api) should not import
+    if name == "Node":
+        from .node import Node
+        return Node
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
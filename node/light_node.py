@@ -1,52 +1,146 @@
 import asyncio
+import os
 import random
 import time
+from collections import deque
 
+import aiohttp
 import aleo
-import requests
 
 from node.testnet3 import Testnet3
 from node.types import ChallengeRequest, NodeType, u16, u64, Frame, Message, ChallengeResponse, \
     PeerRequest, Ping, PeerResponse, SocketAddr, Pong, bool_, BlockLocators, Address, Signature, Option
-from util.buffer import Buffer
+from util.buffer import FrameReader
+
+# peers connected at once, the rest wait in the crawl queue
+LIGHT_NODE_MAX_CONNECTIONS = int(os.environ.get("LIGHT_NODE_MAX_CONNECTIONS", "256"))
+# connections still in the handshake at once, spreads out the burst of pings and peer lists from new peers
+LIGHT_NODE_MAX_CONNECTING = int(os.environ.get("LIGHT_NODE_MAX_CONNECTING", "32"))
+# addresses kept in the peer table. Once full, peers gone for longer than the retry interval make room for new ones
+LIGHT_NODE_MAX_PEERS = int(os.environ.get("LIGHT_NODE_MAX_PEERS", "10000"))
+LIGHT_NODE_CONNECT_TIMEOUT_IN_SECS = 5
+# a peer that sends nothing for this long is dropped, it should ping every few seconds
+LIGHT_NODE_READ_TIMEOUT_IN_SECS = 30
+# how often a connected peer is asked for its peers
+LIGHT_NODE_PEER_REQUEST_INTERVAL_IN_SECS = 60
+# a peer that went away is tried again when it is advertised after this long
+LIGHT_NODE_RETRY_INTERVAL_IN_SECS = 300
+# a full peer table is searched for peers to evict at most this often
+LIGHT_NODE_EVICT_INTERVAL_IN_SECS = 1
+# pings and peer lists are small, larger frames grow the buffer
+LIGHT_NODE_BUFFER_SIZE = 16 * 1024
+
+
+class PeerState:
+    __slots__ = ("address", "node_type", "height", "last_ping", "last_attempt", "connected")
+
+    def __init__(self):
+        self.address: str | None = None
+        self.node_type: NodeType | None = None
+        self.height: int | None = None
+        self.last_ping = 0.
+        self.last_attempt = 0.
+        self.connected = False
 
 
 class LightNodeState:
     def __init__(self):
-        self.states: dict[str, dict] = {}
-        self.nodes: dict[str, LightNode] = {}
+        self.states: dict[tuple[str, int], PeerState] = {}
+        self.nodes: dict[tuple[str, int], LightNode] = {}
+        # addresses waiting for a free connection slot
+        self.pending: deque[tuple[str, int]] = deque()
+        self.connecting = 0
+        self.last_eviction = 0.
+
+        # filled in by start(), which the first connect() calls
+        self.self_ip: str | None = None
+        self.self_ip_task: asyncio.Task | None = None
 
-        # prevent infinite self connection loop
-        r = requests.get("https://api.ipify.org/?format=json")
-        self.self_ip = r.json()["ip"]
+    def start(self):
+        self.self_ip_task = asyncio.create_task(self.discover_self_ip())
+
+    async def discover_self_ip(self):
+        try:
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get("https://api.ipify.org/?format=json") as resp:
+                    self.self_ip = (await resp.json())["ip"]
+        except Exception as e:
+            print("failed to discover own ip:", e)
 
     def connect(self, ip: str, port: int):
-        if ip == self.self_ip and port == 14133:
+        if self.self_ip_task is None:
+            self.start()
+        key = (ip, port)
+        state = self.states.get(key)
+        if state is None:
+            # prevent infinite self connection loop
+            if ip == self.self_ip and port == 14133:
+                return
+            if len(self.states) >= LIGHT_NODE_MAX_PEERS and not self._evict_stale():
+                return
+            state = PeerState()
+            self.states[key] = state
+        elif key in self.nodes or state.last_attempt == float("inf") \
+                or time.time() - state.last_attempt < LIGHT_NODE_RETRY_INTERVAL_IN_SECS:
             return
-        key = ":".join([ip, str(port)])
-        if key not in self.states:
-            self.states[key] = {}
-            self.nodes[key] = LightNode(ip, port, self)
-            self.nodes[key].connect()
+        # marks the address as queued until a connection slot picks it up
+        state.last_attempt = float("inf")
+        self.pending.append(key)
+        self._connect_pending()
+
+    def _evict_stale(self) -> bool:
+        # drops peers that are neither connected nor queued and were last heard from before the retry interval,
+        # returns whether there is room now
+        now = time.time()
+        if now - self.last_eviction < LIGHT_NODE_EVICT_INTERVAL_IN_SECS:
+            return False
+        self.last_eviction = now
+        stale = [
+            key for key, state in self.states.items()
+            if key not in self.nodes and state.last_attempt != float("inf")
+            and now - max(state.last_attempt, state.last_ping) >= LIGHT_NODE_RETRY_INTERVAL_IN_SECS
+        ]
+        for key in stale:
+            del self.states[key]
+        return len(self.states) < LIGHT_NODE_MAX_PEERS
+
+    def _connect_pending(self):
+        while self.pending and len(self.nodes) < LIGHT_NODE_MAX_CONNECTIONS \
+                and self.connecting < LIGHT_NODE_MAX_CONNECTING:
+            key = self.pending.popleft()
+            self.connecting += 1
+            self.states[key].last_attempt = time.time()
+            node = LightNode(*key, self)
+            self.nodes[key] = node
+            node.connect()
 
     def node_connected(self, ip: str, port: int, address: str):
-        key = ":".join([ip, str(port)])
-        if key in self.states:
-            self.states[key]["address"] = address
-            self.states[key]["last_ping"] = time.time()
+        state = self.states.get((ip, port))
+        if state is not None and (ip, port) in self.nodes:
+            state.address = address
+            state.last_ping = time.time()
+            if not state.connected:
+                state.connected = True
+                self.connecting -= 1
+                self._connect_pending()
 
     def node_ping(self, ip: str, port: int, node_type: NodeType, height: int):
-        key = ":".join([ip, str(port)])
-        if key in self.states:
-            self.states[key]["last_ping"] = time.time()
-            self.states[key]["node_type"] = node_type
-            self.states[key]["height"] = height
+        state = self.states.get((ip, port))
+        if state is not None:
+            state.last_ping = time.time()
+            state.node_type = node_type
+            state.height = height
 
     def disconnected(self, ip: str, port: int):
-        key = ":".join([ip, str(port)])
-        if key in self.states:
-            del self.states[key]
-            del self.nodes[key]
+        key = (ip, port)
+        if self.nodes.pop(key, None) is not None:
+            state = self.states[key]
+            if state.connected:
+                state.connected = False
+            else:
+                self.connecting -= 1
+            self._connect_pending()
 
 
 class LightNode:
@@ -56,18 +150,19 @@ class LightNode:
         self.state = state
 
         self.reader, self.writer = None, None
-        self.buffer = Buffer()
         self.ping_task: asyncio.Task | None = None
         self.worker_task: asyncio.Task | None = None
 
         self.nonce = u64(random.randint(0, 2 ** 64 - 1))
+        self.last_peer_request = 0.
 
     def connect(self):
         self.worker_task = asyncio.create_task(self.worker(self.ip, self.port))
 
     async def worker(self, host: str, port: int):
         try:
-            self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=5)
+            self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(host, port),
+                                                              timeout=LIGHT_NODE_CONNECT_TIMEOUT_IN_SECS)
         except Exception:
             await self.close()
             return
@@ -80,22 +175,10 @@ class LightNode:
                 nonce=self.nonce,
             )
             await self.send_message(challenge_request)
+            frames = FrameReader(self.reader, capacity=LIGHT_NODE_BUFFER_SIZE)
             while True:
-                data = await self.reader.read(4096)
-                if not data:
-                    raise Exception("connection closed")
-                self.buffer.write(data)
-                while self.buffer.count():
-                    if self.buffer.count() >= 4:
-                        size = int.from_bytes(self.buffer.peek(4), byteorder="little")
-                        if self.buffer.count() < size + 4:
-                            break
-                        self.buffer.read(4)
-                        frame = self.buffer.read(size)
-                        await self.parse_message(Frame.load(frame))
-                    else:
-                        print(f"buffer.count() < 4: {self.buffer.count()}")
-                        break
+                frame = await asyncio.wait_for(frames.read_frame(), timeout=LIGHT_NODE_READ_TIMEOUT_IN_SECS)
+                await self.parse_message(Frame.load(frame))
         except Exception:
             await self.close()
             return
@@ -119,7 +202,8 @@ class LightNode:
 
             case Message.Type.ChallengeResponse:
                 msg: ChallengeResponse = frame.message
-                if msg.genesis_header != Testnet3.genesis_block.header:
+                # BlockHeader has no __eq__, compare the encodings
+                if msg.genesis_header.dump() != Testnet3.genesis_block.header.dump():
                     raise ValueError("peer has wrong genesis block")
                 await self.send_ping()
 
@@ -145,7 +229,11 @@ class LightNode:
                     is_fork=Option[bool_](None),
                 )
                 await self.send_message(pong)
-                await self.send_message(PeerRequest())
+                # every peer answers with hundreds of addresses, asking on every ping floods the event loop. Still
+                # asked once the table is full, new addresses replace the peers that went away
+                if time.time() - self.last_peer_request > LIGHT_NODE_PEER_REQUEST_INTERVAL_IN_SECS:
+                    self.last_peer_request = time.time()
+                    await self.send_message(PeerRequest())
 
             # case Message.Type.Pong:
             #     msg: Pong = frame.message
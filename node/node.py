@@ -6,7 +6,9 @@ from collections import OrderedDict
 from typing import Callable
 
 import explorer
+from util.buffer import FrameReader
 # from .light_node import LightNodeState
+from .sync import BlockSync, RequestTracker, SYNC_MAX_BATCH_SIZE, SYNC_TIMEOUT_IN_SECS
 from .testnet3.param import Testnet3
 from .types import *  # too many types
 
@@ -14,11 +16,13 @@ PING_SLEEP_IN_SECS = 9
 
 
 class Node:
-    def __init__(self, explorer_message: Callable, explorer_request: Callable):
+    def __init__(self, explorer_message: Callable, explorer_request: Callable, sync: BlockSync | None = None):
         self.reader, self.writer = None, None
         self.worker_task: asyncio.Task | None = None
         self.explorer_message = explorer_message
         self.explorer_request = explorer_request
+        # shared with the other peers when syncing from several of them
+        self.sync = sync if sync is not None else BlockSync(explorer_request)
 
         self.node_ip = None
         self.node_port = None
@@ -29,8 +33,10 @@ class Node:
         self.peer_block_height = 0
         self.is_fork = False
         self.peer_block_locators = None
-        self.block_requests = []
-        self.block_requests_deadline = float('inf')
+        # heights requested from this peer and not received yet
+        self.block_requests = RequestTracker()
+        # size of the frame being parsed, for the batch tuner
+        self.frame_size = 0
         self.ping_task = None
         self.is_syncing = False
         # self.light_node_state = light_node_state
@@ -61,17 +67,11 @@ class Node:
                 nonce=self.nonce,
             )
             await self.send_message(challenge_request)
+            frames = FrameReader(self.reader)
             while True:
-                try:
-                    size = await self.reader.readexactly(4)
-                except:
-                    raise Exception("connection closed")
-                size = int.from_bytes(size, byteorder="little")
-                try:
-                    frame = await self.reader.readexactly(size)
-                except:
-                    raise Exception("connection closed")
-                await self.parse_message(Frame.load(bytearray(frame)))
+                frame = await frames.read_frame()
+                self.frame_size = len(frame)
+                await self.parse_message(Frame.load(frame))
         except Exception:
             traceback.print_exc()
             await self.explorer_message(explorer.Message(explorer.Message.Type.NodeDisconnected, None))
@@ -86,23 +86,29 @@ class Node:
                 if self.handshake_state != 1:
                     raise Exception("handshake is not done")
                 msg: BlockRequest = frame.message
-                for height in range(msg.start_height, msg.end_height):
-                    block = await self.explorer_request(explorer.Request.GetBlockByHeight(height))
-                    print("sending block", height)
-                    await self.send_message(BlockResponse(block=block))
+                start_height = int(msg.start_height)
+                # one response holds at most SYNC_MAX_BATCH_SIZE blocks, a longer request gets the first ones
+                end_height = min(int(msg.end_height), start_height + SYNC_MAX_BATCH_SIZE)
+                blocks = await self.explorer_request(explorer.Request.GetBlockBytesByHeightRange(start_height, end_height))
+                await self.send_frame(Message.Type.BlockResponse, BlockResponse.dump_serialized(msg, blocks))
 
             case Message.Type.BlockResponse:
                 if self.handshake_state != 1:
                     raise Exception("handshake is not done")
                 msg: BlockResponse = frame.message
+                self.sync.forget_stale(self.block_requests)
+                requested_at = self.block_requests.requested_at(msg.request.start_height)
+                if requested_at is not None:
+                    self.sync.tuner.observe_rtt(time.time() - requested_at)
+                self.sync.tuner.observe_blocks(len(msg.blocks), self.frame_size)
+                deadline = time.time() + SYNC_TIMEOUT_IN_SECS
                 for block in msg.blocks:
-                    height = block.header.metadata.height
-                    if height in self.block_requests:
-                        self.block_requests.remove(height)
-                        await self.explorer_request(explorer.Request.ProcessBlock(block))
+                    if self.block_requests.remove(block.header.metadata.height, deadline):
+                        self.sync.deliver(block)
+                # windows can complete out of order and from several peers, blocks are queued strictly by height
+                self.sync.submit()
                 if not self.block_requests:
                     self.is_syncing = False
-                    self.block_requests_deadline = float('inf')
                     self.is_fork = False
                 await self._sync()
 
@@ -195,8 +201,8 @@ class Node:
                     is_fork=Option[bool_](is_fork),
                 )
                 await self.send_message(pong)
-                if not self.is_syncing:
-                    await self._sync()
+                # also while syncing, so ranges of a silent peer still expire
+                await self._sync()
 
             case Message.Type.Pong:
                 if self.handshake_state != 1:
@@ -214,35 +220,43 @@ class Node:
                 print("unhandled message type:", frame.type)
 
     async def _sync(self):
-        if self.block_requests_deadline < time.time():
-            self.block_requests.clear()
-            self.block_requests_deadline = float("inf")
-            self.is_syncing = False
+        self.sync.forget_stale(self.block_requests)
+        expired = self.block_requests.expire(time.time())
+        if expired:
+            # ranges this peer did not deliver in time go to whichever peer asks next
+            self.sync.release(expired)
+            self.is_syncing = bool(self.block_requests)
         locators = self.peer_block_locators
         if locators is None:
             return
         recents = locators.recents
         self.peer_block_height = max(recents.keys())
-        if self.is_syncing:
-            next_block = self.block_requests[0]
-            self.block_requests_deadline = time.time() + 30
-            msg = BlockRequest(start_height=u32(next_block), end_height=u32(min(max(self.block_requests) + 1, next_block + 100)))
-            await self.send_message(msg)
-        else:
-            latest_height = await self.explorer_request(explorer.Request.GetLatestHeight())
-            if latest_height == self.peer_block_height:
-                return
+        if not await self.sync.start(self.peer_block_height):
+            return
+        # the sync may have been reset while start() waited for the database
+        self.sync.forget_stale(self.block_requests)
 
-            start_block_height = latest_height + 1
-            end_block_height = min(self.peer_block_height + 1, start_block_height + 100)
-            print(f"Synchronizing from block {start_block_height} to {end_block_height}")
+        # keep as many windows requested from this peer as the tuner asks for
+        tuner = self.sync.tuner
+        while len(self.block_requests.ranges) < tuner.windows():
+            window = self.sync.claim(self.peer_block_height, tuner.batch_size(), wakeup=self._resume_sync)
+            if window is None:
+                break
+            start_block_height, end_block_height = window
+            self.block_requests.add(start_block_height, end_block_height, time.time() + SYNC_TIMEOUT_IN_SECS)
             self.is_syncing = True
-
-            self.block_requests.extend(range(start_block_height, end_block_height))
-            self.block_requests_deadline = time.time() + 30
             msg = BlockRequest(start_height=u32(start_block_height), end_height=u32(end_block_height))
             await self.send_message(msg)
 
+    async def _resume_sync(self):
+        # called by BlockSync once the database has room again, the peer may have disconnected meanwhile
+        if self.handshake_state != 1:
+            return
+        try:
+            await self._sync()
+        except Exception:
+            traceback.print_exc()
+
     async def send_ping(self):
         ping = Ping(
             version=Testnet3.version,
@@ -254,10 +268,12 @@ class Node:
     async def send_message(self, message: Message):
         if not issubclass(type(message), Message):
             raise TypeError("message must be subclass of Message")
-        frame = Frame(type_=message.type, message=message)
-        data = frame.dump()
-        size = len(data)
-        self.writer.write(size.to_bytes(4, "little") + data)
+        await self.send_frame(message.type, message.dump())
+
+    async def send_frame(self, type_: Message.Type, data: bytes):
+        # also takes messages serialized elsewhere, like the stored blocks of a BlockResponse
+        data = type_.to_bytes(2, "little") + data
+        self.writer.write(len(data).to_bytes(4, "little") + data)
         await self.writer.drain()
 
     async def close(self):
@@ -272,8 +288,9 @@ class Node:
         self.peer_cumulative_weight = 0
         self.is_fork = False
         self.peer_block_locators = OrderedDict()
-        self.block_requests = []
-        self.block_requests_deadline = float('inf')
+        # let the other peers pick up what this one still owed
+        self.sync.forget_stale(self.block_requests)
+        self.sync.release(self.block_requests.clear())
         self.is_syncing = False
         if self.ping_task is not None:
             self.ping_task.cancel()
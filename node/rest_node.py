@@ -1,21 +1,47 @@
 import asyncio
+import json
 import os
+import time
 import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Callable
 
 import aiohttp
 
 import explorer
 from .light_node import LightNodeState
+from .sync import BatchTuner
 from .types import *  # too many types
 
+# the REST API serves at most 50 blocks per request
+REST_MAX_BATCH_SIZE = 50
+# range requests kept in flight while the blocks of earlier ones are applied
+REST_SYNC_CONCURRENCY = int(os.environ.get("REST_SYNC_CONCURRENCY", "4"))
+REST_DECODE_WORKERS = int(os.environ.get("REST_DECODE_WORKERS", "2"))
+REST_POLL_INTERVAL_IN_SECS = float(os.environ.get("REST_POLL_INTERVAL", "5"))
+
+
+def load_block_json(data: dict) -> Block:
+    return Block.load_json(data)
+
+
+def decode_blocks(body: bytes, load_json: Callable = load_block_json) -> list[bytes]:
+    # runs in the decode pool, serialized blocks are much cheaper to send back than Block objects
+    return [load_json(block).dump() for block in json.loads(body)]
+
 
 class RESTNode:
-    def __init__(self, explorer_message: Callable, explorer_request: Callable, light_node_state: LightNodeState):
+    def __init__(self, explorer_message: Callable, explorer_request: Callable, light_node_state: LightNodeState,
+                 load_json: Callable = load_block_json):
         self.worker_task: asyncio.Task | None = None
         self.explorer_message = explorer_message
         self.explorer_request = explorer_request
         self.light_node_state = light_node_state
+        # must be a module level function, it is sent to the decode pool
+        self.load_json = load_json
+        self.tuner = BatchTuner(max_batch_size=REST_MAX_BATCH_SIZE, max_windows=REST_SYNC_CONCURRENCY)
+        self.decode_pool: ProcessPoolExecutor | None = None
 
     async def connect(self, host: str, port: int):
         # return
@@ -23,29 +49,58 @@ class RESTNode:
         # self.light_node_state.connect("127.0.0.1", 4133)
 
     async def worker(self, host: str, port: int):
-        async with aiohttp.ClientSession() as session:
-            while True:
-                await asyncio.sleep(5)
-                try:
-                    async with session.get(f"{os.environ.get('PROTOCOL', 'http')}://{host}:{port}/testnet3/latest/height") as resp:
-                        if not resp.ok:
-                            print("failed to get latest height")
-                            continue
-                        latest_height = int(await resp.text())
+        base_url = f"{os.environ.get('PROTOCOL', 'http')}://{host}:{port}/testnet3"
+        connector = aiohttp.TCPConnector(limit=REST_SYNC_CONCURRENCY + 1)
+        self.decode_pool = ProcessPoolExecutor(max_workers=REST_DECODE_WORKERS)
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                while True:
+                    try:
+                        async with session.get(f"{base_url}/latest/height") as resp:
+                            if not resp.ok:
+                                print("failed to get latest height")
+                                await asyncio.sleep(REST_POLL_INTERVAL_IN_SECS)
+                                continue
+                            latest_height = int(await resp.text())
                         local_height = await self.explorer_request(explorer.Request.GetLatestHeight())
-                        while latest_height > local_height:
+                        if latest_height > local_height:
                             print("remote latest height:", latest_height)
-                            start = local_height + 1
-                            end = min(start + 50, latest_height + 1)
-                            print(f"fetching blocks {start} to {end - 1}")
-                            async with session.get(f"{os.environ.get('PROTOCOL', 'http')}://{host}:{port}/testnet3/blocks?start={start}&end={end}") as block_resp:
-                                if not block_resp.ok:
-                                    print("failed to get blocks")
-                                    continue
-                                for block in await block_resp.json():
-                                    block = Block.load_json(block)
-                                    await self.explorer_request(explorer.Request.ProcessBlock(block))
-                                    local_height = block.header.metadata.height
-                except Exception:
-                    traceback.print_exc()
-                    continue
\ No newline at end of file
+                            await self.sync(session, base_url, local_height + 1, latest_height)
+                            continue
+                    except Exception:
+                        traceback.print_exc()
+                    await asyncio.sleep(REST_POLL_INTERVAL_IN_SECS)
+        finally:
+            self.decode_pool.shutdown(cancel_futures=True)
+            self.decode_pool = None
+
+    async def fetch_blocks(self, session: aiohttp.ClientSession, base_url: str, start: int, end: int) -> list[Block]:
+        request_time = time.time()
+        async with session.get(f"{base_url}/blocks?start={start}&end={end}") as resp:
+            if not resp.ok:
+                raise ValueError(f"failed to get blocks {start} to {end - 1}: {resp.status}")
+            body = await resp.read()
+        self.tuner.observe_rtt(time.time() - request_time)
+        blocks = await asyncio.get_running_loop().run_in_executor(self.decode_pool, decode_blocks, body,
+                                                                  self.load_json)
+        self.tuner.observe_blocks(len(blocks), len(body))
+        return [LazyBlock.load(bytearray(data)) for data in blocks]
+
+    async def sync(self, session: aiohttp.ClientSession, base_url: str, start: int, latest_height: int):
+        # ranges are fetched and decoded concurrently, and applied in order while the later ones download
+        fetches: deque[asyncio.Task] = deque()
+        next_start = start
+        try:
+            while fetches or next_start <= latest_height:
+                while len(fetches) < self.tuner.windows() and next_start <= latest_height:
+                    end = min(next_start + self.tuner.batch_size(), latest_height + 1)
+                    print(f"fetching blocks {next_start} to {end - 1}")
+                    fetches.append(asyncio.create_task(self.fetch_blocks(session, base_url, next_start, end)))
+                    next_start = end
+                for block in await fetches.popleft():
+                    apply_time = time.time()
+                    await self.explorer_request(explorer.Request.ProcessBlock(block))
+                    self.tuner.observe_apply(time.time() - apply_time)
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
@@ -0,0 +1,313 @@
+import asyncio
+import math
+import os
+import time
+import traceback
+from collections import deque
+from typing import Callable
+
+import explorer
+from .types import Block
+
+# starting point until the first blocks are measured, see BatchTuner
+SYNC_BATCH_SIZE = 100
+# BlockRequest windows each peer keeps in flight while syncing, so peers keep streaming while blocks are applied
+SYNC_WINDOWS = int(os.environ.get("P2P_SYNC_WINDOWS", "4"))
+# a BlockResponse holds at most 255 blocks
+SYNC_MAX_BATCH_SIZE = 255
+SYNC_MAX_WINDOWS = int(os.environ.get("P2P_SYNC_MAX_WINDOWS", "16"))
+# batches are sized to carry about this much block data
+SYNC_TARGET_BATCH_BYTES = int(os.environ.get("P2P_SYNC_TARGET_BATCH_BYTES", str(4 * 1024 * 1024)))
+# how far past the next block to apply new ranges are handed out, bounds the reorder buffer
+SYNC_MAX_AHEAD = int(os.environ.get("P2P_SYNC_MAX_AHEAD", str(SYNC_WINDOWS * SYNC_BATCH_SIZE * 8)))
+# decoded blocks waiting for the database, in the queue or the reorder buffer. No new ranges are handed out while
+# this many are waiting
+SYNC_MAX_PENDING = int(os.environ.get("P2P_SYNC_MAX_PENDING", str(SYNC_WINDOWS * SYNC_BATCH_SIZE * 2)))
+# hard limit of the queue: what was pending when claims stopped, plus every block claimed before that. Only blocks of
+# claimed ranges are buffered, so it is never reached
+SYNC_MAX_QUEUE = SYNC_MAX_PENDING + SYNC_MAX_AHEAD + SYNC_MAX_BATCH_SIZE
+# blocks already waiting in the queue are committed in one transaction, up to this many. Near the tip the queue
+# is empty and every block gets its own commit. 1 commits every block separately
+SYNC_COMMIT_BATCH_SIZE = int(os.environ.get("P2P_SYNC_COMMIT_BATCH_SIZE", "50"))
+SYNC_TIMEOUT_IN_SECS = 30
+SYNC_REPORT_INTERVAL_IN_SECS = 10
+
+
+class BatchTuner:
+    """Picks the sync batch size and window count from what the sync has measured so far.
+
+    Batches are sized so each carries about SYNC_TARGET_BATCH_BYTES, which makes them large through the nearly
+    empty early blocks and small for heavy deployment blocks. Enough windows are kept in flight to cover one
+    round trip at the rate the database applies blocks.
+    """
+
+    # weight of a new sample in the moving averages
+    alpha = 0.2
+
+    def __init__(self, max_batch_size: int = SYNC_MAX_BATCH_SIZE, max_windows: int = SYNC_MAX_WINDOWS):
+        self.max_batch_size = max_batch_size
+        self.max_windows = max_windows
+        self.bytes_per_block: float | None = None
+        self.apply_time: float | None = None
+        # queueing behind our own windows only adds to a round trip, so the smallest recent sample is used
+        self.rtt_samples = deque(maxlen=16)
+
+    def _average(self, current: float | None, sample: float) -> float:
+        if current is None:
+            return sample
+        return current + self.alpha * (sample - current)
+
+    def observe_blocks(self, count: int, size: int):
+        if count:
+            self.bytes_per_block = self._average(self.bytes_per_block, size / count)
+
+    def observe_apply(self, elapsed: float):
+        self.apply_time = self._average(self.apply_time, elapsed)
+
+    def observe_rtt(self, elapsed: float):
+        self.rtt_samples.append(elapsed)
+
+    def batch_size(self) -> int:
+        if not self.bytes_per_block:
+            return min(SYNC_BATCH_SIZE, self.max_batch_size)
+        return max(1, min(self.max_batch_size, int(SYNC_TARGET_BATCH_BYTES / self.bytes_per_block)))
+
+    def windows(self) -> int:
+        if not self.rtt_samples or not self.apply_time:
+            return min(SYNC_WINDOWS, self.max_windows)
+        # blocks the database gets through while one request is on the wire, plus the window being applied
+        in_flight = min(self.rtt_samples) / self.apply_time
+        return max(1, min(self.max_windows, math.ceil(in_flight / self.batch_size()) + 1))
+
+
+class RequestTracker:
+    """Heights requested from one peer, grouped by the BlockRequest range they were requested in.
+
+    Each range has its own deadline, pushed back whenever one of its blocks arrives, so a lost range can be
+    handed back on its own while the rest keep streaming. All ranges belong to the sync run in `run`, see
+    BlockSync.reset.
+    """
+
+    def __init__(self):
+        self.run = 0
+        # height -> start of its range
+        self.heights: dict[int, int] = {}
+        # range start -> [range end, heights still missing, deadline, time requested]
+        self.ranges: dict[int, list] = {}
+
+    def __len__(self):
+        return len(self.heights)
+
+    def __contains__(self, height: int):
+        return height in self.heights
+
+    def add(self, start: int, end: int, deadline: float):
+        for height in range(start, end):
+            self.heights[height] = start
+        self.ranges[start] = [end, end - start, deadline, time.time()]
+
+    def requested_at(self, start: int) -> float | None:
+        entry = self.ranges.get(start)
+        return entry[3] if entry is not None else None
+
+    def remove(self, height: int, deadline: float) -> bool:
+        start = self.heights.pop(height, None)
+        if start is None:
+            return False
+        entry = self.ranges[start]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self.ranges[start]
+        else:
+            entry[2] = deadline
+        return True
+
+    def expire(self, now: float) -> list[int]:
+        expired = [start for start, (_, _, deadline, _) in self.ranges.items() if deadline < now]
+        heights = []
+        for start in expired:
+            end = self.ranges.pop(start)[0]
+            for height in range(start, end):
+                if self.heights.get(height) == start:
+                    del self.heights[height]
+                    heights.append(height)
+        return heights
+
+    def clear(self) -> list[int]:
+        heights = list(self.heights)
+        self.heights.clear()
+        self.ranges.clear()
+        return heights
+
+
+class BlockSync:
+    """Catch-up sync state shared by all connected peers.
+
+    Peers claim height ranges to request, hand back ranges they failed to deliver so another peer retries them,
+    and deliver blocks in any order. Blocks are put in height order into a queue, which a single task drains into
+    the database, so socket reads and decoding overlap with block application. While the database is behind, peers
+    get no new ranges and are woken up once it catches up, their sockets are never blocked.
+    """
+
+    def __init__(self, explorer_request: Callable):
+        self.explorer_request = explorer_request
+        self.active = False
+        self.next_request_height = 0
+        # next height to put in the queue
+        self.next_apply_height = 0
+        # blocks that arrived ahead of the next height to apply
+        self.buffer: dict[int, Block] = {}
+        self.queue: asyncio.Queue[Block] = asyncio.Queue(maxsize=SYNC_MAX_QUEUE)
+        self.apply_task: asyncio.Task | None = None
+        self.commit_batch_size = SYNC_COMMIT_BATCH_SIZE
+        # ranges handed back by a peer, served before new ones
+        self.retry: list[tuple[int, int]] = []
+        self.outstanding = 0
+        # bumped by reset(), ranges claimed in an earlier run are dropped by the peers without releasing them
+        self.run = 0
+        # peers that got no range because too many blocks were pending, called again once the database catches up
+        self.waiting: set[Callable] = set()
+        # wakeups that are running, the event loop only keeps weak references to tasks
+        self.wake_tasks: set[asyncio.Task] = set()
+        self.tuner = BatchTuner()
+        self.synced_blocks = 0
+        self.report_time = 0.
+        # queue metrics since the last report
+        self.queue_peak = 0
+        self.backlogged_claims = 0
+
+    async def start(self, peer_height: int) -> bool:
+        if self.active:
+            return True
+        latest_height = await self.explorer_request(explorer.Request.GetLatestHeight())
+        if self.active:
+            return True
+        if latest_height >= peer_height:
+            return False
+        print(f"Synchronizing from block {latest_height + 1} to {peer_height}")
+        self.active = True
+        self.next_request_height = self.next_apply_height = latest_height + 1
+        self.synced_blocks = 0
+        self.report_time = time.time()
+        if self.apply_task is None or self.apply_task.done():
+            self.apply_task = asyncio.create_task(self.apply_worker())
+        return True
+
+    def backlogged(self) -> bool:
+        return self.queue.qsize() + len(self.buffer) >= SYNC_MAX_PENDING
+
+    def claim(self, peer_height: int, size: int, wakeup: Callable | None = None) -> tuple[int, int] | None:
+        # a retried range first, as long as this peer has it. Those fill gaps the pending blocks wait on, so they
+        # are handed out even while backlogged
+        for i, (start, end) in enumerate(self.retry):
+            if start > peer_height:
+                continue
+            claimed_end = min(end, peer_height + 1, start + size)
+            if claimed_end < end:
+                self.retry[i] = (claimed_end, end)
+            else:
+                del self.retry[i]
+            self.outstanding += claimed_end - start
+            return start, claimed_end
+        start = self.next_request_height
+        if start > peer_height or start - self.next_apply_height >= SYNC_MAX_AHEAD:
+            return None
+        if self.backlogged():
+            self.backlogged_claims += 1
+            if wakeup is not None:
+                self.waiting.add(wakeup)
+            return None
+        end = min(peer_height + 1, start + size)
+        self.next_request_height = end
+        self.outstanding += end - start
+        return start, end
+
+    def forget_stale(self, tracker: RequestTracker):
+        # ranges of an earlier run are no longer counted in outstanding, so they are dropped instead of released
+        if tracker.run != self.run:
+            tracker.clear()
+            tracker.run = self.run
+
+    def release(self, heights):
+        # heights a peer requested but will not deliver, merged back into ranges
+        start = end = None
+        for height in sorted(heights):
+            self.outstanding -= 1
+            if height == end:
+                end += 1
+                continue
+            if start is not None:
+                self.retry.append((start, end))
+            start, end = height, height + 1
+        if start is not None:
+            self.retry.append((start, end))
+        self.retry.sort()
+
+    def deliver(self, block: Block):
+        self.outstanding -= 1
+        height = block.header.metadata.height
+        # heights outside the claimed window are dropped, a peer cannot grow the buffer with blocks nobody asked for
+        if self.active and self.next_apply_height <= height < self.next_request_height:
+            self.buffer[height] = block
+
+    def submit(self):
+        # claim keeps the queue below its maxsize, so this never waits and peers keep reading their sockets
+        while self.next_apply_height in self.buffer:
+            self.queue.put_nowait(self.buffer.pop(self.next_apply_height))
+            self.next_apply_height += 1
+        self.queue_peak = max(self.queue_peak, self.queue.qsize())
+
+    def _wake(self):
+        waiting = list(self.waiting)
+        self.waiting.clear()
+        for wakeup in waiting:
+            task = asyncio.create_task(wakeup())
+            self.wake_tasks.add(task)
+            task.add_done_callback(self.wake_tasks.discard)
+
+    async def apply_worker(self):
+        while True:
+            blocks = [await self.queue.get()]
+            while len(blocks) < self.commit_batch_size and not self.queue.empty():
+                blocks.append(self.queue.get_nowait())
+            start = time.time()
+            try:
+                if len(blocks) == 1:
+                    await self.explorer_request(explorer.Request.ProcessBlock(blocks[0]))
+                else:
+                    await self.explorer_request(explorer.Request.ProcessBlocks(blocks))
+            except Exception:
+                traceback.print_exc()
+                self.reset()
+                continue
+            self.tuner.observe_apply((time.time() - start) / len(blocks))
+            self.synced_blocks += len(blocks)
+            self._report_rate(blocks[-1].header.metadata.height)
+            if self.waiting and not self.backlogged():
+                self._wake()
+            if self.queue.empty() and not self.outstanding and not self.retry and not self.buffer:
+                self.active = False
+
+    def reset(self):
+        # start over from the database height on the next sync, blocks still owed by peers are dropped on arrival
+        self.active = False
+        self.run += 1
+        self.outstanding = 0
+        self.buffer.clear()
+        self.retry.clear()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        # peers waiting for room start the next sync instead
+        self._wake()
+
+    def _report_rate(self, height: int):
+        elapsed = time.time() - self.report_time
+        if elapsed < SYNC_REPORT_INTERVAL_IN_SECS:
+            return
+        print(f"Synchronizing at {self.synced_blocks / elapsed:.1f} blocks/s, height {height}, "
+              f"queue {self.queue.qsize()} (peak {self.queue_peak}), buffer {len(self.buffer)}, "
+              f"{self.backlogged_claims} claims held back, batch {self.tuner.batch_size()} x {self.tuner.windows()}")
+        self.synced_blocks = 0
+        self.report_time = time.time()
+        self.queue_peak = 0
+        self.backlogged_claims = 0
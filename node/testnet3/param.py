@@ -2,14 +2,29 @@ import os
 
 from ..types import u16, Block, u32
 
+GENESIS_PATH = os.path.join(os.path.dirname(__file__), "block.genesis")
+
+
+def load_genesis_block() -> Block:
+    with open(GENESIS_PATH, "rb") as f:
+        return Block.load(bytearray(f.read()))
+
+
+class _LazyGenesisBlock:
+    # decoded on first access, then stored on the class so later lookups are plain attribute reads
+    def __get__(self, instance, owner):
+        block = load_genesis_block()
+        owner.genesis_block = block
+        return block
+
 
 class Testnet3:
     edition = u16()
     network_id = u16(3)
     version = u32(6)
 
-    genesis_block = Block.load(bytearray(open(os.path.join(os.path.dirname(__file__), "block.genesis"), "rb").read()))
+    genesis_block = _LazyGenesisBlock()
 
     block_locator_num_recents = 100
     block_locator_recent_interval = 1
-    block_locator_checkpoint_interval = 10000
\ No newline at end of file
+    block_locator_checkpoint_interval = 10000
@@ -4,6 +4,7 @@ from .traits import *
 
 
 class Bech32m:
+    __slots__ = ("data", "prefix")
 
     def __init__(self, data, prefix):
         if not isinstance(data, bytes):
@@ -21,6 +22,7 @@ class Bech32m:
 
 
 class u8(Int):
+    __slots__ = ()
     size = 1
     min = 0
     max = 255
@@ -30,13 +32,12 @@ class u8(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<B", data[:1])[0])
-        del data[0]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<B", data.read(1))[0])
 
 
 class u16(Int):
+    __slots__ = ()
     size = 2
     min = 0
     max = 65535
@@ -46,13 +47,12 @@ class u16(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<H", data[:2])[0])
-        del data[:2]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<H", data.read(2))[0])
 
 
 class u32(Int):
+    __slots__ = ()
     size = 4
     min = 0
     max = 4294967295
@@ -62,13 +62,12 @@ class u32(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<I", data[:4])[0])
-        del data[:4]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<I", data.read(4))[0])
 
 
 class u64(Int):
+    __slots__ = ()
     size = 8
     min = 0
     max = 18446744073709551615
@@ -78,15 +77,14 @@ class u64(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<Q", data[:8])[0])
-        del data[:8]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<Q", data.read(8))[0])
 
 # Obviously we only support 64bit
 usize = u64
 
 class u128(Int):
+    __slots__ = ()
     size = 16
     min = 0
     max = 340282366920938463463374607431768211455
@@ -96,14 +94,13 @@ class u128(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        lo, hi = struct.unpack("<QQ", data[:16])
-        self = cls((hi << 64) | lo)
-        del data[:16]
-        return self
+    def read(cls, data: Cursor):
+        lo, hi = struct.unpack("<QQ", data.read(16))
+        return cls.trusted((hi << 64) | lo)
 
 
 class i8(Int):
+    __slots__ = ()
     size = 1
     min = -128
     max = 127
@@ -113,13 +110,12 @@ class i8(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<b", data[:1])[0])
-        del data[0]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<b", data.read(1))[0])
 
 
 class i16(Int):
+    __slots__ = ()
     size = 2
     min = -32768
     max = 32767
@@ -129,13 +125,12 @@ class i16(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<h", data[:2])[0])
-        del data[:2]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<h", data.read(2))[0])
 
 
 class i32(Int):
+    __slots__ = ()
     size = 4
     min = -2147483648
     max = 2147483647
@@ -145,13 +140,12 @@ class i32(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<i", data[:4])[0])
-        del data[:4]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<i", data.read(4))[0])
 
 
 class i64(Int):
+    __slots__ = ()
     size = 8
     min = -9223372036854775808
     max = 9223372036854775807
@@ -161,13 +155,12 @@ class i64(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        self = cls(struct.unpack("<q", data[:8])[0])
-        del data[:8]
-        return self
+    def read(cls, data: Cursor):
+        return cls.trusted(struct.unpack("<q", data.read(8))[0])
 
 
 class i128(Int):
+    __slots__ = ()
     size = 16
     min = -170141183460469231731687303715884105728
     max = 170141183460469231731687303715884105727
@@ -177,14 +170,14 @@ class i128(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        lo, hi = struct.unpack("<qq", data[:16])
-        self = cls((hi << 64) | lo)
-        del data[:16]
-        return self
+    def read(cls, data: Cursor):
+        lo, hi = struct.unpack("<qq", data.read(16))
+        return cls.trusted((hi << 64) | lo)
 
 
 class bool_(Int):
+    __slots__ = ()
+
     # Really don't want to make a proper bool, reusing Int is good enough for most usages
 
     size = 1
@@ -198,8 +191,8 @@ class bool_(Int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        value = struct.unpack("<B", data[:1])[0]
+    def read(cls, data: Cursor):
+        value = struct.unpack("<B", data.read(1))[0]
         if value == 0:
             value = False
         elif value == 1:
@@ -207,9 +200,7 @@ class bool_(Int):
         else:
             breakpoint()
             raise ValueError("invalid value for bool")
-        self = cls(value)
-        del data[:1]
-        return self
+        return cls.trusted(value)
 
     @classmethod
     def loads(cls, data: str):
@@ -233,7 +224,11 @@ class bool_(Int):
         return bool_(not self)
 
 
-class SocketAddr(Deserialize):
+class SocketAddr(Serialize, Deserialize):
+    __slots__ = ("ip", "port")
+    # u32 variant tag, u32 address, u16 port
+    size = 10
+
     def __init__(self, *, ip: int, port: int):
         if not isinstance(ip, int):
             raise TypeError("ip must be int")
@@ -246,12 +241,16 @@ class SocketAddr(Deserialize):
         self.ip = ip
         self.port = port
 
+    def dump(self) -> bytes:
+        # IPv4 variant tag, then the address as read below
+        return struct.pack("<IIH", 0, self.ip, self.port)
+
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        del data[:4]
-        ip = u32.load(data)
-        port = u16.load(data)
+    def read(cls, data: Cursor):
+        data.read(4)
+        ip = u32.read(data)
+        port = u16.read(data)
         return cls(ip=ip, port=port)
 
     def __str__(self):
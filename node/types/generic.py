@@ -1,41 +1,80 @@
 from collections.abc import Sequence
-from copy import deepcopy
 from types import UnionType
 
 from .basic import *
 
+# Parameterized generic types are built once and shared, keyed by (class, parameters).
+# The shared objects only describe the type; __call__ and read fill in a fresh copy.
+_generic_registry = {}
+
+
+def _parameterize(cls, item):
+    if not isinstance(item, tuple):
+        item = item,
+    key = cls, item
+    try:
+        return _generic_registry[key]
+    except KeyError:
+        pass
+    res = _generic_registry[key] = cls(item)
+    return res
+
 
 class Generic(metaclass=ABCMeta):
+    __slots__ = ("types",)
+
     @abstractmethod
     def __init__(self, types):
         self.types = types
 
     def __class_getitem__(cls, item):
-        if not isinstance(item, tuple):
-            item = item,
         ## Unfortunately we have sized vec, so we can't have this check anymore
         # if not all(isinstance(x, type) or isinstance(x, Generic) for x in item):
         #     raise TypeError("expected type or generic types as generic types")
-        return cls(item)
+        return _parameterize(cls, item)
+
+    # attributes that describe the parameterized type and are carried over to its values
+    _params = ("types",)
+
+    def _instance(self):
+        instance = object.__new__(type(self))
+        for name in self._params:
+            setattr(instance, name, getattr(self, name))
+        return instance
 
 
 class TypeParameter:
+    __slots__ = ("types",)
+
     @abstractmethod
     def __init__(self, types):
         self.types = types
 
     def __class_getitem__(cls, item):
-        if not isinstance(item, tuple):
-            item = item,
-        return cls(item)
+        return _parameterize(cls, item)
+
+    _params = ("types",)
+
+    def _instance(self):
+        instance = object.__new__(type(self))
+        for name in self._params:
+            setattr(instance, name, getattr(self, name))
+        return instance
 
 
 class Tuple(Generic, Serialize, Deserialize, Sequence):
+    __slots__ = ("value", "_readers")
+    _params = ("types", "_readers")
 
     def __init__(self, types):
         self.types = types
+        if all(isinstance(x, Deserialize) or isinstance(x, type) and issubclass(x, Deserialize) for x in types):
+            self._readers = tuple(t.read for t in types)
+        else:
+            self._readers = None
 
     def __call__(self, value: Sequence):
+        self = self._instance()
         if not isinstance(value, Sequence):
             raise TypeError("value must be Sequence")
         if len(value) != len(self.types):
@@ -58,33 +97,60 @@ class Tuple(Generic, Serialize, Deserialize, Sequence):
         return self.value[item]
 
     def dump(self) -> bytes:
+        buf = bytearray()
+        self.write(buf)
+        return bytes(buf)
+
+    def write(self, buf: bytearray):
         if not all(isinstance(x, Serialize) for x in self.value):
             raise TypeError("value must be serializable")
-        return b"".join(x.dump() for x in self.value)
+        for x in self.value:
+            x.write(buf)
 
     # @type_check
-    def load(self, data: bytearray):
-        if not all(issubclass(x, Deserialize) for x in self.types):
+    def read(self, data: Cursor):
+        if self._readers is None:
             raise TypeError("value must be deserializable")
-        self.value = tuple(t.load(data) for t in self.types)
+        self = self._instance()
+        self.value = tuple(read(data) for read in self._readers)
         return self
 
+    def skip(self, data: Cursor):
+        for t in self.types:
+            t.skip(data)
+
 
 class Vec(Generic, Serialize, Deserialize, Sequence):
+    __slots__ = ("type", "_list", "size", "size_type", "_read_item")
+    _params = ("types", "type", "size", "size_type", "_read_item")
 
     def __init__(self, types):
         if len(types) != 2:
             raise TypeError("expected 2 types for Vec")
         self.type = types[0]
+        # fixed size Vecs have no size type, the others get their size from the value
         if isinstance(types[1], int):
             self.size = types[1]
+            self.size_type = None
         elif issubclass(types[1], Int):
+            self.size = None
             self.size_type = types[1]
         else:
             raise TypeError("expected int or Int as size type")
+        # resolve the element loader once per parameterized Vec instead of on every element
+        if isinstance(self.type, type):
+            if issubclass(self.type, Deserialize):
+                self._read_item = self.type.read
+            else:
+                self._read_item = None
+        elif isinstance(self.type, Deserialize):
+            self._read_item = self.type.read
+        else:
+            self._read_item = None
         super().__init__(types)
 
     def __call__(self, value):
+        self = self._instance()
         if not isinstance(value, list):
             raise TypeError("value must be list")
         if isinstance(self.type, type) or isinstance(self.type, UnionType):
@@ -93,10 +159,10 @@ class Vec(Generic, Serialize, Deserialize, Sequence):
         else:
             if not all(isinstance(x, type(self.type)) for x in value):
                 raise TypeError("value must be of type {}".format(type(self.type)))
-        if hasattr(self, "size") and len(value) != self.size:
+        if self.size_type is None and len(value) != self.size:
             raise ValueError("value must be of size {}".format(self.size))
         self._list = value
-        if hasattr(self, "size_type"):
+        if self.size_type is not None:
             self.size = len(value)
         return self
 
@@ -122,42 +188,50 @@ class Vec(Generic, Serialize, Deserialize, Sequence):
             raise TypeError("index must be int")
 
     def dump(self) -> bytes:
-        res = b""
-        if hasattr(self, "size_type"):
-            res += self.size_type.dump(self.size)
+        buf = bytearray()
+        self.write(buf)
+        return bytes(buf)
+
+    def write(self, buf: bytearray):
+        if self.size_type is not None:
+            buf += self.size_type.dump(self.size)
         for item in self._list:
-            res += item.dump()
-        return res
+            item.write(buf)
 
     # @type_check
-    def load(self, data: bytearray):
-        if isinstance(self.type, type):
-            if not issubclass(self.type, Deserialize):
+    def read(self, data: Cursor):
+        read_item = self._read_item
+        if read_item is None:
+            if isinstance(self.type, type):
                 raise TypeError(f"{self.type.__name__} must be Deserialize")
-        else:
-            if not issubclass(type(self.type), Deserialize):
-                raise TypeError(f"{type(self.type).__name__} must be Deserialize")
-        if hasattr(self, "size_type"):
+            raise TypeError(f"{type(self.type).__name__} must be Deserialize")
+        self = self._instance()
+        if self.size_type is not None:
             if len(data) < self.size_type.size:
                 raise ValueError("data is too short")
-            self.size = self.size_type.load(data)
-        self._list = []
-        for i in range(self.size):
-            if isinstance(self.type, type):
-                self._list.append(self.type.load(data))
-            elif isinstance(self.type, Generic):
-                # Python version 3.10 does not support starred expressions in subscriptions
-                self._list.append(deepcopy(self.type).load(data))
-            else:
-                # What else can be here?
-                raise TypeError(f"cannot handle type {self.type} in Generic.load")
+            self.size = self.size_type.read(data)
+        self._list = [read_item(data) for _ in range(self.size)]
         return self
 
+    def skip(self, data: Cursor):
+        if self.size_type is not None:
+            size = self.size_type.read(data)
+        else:
+            size = self.size
+        if isinstance(self.type, type) and issubclass(self.type, Sized):
+            data.read(size * self.type.size)
+        else:
+            skip_item = self.type.skip
+            for _ in range(size):
+                skip_item(data)
+
     def __iter__(self):
         return iter(self._list)
 
 
 class VarInt(Generic, Serialize, Deserialize):
+    __slots__ = ("type", "value")
+    _params = ("types", "type")
 
     def __init__(self, types):
         if len(types) != 1:
@@ -168,6 +242,7 @@ class VarInt(Generic, Serialize, Deserialize):
     def __call__(self, value):
         if not isinstance(value, self.type):
             raise TypeError("value must be of type {}".format(self.type))
+        self = self._instance()
         self.value = value
         return self
 
@@ -184,26 +259,25 @@ class VarInt(Generic, Serialize, Deserialize):
             raise ValueError("unreachable")
 
     # @type_check
-    def load(self, data: bytearray):
+    def read(self, data: Cursor):
         if len(data) == 0:
             raise ValueError("data is too short")
-        if data[0] == 0xfd:
-            if len(data) < 3:
+        self = self._instance()
+        prefix = data.read_byte()
+        if prefix == 0xfd:
+            if len(data) < 2:
                 raise ValueError("data is too short")
-            self.value = u16.load(data[1:])
-            del data[:3]
-        elif data[0] == 0xfe:
-            if len(data) < 5:
+            self.value = u16.read(data)
+        elif prefix == 0xfe:
+            if len(data) < 4:
                 raise ValueError("data is too short")
-            self.value = u32.load(data[1:])
-            del data[:5]
-        elif data[0] == 0xff:
-            if len(data) < 9:
+            self.value = u32.read(data)
+        elif prefix == 0xff:
+            if len(data) < 8:
                 raise ValueError("data is too short")
-            self.value = u64.load(data[1:])
-            del data[:9]
+            self.value = u64.read(data)
         else:
-            self.value = u8.load(data)
+            self.value = u8(prefix)
         self.value = self.type(self.value)
         return self
 
@@ -214,6 +288,8 @@ class VarInt(Generic, Serialize, Deserialize):
         return int(self.value)
 
 class Option(Generic, Serialize, Deserialize):
+    __slots__ = ("type", "value")
+    _params = ("types", "type")
 
     def __init__(self, types):
         if len(types) != 1:
@@ -222,6 +298,7 @@ class Option(Generic, Serialize, Deserialize):
         super().__init__(types)
 
     def __call__(self, value):
+        self = self._instance()
         if value is None:
             self.value = None
         elif issubclass(type(self.type), Generic):
@@ -239,8 +316,16 @@ class Option(Generic, Serialize, Deserialize):
     def dump(self) -> bytes:
         if self.value is None:
             return b"\x00"
+        buf = bytearray(b"\x01")
+        self.value.write(buf)
+        return bytes(buf)
+
+    def write(self, buf: bytearray):
+        if self.value is None:
+            buf.append(0)
         else:
-            return b"\x01" + self.value.dump()
+            buf.append(1)
+            self.value.write(buf)
 
     def dumps(self) -> str | None:
         if self.value is None:
@@ -255,17 +340,26 @@ class Option(Generic, Serialize, Deserialize):
             return self.value.dump()
 
     # @type_check
-    def load(self, data: bytearray):
-        is_some = bool_.load(data)
+    def read(self, data: Cursor):
+        self = self._instance()
+        is_some = bool_.read(data)
         if is_some:
-            self.value = self.type.load(data)
+            self.value = self.type.read(data)
         else:
             self.value = None
         return self
 
+    def skip(self, data: Cursor):
+        if bool_.read(data):
+            self.type.skip(data)
+
 def generic_type_check(func):
+    hints = None
+
     def wrapper(*args, **kwargs):
-        hints = get_type_hints(func)
+        nonlocal hints
+        if hints is None:
+            hints = get_type_hints(func)
         for v, t in hints.items():
             arg = kwargs.get(v)
             if isinstance(t, Vec):
@@ -15,6 +15,8 @@ class NodeType(IntEnumu32):
 
 
 class Message(Serialize, Deserialize, metaclass=ABCMeta):
+    __slots__ = ()
+
     class Type(IntEnumu16):
         BeaconPropose = 0
         BeaconTimeout = 1
@@ -39,12 +41,15 @@ class Message(Serialize, Deserialize, metaclass=ABCMeta):
         def __repr__(self):
             return self.__class__.__name__ + "." + self.name
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
         raise NotImplementedError
 
 class BeaconPropose(Message):
+    __slots__ = ("version", "round", "block_height", "block_hash", "block")
     type = Message.Type.BeaconPropose
 
     # @type_check
@@ -61,16 +66,17 @@ class BeaconPropose(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        round_ = u64.load(data)
-        block_height = u32.load(data)
-        block_hash = BlockHash.load(data)
-        block = Block.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
+        round_ = u64.read(data)
+        block_height = u32.read(data)
+        block_hash = BlockHash.read(data)
+        block = Block.read(data)
         return cls(version, round_, block_height, block_hash, block)
 
 
 class BeaconTimeout(Message):
+    __slots__ = ("version", "round", "block_height", "block_hash", "signature")
     type = Message.Type.BeaconTimeout
 
     # @type_check
@@ -87,16 +93,17 @@ class BeaconTimeout(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        round_ = u64.load(data)
-        block_height = u32.load(data)
-        block_hash = BlockHash.load(data)
-        signature = Signature.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
+        round_ = u64.read(data)
+        block_height = u32.read(data)
+        block_hash = BlockHash.read(data)
+        signature = Signature.read(data)
         return cls(version, round_, block_height, block_hash, signature)
 
 
 class BeaconVote(Message):
+    __slots__ = ("version", "round", "block_height", "block_hash", "timestamp", "signature")
     type = Message.Type.BeaconVote
 
     # @type_check
@@ -115,17 +122,18 @@ class BeaconVote(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        round_ = u64.load(data)
-        block_height = u32.load(data)
-        block_hash = BlockHash.load(data)
-        timestamp = u64.load(data)
-        signature = Signature.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
+        round_ = u64.read(data)
+        block_height = u32.read(data)
+        block_hash = BlockHash.read(data)
+        timestamp = u64.read(data)
+        signature = Signature.read(data)
         return cls(version, round_, block_height, block_hash, timestamp, signature)
 
 
 class BlockRequest(Message):
+    __slots__ = ("start_height", "end_height")
     type = Message.Type.BlockRequest
 
     # @type_check
@@ -138,13 +146,14 @@ class BlockRequest(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        start_height = u32.load(data)
-        end_height = u32.load(data)
+    def read(cls, data: Cursor):
+        start_height = u32.read(data)
+        end_height = u32.read(data)
         return cls(start_height=start_height, end_height=end_height)
 
 
 class BlockResponse(Message):
+    __slots__ = ("request", "blocks")
     type = Message.Type.BlockResponse
 
     # @type_check
@@ -156,15 +165,21 @@ class BlockResponse(Message):
     def dump(self) -> bytes:
         return self.request.dump() + self.blocks.dump()
 
+    @staticmethod
+    def dump_serialized(request: BlockRequest, blocks: list[bytes]) -> bytes:
+        # same as dump() for blocks that are already serialized, they are not decoded again
+        return request.dump() + u8(len(blocks)).dump() + b"".join(blocks)
+
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        request = BlockRequest.load(data)
-        blocks = Vec[Block, u8].load(data)
+    def read(cls, data: Cursor):
+        request = BlockRequest.read(data)
+        blocks = Vec[Block, u8]([LazyBlock.read(data) for _ in range(u8.read(data))])
         return cls(request=request, blocks=blocks)
 
 
 class ChallengeRequest(Message):
+    __slots__ = ("version", "listener_port", "node_type", "address", "nonce")
     type = Message.Type.ChallengeRequest
 
     # @type_check
@@ -187,12 +202,12 @@ class ChallengeRequest(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u32.load(data)
-        listener_port = u16.load(data)
-        node_type = NodeType.load(data)
-        address = Address.load(data)
-        nonce = u64.load(data)
+    def read(cls, data: Cursor):
+        version = u32.read(data)
+        listener_port = u16.read(data)
+        node_type = NodeType.read(data)
+        address = Address.read(data)
+        nonce = u64.read(data)
         return cls(version=version, listener_port=listener_port, node_type=node_type, address=address, nonce=nonce)
 
     def __str__(self):
@@ -205,6 +220,7 @@ class ChallengeRequest(Message):
 
 
 class ChallengeResponse(Message):
+    __slots__ = ("genesis_header", "signature")
     type = Message.Type.ChallengeResponse
 
     # @type_check
@@ -217,13 +233,14 @@ class ChallengeResponse(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        genesis_header = BlockHeader.load(data)
-        signature = Signature.load(data)
+    def read(cls, data: Cursor):
+        genesis_header = BlockHeader.read(data)
+        signature = Signature.read(data)
         return cls(genesis_header=genesis_header, signature=signature)
 
 
 class YourPortIsClosed(int):
+
     def __new__(cls, **kwargs):
         return int.__new__(cls, 14)
 
@@ -233,8 +250,8 @@ class YourPortIsClosed(int):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        port = u16.load(data)
+    def read(cls, data: Cursor):
+        port = u16.read(data)
         return cls(port=port)
 
     def __str__(self):
@@ -263,16 +280,17 @@ class DisconnectReason(IntEnumu32):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) == 0:
             return cls(cls.NoReasonGiven)
-        reason = u32.load(data)
+        reason = u32.read(data)
         if reason == 14:
-            return YourPortIsClosed.load(data)
+            return YourPortIsClosed.read(data)
         return cls(reason)
 
 
 class Disconnect(Message):
+    __slots__ = ("reason",)
     type = Message.Type.Disconnect
 
     # @type_check
@@ -284,11 +302,12 @@ class Disconnect(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(reason=DisconnectReason.load(data))
+    def read(cls, data: Cursor):
+        return cls(reason=DisconnectReason.read(data))
 
 
 class PeerRequest(Message):
+    __slots__ = ()
     type = Message.Type.PeerRequest
 
     def __init__(self):
@@ -298,11 +317,12 @@ class PeerRequest(Message):
         return b""
 
     @classmethod
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         return cls()
 
 
 class PeerResponse(Message):
+    __slots__ = ("peers",)
     type = Message.Type.PeerResponse
 
     # @type_check
@@ -310,15 +330,21 @@ class PeerResponse(Message):
         self.peers = peers
 
     def dump(self) -> bytes:
-        raise NotImplementedError
+        return self.peers.dump()
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        peers = Vec[SocketAddr, u64].load(data)
-        return cls(peers=peers)
+    def read(cls, data: Cursor):
+        # peers answer with hundreds of fixed size addresses, unpacked in one go
+        count = u64.read(data)
+        peers = [
+            SocketAddr(ip=ip, port=port)
+            for _, ip, port in struct.iter_unpack("<IIH", data.read(count * SocketAddr.size))
+        ]
+        return cls(peers=Vec[SocketAddr, u64](peers))
 
 class BlockLocators(Serialize, Deserialize):
+    __slots__ = ("recents", "checkpoints")
 
     # @type_check
     def __init__(self, *, recents, checkpoints):
@@ -336,22 +362,23 @@ class BlockLocators(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        num_locators = u64.load(data)
+    def read(cls, data: Cursor):
+        num_locators = u64.read(data)
         recents = {}
         for _ in range(num_locators):
-            height = u32.load(data)
-            block_hash = BlockHash.load(data)
+            height = u32.read(data)
+            block_hash = BlockHash.read(data)
             recents[height] = block_hash
-        num_checkpoints = u64.load(data)
+        num_checkpoints = u64.read(data)
         checkpoints = {}
         for _ in range(num_checkpoints):
-            height = u32.load(data)
-            block_hash = BlockHash.load(data)
+            height = u32.read(data)
+            block_hash = BlockHash.read(data)
             checkpoints[height] = block_hash
         return cls(recents=recents, checkpoints=checkpoints)
 
 class Ping(Message):
+    __slots__ = ("version", "node_type", "block_locators")
     type = Message.Type.Ping
 
     # @type_check
@@ -366,13 +393,14 @@ class Ping(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u32.load(data)
-        node_type = NodeType.load(data)
-        block_locators = Option[BlockLocators].load(data)
+    def read(cls, data: Cursor):
+        version = u32.read(data)
+        node_type = NodeType.read(data)
+        block_locators = Option[BlockLocators].read(data)
         return cls(version=version, node_type=node_type, block_locators=block_locators)
 
 class Pong(Message):
+    __slots__ = ("is_fork",)
     type = Message.Type.Pong
 
     # @generic_type_check
@@ -393,8 +421,8 @@ class Pong(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        fork_flag = u8.load(data)
+    def read(cls, data: Cursor):
+        fork_flag = u8.read(data)
         match fork_flag:
             case 0:
                 is_fork = Option[bool_](bool_(True))
@@ -409,6 +437,7 @@ class Pong(Message):
 
 
 class PuzzleRequest(Message):
+    __slots__ = ()
     type = Message.Type.PuzzleRequest
 
     def __init__(self):
@@ -418,11 +447,12 @@ class PuzzleRequest(Message):
         return b""
 
     @classmethod
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         return cls()
 
 
 class PuzzleResponse(Message):
+    __slots__ = ("epoch_challenge", "block_header")
     type = Message.Type.PuzzleResponse
 
     # @type_check
@@ -435,13 +465,14 @@ class PuzzleResponse(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        epoch_challenge = EpochChallenge.load(data)
-        block_header = BlockHeader.load(data)
+    def read(cls, data: Cursor):
+        epoch_challenge = EpochChallenge.read(data)
+        block_header = BlockHeader.read(data)
         return cls(epoch_challenge=epoch_challenge, block_header=block_header)
 
 
 class UnconfirmedSolution(Message):
+    __slots__ = ("puzzle_commitment", "solution")
     type = Message.Type.UnconfirmedSolution
 
     # @type_check
@@ -454,13 +485,14 @@ class UnconfirmedSolution(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        puzzle_commitment = PuzzleCommitment.load(data)
-        solution = ProverSolution.load(data)
+    def read(cls, data: Cursor):
+        puzzle_commitment = PuzzleCommitment.read(data)
+        solution = ProverSolution.read(data)
         return cls(puzzle_commitment=puzzle_commitment, solution=solution)
 
 
 class UnconfirmedTransaction(Message):
+    __slots__ = ("transaction_id", "transaction")
     type = Message.Type.UnconfirmedTransaction
 
     # @type_check
@@ -473,13 +505,14 @@ class UnconfirmedTransaction(Message):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        transaction_id = TransactionID.load(data)
-        transaction = Transaction.load(data)
+    def read(cls, data: Cursor):
+        transaction_id = TransactionID.read(data)
+        transaction = Transaction.read(data)
         return cls(transaction_id=transaction_id, transaction=transaction)
 
 
 class Frame(Serialize, Deserialize):
+    __slots__ = ("type", "message")
 
     # @type_check
     def __init__(self, *, type_: Message.Type, message: Message):
@@ -491,46 +524,14 @@ class Frame(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 2:
             raise ValueError("missing message id")
-        type_ = Message.Type(struct.unpack("<H", data[:2])[0])
-        del data[:2]
-        match type_:
-            case Message.Type.BeaconPropose:
-                message = BeaconPropose.load(data)
-            case Message.Type.BeaconTimeout:
-                message = BeaconTimeout.load(data)
-            case Message.Type.BeaconVote:
-                message = BeaconVote.load(data)
-            case Message.Type.BlockRequest:
-                message = BlockRequest.load(data)
-            case Message.Type.BlockResponse:
-                message = BlockResponse.load(data)
-            case Message.Type.ChallengeRequest:
-                message = ChallengeRequest.load(data)
-            case Message.Type.ChallengeResponse:
-                message = ChallengeResponse.load(data)
-            case Message.Type.Disconnect:
-                message = Disconnect.load(data)
-            case Message.Type.PeerRequest:
-                message = PeerRequest.load(data)
-            case Message.Type.PeerResponse:
-                message = PeerResponse.load(data)
-            case Message.Type.Ping:
-                message = Ping.load(data)
-            case Message.Type.Pong:
-                message = Pong.load(data)
-            case Message.Type.PuzzleRequest:
-                message = PuzzleRequest.load(data)
-            case Message.Type.PuzzleResponse:
-                message = PuzzleResponse.load(data)
-            case Message.Type.UnconfirmedSolution:
-                message = UnconfirmedSolution.load(data)
-            case Message.Type.UnconfirmedTransaction:
-                message = UnconfirmedTransaction.load(data)
-            case _:
-                raise ValueError(f"unknown message type {type_}")
+        type_ = Message.Type.read(data)
+        message_type = Message.type_map.get(type_)
+        if message_type is None:
+            raise ValueError(f"unknown message type {type_}")
+        message = message_type.read(data)
 
         return cls(type_=type_, message=message)
 
@@ -7,27 +7,129 @@ from .utils import *
 
 
 class Deserialize(metaclass=ABCMeta):
+    __slots__ = ()
 
     @abstractmethod
-    def load(self, data: bytearray):
+    def read(self, data: Cursor):
         raise NotImplementedError
 
+    @hybridmethod
+    def load(self, data: bytearray):
+        # bytearray entry point, consumes the parsed bytes from data like before
+        cursor = Cursor(data)
+        res = self.read(cursor)
+        offset = cursor.offset
+        cursor.release()
+        if isinstance(data, bytearray):
+            del data[:offset]
+        return res
+
+    @hybridmethod
+    def skip(self, data: Cursor):
+        # Advances past one encoded value. Types that can do it without decoding override this.
+        self.read(data)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # tagged variants register themselves in the type_map of the enum base they derive from,
+        # so the base can dispatch on the decoded tag with a single lookup
+        type_ = cls.__dict__.get("type")
+        if isinstance(type_, IntEnum):
+            for base in cls.__mro__[1:]:
+                if "type_map" in base.__dict__:
+                    base.type_map[type_] = cls
+                    break
+
 
 class Serialize(metaclass=ABCMeta):
+    __slots__ = ()
 
     @abstractmethod
     def dump(self) -> bytes:
         raise NotImplementedError
 
+    def write(self, buf: bytearray):
+        # Composite types override this to append their fields to one shared buffer
+        buf += self.dump()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "layout" in cls.__dict__:
+            compile_layout(cls)
+
+
+# Declared field layouts
+#
+# A class can declare its wire format once as a `layout` tuple, in wire order:
+#   - "version" / "type": a class level constant that is written as is, and checked when reading
+#   - ("program_id", ProgramID): a field, the attribute and its constructor keyword
+#   - ("id", TransitionID, "id_"): a field whose constructor keyword is not the attribute name
+# write, dump, read and skip are then built from it unless the class defines them itself.
+
+def compile_layout(cls):
+    # (attribute, type, constructor keyword) in wire order, constants have no keyword and are read with the type
+    # of their value
+    fields = []
+    for entry in cls.layout:
+        if isinstance(entry, str):
+            fields.append((entry, type(getattr(cls, entry)), None))
+        else:
+            attribute, type_, *keyword = entry
+            fields.append((attribute, type_, keyword[0] if keyword else attribute))
+
+    def write(self, buf: bytearray):
+        for attribute, _, _ in fields:
+            getattr(self, attribute).write(buf)
+
+    def dump(self) -> bytes:
+        buf = bytearray()
+        self.write(buf)
+        return bytes(buf)
+
+    def read(cls, data: Cursor):
+        kwargs = {}
+        for attribute, type_, keyword in fields:
+            value = type_.read(data)
+            if keyword is not None:
+                kwargs[keyword] = value
+            elif value != getattr(cls, attribute):
+                raise ValueError(f"{attribute} mismatch: expected {getattr(cls, attribute)}, got {value}")
+        return cls(**kwargs)
+
+    def skip(cls, data: Cursor):
+        for attribute, type_, keyword in fields:
+            if keyword is not None:
+                type_.skip(data)
+                continue
+            value = type_.read(data)
+            if value != getattr(cls, attribute):
+                raise ValueError(f"{attribute} mismatch: expected {getattr(cls, attribute)}, got {value}")
+
+    for function in (write, dump, read, skip):
+        function.__qualname__ = f"{cls.__qualname__}.{function.__name__}"
+    for function in (write, dump):
+        if function.__name__ not in cls.__dict__:
+            setattr(cls, function.__name__, function)
+    for function in (read, skip):
+        if function.__name__ not in cls.__dict__:
+            setattr(cls, function.__name__, classmethod(function))
+
 
 class Sized(metaclass=ABCMeta):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def size(self):
         raise NotImplementedError
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        data.read(cls.size)
+
 
 class Int(Sized, Serialize, Deserialize, int, metaclass=ABCMeta):
+    __slots__ = ()
 
     def __new__(cls, value=0):
         return int.__new__(cls, value)
@@ -40,30 +142,42 @@ class Int(Sized, Serialize, Deserialize, int, metaclass=ABCMeta):
         if not self.min <= value <= self.max:
             raise ValueError("value must be between {} and {}".format(self.min, self.max))
 
+    @classmethod
+    def trusted(cls, value: int):
+        # no type or range checks, for values that are already known to fit: struct.unpack output and database rows
+        return int.__new__(cls, value)
+
+    @classmethod
+    def _checked(cls, value: int):
+        # range check only, for arithmetic results whose type is already int
+        if not cls.min <= value <= cls.max:
+            raise ValueError("value must be between {} and {}".format(cls.min, cls.max))
+        return int.__new__(cls, value)
+
     @classmethod
     def loads(cls, value: int):
         return cls(value)
 
     def __add__(self, other):
         if type(other) is int:
-            return self.__class__(int.__add__(self, other))
+            return self._checked(int.__add__(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for +: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__add__(self, other))
+        return self._checked(int.__add__(self, other))
 
     def __sub__(self, other):
         if type(other) is int:
-            return self.__class__(int.__sub__(self, other))
+            return self._checked(int.__sub__(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for -: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__sub__(self, other))
+        return self._checked(int.__sub__(self, other))
 
     def __mul__(self, other):
         if type(other) is int:
-            return self.__class__(int.__mul__(self, other))
+            return self._checked(int.__mul__(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for *: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__mul__(self, other))
+        return self._checked(int.__mul__(self, other))
 
     def __eq__(self, other):
         if type(other) is int:
@@ -77,19 +191,27 @@ class Int(Sized, Serialize, Deserialize, int, metaclass=ABCMeta):
 
     def __invert__(self):
         if self.min == 0:
-            return self.__class__(~int(self) & self.max)
-        return self.__class__(~int(self))
+            return self._checked(~int(self) & self.max)
+        return self._checked(~int(self))
 
     # we are deviating from python's insane behavior here
     # this is actually __truncdiv__
     def __floordiv__(self, other):
         if type(other) is int:
-            return self.__class__(int(self / other))
+            return self._checked(int(self / other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for //: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int(self / other))
+        return self._checked(int(self / other))
+
+
 
 
+def enum_member(cls, value: int):
+    # EnumType.__call__ is slow enough to show up in tag dispatch, so decoded tags look the member up directly
+    member = cls._value2member_map_.get(value)
+    if member is None:
+        raise ValueError(f"{value!r} is not a valid {cls.__qualname__}")
+    return member
 
 
 class IntEnumu8(Serialize, Deserialize, IntEnum, metaclass=ABCEnumMeta):
@@ -99,12 +221,10 @@ class IntEnumu8(Serialize, Deserialize, IntEnum, metaclass=ABCEnumMeta):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 1:
             raise ValueError("incorrect length")
-        self = cls(struct.unpack("<B", data[:1])[0])
-        del data[:1]
-        return self
+        return enum_member(cls, struct.unpack("<B", data.read(1))[0])
 
 
 class IntEnumu16(Serialize, Deserialize, IntEnum, metaclass=ABCEnumMeta):
@@ -114,12 +234,10 @@ class IntEnumu16(Serialize, Deserialize, IntEnum, metaclass=ABCEnumMeta):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 2:
             raise ValueError("incorrect length")
-        self = cls(struct.unpack("<H", data[:2])[0])
-        del data[:2]
-        return self
+        return enum_member(cls, struct.unpack("<H", data.read(2))[0])
 
 
 class IntEnumu32(Serialize, Deserialize, IntEnum, metaclass=ABCEnumMeta):
@@ -129,9 +247,7 @@ class IntEnumu32(Serialize, Deserialize, IntEnum, metaclass=ABCEnumMeta):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 4:
             raise ValueError("incorrect length")
-        self = cls(struct.unpack("<I", data[:4])[0])
-        del data[:4]
-        return self
\ No newline at end of file
+        return enum_member(cls, struct.unpack("<I", data.read(4))[0])
\ No newline at end of file
@@ -1,5 +1,6 @@
 from abc import ABCMeta
 from enum import EnumMeta
+from types import MethodType
 from typing import get_type_hints
 
 import aleo
@@ -27,6 +28,64 @@ class ABCEnumMeta(ABCMeta, EnumMeta):
         return abstract_enum_cls
 
 
+class hybridmethod:
+    # Binds to the instance when called on one, otherwise to the class.
+    # Generic types are used as instances (Vec[Field, u64]) while everything else is used as classes,
+    # this lets both share a single implementation.
+
+    def __init__(self, func):
+        self.func = func
+
+    def __get__(self, instance, owner):
+        return MethodType(self.func, owner if instance is None else instance)
+
+
+# Deserialization cursor
+
+class Cursor:
+    # Read position over a memoryview of the input.
+    # Loaders advance the offset instead of deleting consumed bytes from the front of a bytearray,
+    # which made parsing large messages quadratic.
+
+    __slots__ = ("view", "offset")
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def __len__(self):
+        return len(self.view) - self.offset
+
+    def read(self, size: int) -> memoryview:
+        start = self.offset
+        end = start + size
+        if end > len(self.view):
+            raise ValueError("data is too short")
+        self.offset = end
+        return self.view[start:end]
+
+    def read_byte(self) -> int:
+        try:
+            value = self.view[self.offset]
+        except IndexError:
+            raise ValueError("data is too short")
+        self.offset += 1
+        return value
+
+    def peek_byte(self, ahead: int = 0) -> int:
+        try:
+            return self.view[self.offset + ahead]
+        except IndexError:
+            raise ValueError("data is too short")
+
+    def take(self, size: int) -> "Cursor":
+        # Bounded cursor over the next size bytes, for length-prefixed data
+        return Cursor(self.read(size))
+
+    def release(self):
+        self.view.release()
+
+
 # Type check decorator
 
 def type_check(func):
@@ -1,6 +1,7 @@
 from .generic import *
 
 class AleoID(Sized, Serialize, Deserialize, metaclass=ABCMeta):
+    __slots__ = ("_data", "_bech32m")
     size = 32
 
     def __init__(self, data):
@@ -24,33 +25,37 @@ class AleoID(Sized, Serialize, Deserialize, metaclass=ABCMeta):
         if not isinstance(value, bytes):
             raise TypeError("data must be bytes")
         self._data = value
-        self._bech32m = Bech32m(value, self._prefix)
+        # bech32m string, encoded on first str()
+        self._bech32m = None
 
     def dump(self) -> bytes:
         return self._data
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < cls.size:
             raise ValueError("incorrect length")
-        size = cls.size
-        self = cls(bytes(data[:size]))
-        del data[:size]
-        return self
+        return cls(bytes(data.read(cls.size)))
 
     @classmethod
     # @type_check
     def loads(cls, data: str):
-        hrp, data = aleo.bech32_decode(data)
+        hrp, raw = aleo.bech32_decode(data)
         if hrp != cls._prefix:
             raise ValueError("incorrect hrp")
-        if len(data) != cls.size:
+        if len(raw) != cls.size:
             raise ValueError("incorrect length")
-        return cls(bytes(data))
+        res = cls(bytes(raw))
+        # a decodable lowercase string is already the canonical encoding
+        if data.islower():
+            res._bech32m = data
+        return res
 
     def __str__(self):
-        return str(self._bech32m)
+        if self._bech32m is None:
+            self._bech32m = aleo.bech32_encode(self._prefix, self._data)
+        return self._bech32m
 
     def __repr__(self):
         return self.__class__.__name__ + "(" + str(self) + ")"
@@ -62,6 +67,8 @@ class AleoID(Sized, Serialize, Deserialize, metaclass=ABCMeta):
 
 
 class AleoObject(Sized, Serialize, Deserialize, metaclass=ABCMeta):
+    __slots__ = ("_data", "_bech32m")
+
     def __init__(self, data):
         if not isinstance(self._prefix, str):
             raise TypeError("object_prefix must be str")
@@ -87,34 +94,38 @@ class AleoObject(Sized, Serialize, Deserialize, metaclass=ABCMeta):
         if len(value) != self.size:
             raise ValueError("data must be %d bytes" % self.size)
         self._data = value
-        self._bech32m = Bech32m(value, self._prefix)
+        self._bech32m = None
 
     def dump(self) -> bytes:
         return self._data
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         size = cls.size
         # noinspection PyTypeChecker
         if len(data) < size:
             raise ValueError("incorrect length")
-        self = cls(bytes(data[:size]))
-        del data[:size]
-        return self
+        return cls(bytes(data.read(size)))
 
     @classmethod
     # @type_check
     def loads(cls, data: str):
-        hrp, data = aleo.bech32_decode(data)
+        hrp, raw = aleo.bech32_decode(data)
         if hrp != cls._prefix:
             raise ValueError("incorrect hrp")
-        if len(data) != cls.size:
+        if len(raw) != cls.size:
             raise ValueError("incorrect length")
-        return cls(bytes(data))
+        res = cls(bytes(raw))
+        # a decodable lowercase string is already the canonical encoding
+        if data.islower():
+            res._bech32m = data
+        return res
 
     def __str__(self):
-        return str(self._bech32m)
+        if self._bech32m is None:
+            self._bech32m = aleo.bech32_encode(self._prefix, self._data)
+        return self._bech32m
 
     def __repr__(self):
         return self.__class__.__name__ + "(" + str(self) + ")"
@@ -126,18 +137,22 @@ class AleoObject(Sized, Serialize, Deserialize, metaclass=ABCMeta):
 
 
 class BlockHash(AleoID):
+    __slots__ = ()
     _prefix = "ab"
 
 
 class StateRoot(AleoID):
+    __slots__ = ()
     _prefix = "ar"
 
 
 class TransactionID(AleoID):
+    __slots__ = ()
     _prefix = "at"
 
 
 class TransitionID(AleoID):
+    __slots__ = ()
     _prefix = "as"
 
 
@@ -154,6 +169,8 @@ class TransitionID(AleoID):
 
 
 class Address(AleoObject):
+    __slots__ = ()
+
     # Should work like this...
 
     _prefix = "aleo"
@@ -163,7 +180,10 @@ class Address(AleoObject):
         AleoObject.__init__(self, data)
 
 
-class Field(Serialize, Deserialize):
+class Field(Sized, Serialize, Deserialize):
+    __slots__ = ("data",)
+    size = 32
+
     # Fr, Fp256
     # Just store as a large integer now
     # Hopefully this will not be used later...
@@ -178,11 +198,10 @@ class Field(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 32:
             raise ValueError("incorrect length")
-        data_ = int.from_bytes(bytes(data[:32]), "little")
-        del data[:32]
+        data_ = int.from_bytes(data.read(32), "little")
         return cls(data_)
 
     @classmethod
@@ -201,7 +220,10 @@ class Field(Serialize, Deserialize):
         return hash(self.data)
 
 
-class Group(Serialize, Deserialize):
+class Group(Sized, Serialize, Deserialize):
+    __slots__ = ("data",)
+    size = 32
+
     # This is definitely wrong, but we are not using the internals
     # @type_check
     def __init__(self, data):
@@ -214,11 +236,10 @@ class Group(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 32:
             raise ValueError("incorrect length")
-        data_ = int.from_bytes(bytes(data[:32]), "little")
-        del data[:32]
+        data_ = int.from_bytes(data.read(32), "little")
         return cls(data_)
 
     @classmethod
@@ -229,7 +250,10 @@ class Group(Serialize, Deserialize):
         return str(self.data) + "group"
 
 
-class Scalar(Serialize, Deserialize):
+class Scalar(Sized, Serialize, Deserialize):
+    __slots__ = ("data",)
+    size = 32
+
     # Could be wrong as well
     # @type_check
     def __init__(self, data):
@@ -242,11 +266,10 @@ class Scalar(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 32:
             raise ValueError("incorrect length")
-        data_ = int.from_bytes(bytes(data[:32]), "little")
-        del data[:32]
+        data_ = int.from_bytes(data.read(32), "little")
         return cls(data_)
 
     @classmethod
@@ -257,7 +280,10 @@ class Scalar(Serialize, Deserialize):
         return str(self.data) + "scalar"
 
 
-class Fq(Serialize, Deserialize):
+class Fq(Sized, Serialize, Deserialize):
+    __slots__ = ("value",)
+    size = 48
+
     # Fp384, G1
     # @type_check
     def __init__(self, value: int):
@@ -268,17 +294,18 @@ class Fq(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 48:
             raise ValueError("incorrect length")
-        value = int.from_bytes(bytes(data[:48]), "little")
-        del data[:48]
+        value = int.from_bytes(data.read(48), "little")
         return cls(value=value)
 
     def __str__(self):
         return str(self.value)
 
-class G1Affine(Serialize, Deserialize):
+class G1Affine(Sized, Serialize, Deserialize):
+    __slots__ = ("x", "flags")
+    size = 48
 
     # @type_check
     def __init__(self, *, x: Fq, flags: bool):
@@ -292,14 +319,15 @@ class G1Affine(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        data_ = data[:48]
-        del data[:48]
+    def read(cls, data: Cursor):
+        data_ = bytearray(data.read(48))
         flags = bool(data_[-1] >> 7)
         data_[-1] &= 0x7f
-        return cls(x=Fq.load(data_), flags=flags)
+        return cls(x=Fq.read(Cursor(data_)), flags=flags)
 
-class Fq2(Serialize, Deserialize):
+class Fq2(Sized, Serialize, Deserialize):
+    __slots__ = ("c0", "c1", "flags")
+    size = 96
 
     # @type_check
     def __init__(self, c0: Fq, c1: Fq, flags: bool):
@@ -314,16 +342,18 @@ class Fq2(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        data_ = data[:96]
-        del data[:96]
+    def read(cls, data: Cursor):
+        data_ = bytearray(data.read(96))
         flags = bool(data_[-1] >> 7)
         data_[-1] &= 0x7f
-        c0 = Fq.load(data_)
-        c1 = Fq.load(data_)
+        data_ = Cursor(data_)
+        c0 = Fq.read(data_)
+        c1 = Fq.read(data_)
         return cls(c0=c0, c1=c1, flags=flags)
 
-class G2Affine(Serialize, Deserialize):
+class G2Affine(Sized, Serialize, Deserialize):
+    __slots__ = ("x",)
+    size = 96
 
     # @type_check
     def __init__(self, *, x: Fq2):
@@ -334,11 +364,12 @@ class G2Affine(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        x = Fq2.load(data)
+    def read(cls, data: Cursor):
+        x = Fq2.read(data)
         return cls(x=x)
 
 class G2Prepared(Serialize, Deserialize):
+    __slots__ = ("ell_coeffs", "infinity")
 
     # @type_check
     @generic_type_check
@@ -351,7 +382,7 @@ class G2Prepared(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        ell_coeffs = Vec[Tuple[Fq2, Fq2, Fq2], u64].load(data)
-        infinity = bool_.load(data)
+    def read(cls, data: Cursor):
+        ell_coeffs = Vec[Tuple[Fq2, Fq2, Fq2], u64].read(data)
+        infinity = bool_.read(data)
         return cls(ell_coeffs=ell_coeffs, infinity=infinity)
\ No newline at end of file
@@ -18,6 +18,10 @@ def feature_string_from_instructions(instructions: [Instruction]) -> str:
     return "".join(res)
 
 class EvaluationDomain(Serialize, Deserialize):
+    __slots__ = (
+        "size", "log_size_of_group", "size_as_field_element", "size_inv", "group_gen", "group_gen_inv",
+        "generator_inv",
+    )
 
     # @type_check
     def __init__(self, *, size: u64, log_size_of_group: u32, size_as_field_element: Field, size_inv: Field,
@@ -36,18 +40,19 @@ class EvaluationDomain(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        size = u64.load(data)
-        log_size_of_group = u32.load(data)
-        size_as_field_element = Field.load(data)
-        size_inv = Field.load(data)
-        group_gen = Field.load(data)
-        group_gen_inv = Field.load(data)
-        generator_inv = Field.load(data)
+    def read(cls, data: Cursor):
+        size = u64.read(data)
+        log_size_of_group = u32.read(data)
+        size_as_field_element = Field.read(data)
+        size_inv = Field.read(data)
+        group_gen = Field.read(data)
+        group_gen_inv = Field.read(data)
+        generator_inv = Field.read(data)
         return cls(size=size, log_size_of_group=log_size_of_group, size_as_field_element=size_as_field_element,
                    size_inv=size_inv, group_gen=group_gen, group_gen_inv=group_gen_inv, generator_inv=generator_inv)
 
 class EvaluationsOnDomain(Serialize, Deserialize):
+    __slots__ = ("evaluations", "domain")
 
     # @type_check
     def __init__(self, *, evaluations: Vec[Field, u64], domain: EvaluationDomain):
@@ -59,13 +64,14 @@ class EvaluationsOnDomain(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        evaluations = Vec[Field, u64].load(data)
-        domain = EvaluationDomain.load(data)
+    def read(cls, data: Cursor):
+        evaluations = Vec[Field, u64].read(data)
+        domain = EvaluationDomain.read(data)
         return cls(evaluations=evaluations, domain=domain)
 
 
 class EpochChallenge(Serialize, Deserialize):
+    __slots__ = ("epoch_number", "epoch_block_hash", "epoch_polynomial", "epoch_polynomial_evaluations")
 
     # @type_check
     def __init__(self, *, epoch_number: u32, epoch_block_hash: BlockHash, epoch_polynomial: Vec[Field, u64],
@@ -81,16 +87,17 @@ class EpochChallenge(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        epoch_number = u32.load(data)
-        epoch_block_hash = BlockHash.load(data)
-        epoch_polynomial = Vec[Field, u64].load(data)
-        epoch_polynomial_evaluations = EvaluationsOnDomain.load(data)
+    def read(cls, data: Cursor):
+        epoch_number = u32.read(data)
+        epoch_block_hash = BlockHash.read(data)
+        epoch_polynomial = Vec[Field, u64].read(data)
+        epoch_polynomial_evaluations = EvaluationsOnDomain.read(data)
         return cls(epoch_number=epoch_number, epoch_block_hash=epoch_block_hash, epoch_polynomial=epoch_polynomial,
                    epoch_polynomial_evaluations=epoch_polynomial_evaluations)
 
 
 class MapKey(Serialize, Deserialize):
+    __slots__ = ("name", "plaintext_type")
 
     # @type_check
     def __init__(self, *, name: Identifier, plaintext_type: PlaintextType):
@@ -102,13 +109,14 @@ class MapKey(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        plaintext_type = PlaintextType.read(data)
         return cls(name=name, plaintext_type=plaintext_type)
 
 
 class MapValue(Serialize, Deserialize):
+    __slots__ = ("name", "plaintext_type")
 
     # @type_check
     def __init__(self, *, name: Identifier, plaintext_type: PlaintextType):
@@ -120,13 +128,14 @@ class MapValue(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        plaintext_type = PlaintextType.read(data)
         return cls(name=name, plaintext_type=plaintext_type)
 
 
 class Mapping(Serialize, Deserialize):
+    __slots__ = ("name", "key", "value")
 
     # @type_check
     def __init__(self, *, name: Identifier, key: MapKey, value: MapValue):
@@ -139,14 +148,15 @@ class Mapping(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        key = MapKey.load(data)
-        value = MapValue.load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        key = MapKey.read(data)
+        value = MapValue.read(data)
         return cls(name=name, key=key, value=value)
 
 
 class Struct(Serialize, Deserialize):
+    __slots__ = ("name", "members")
 
     # @type_check
     @generic_type_check
@@ -159,9 +169,9 @@ class Struct(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        members = Vec[Tuple[Identifier, PlaintextType], u16].load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        members = Vec[Tuple[Identifier, PlaintextType], u16].read(data)
         return cls(name=name, members=members)
 
 
@@ -171,6 +181,7 @@ class PublicOrPrivate(IntEnumu8):
 
 
 class EntryType(Serialize, Deserialize):  # enum
+    __slots__ = ("type", "plaintext_type")
 
     class Type(IntEnumu8):
         Constant = 0
@@ -187,13 +198,14 @@ class EntryType(Serialize, Deserialize):  # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        plaintext_type = PlaintextType.read(data)
         return cls(type_=type_, plaintext_type=plaintext_type)
 
 
 class RecordType(Serialize, Deserialize):
+    __slots__ = ("name", "owner", "entries")
 
     # @type_check
     @generic_type_check
@@ -207,14 +219,15 @@ class RecordType(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        owner = PublicOrPrivate.load(data)
-        entries = Vec[Tuple[Identifier, EntryType], u16].load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        owner = PublicOrPrivate.read(data)
+        entries = Vec[Tuple[Identifier, EntryType], u16].read(data)
         return cls(name=name, owner=owner, entries=entries)
 
 
 class ClosureInput(Serialize, Deserialize):
+    __slots__ = ("register", "register_type")
 
     # @type_check
     def __init__(self, *, register: Register, register_type: RegisterType):
@@ -226,13 +239,14 @@ class ClosureInput(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        register = Register.load(data)
-        register_type = RegisterType.load(data)
+    def read(cls, data: Cursor):
+        register = Register.read(data)
+        register_type = RegisterType.read(data)
         return cls(register=register, register_type=register_type)
 
 
 class ClosureOutput(Serialize, Deserialize):
+    __slots__ = ("operand", "register_type")
 
     # @type_check
     def __init__(self, *, operand: Operand, register_type: RegisterType):
@@ -244,13 +258,14 @@ class ClosureOutput(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        operand = Operand.load(data)
-        register_type = RegisterType.load(data)
+    def read(cls, data: Cursor):
+        operand = Operand.read(data)
+        register_type = RegisterType.read(data)
         return cls(operand=operand, register_type=register_type)
 
 
 class Closure(Serialize, Deserialize):
+    __slots__ = ("name", "inputs", "instructions", "outputs")
 
     # @type_check
     @generic_type_check
@@ -266,11 +281,11 @@ class Closure(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        inputs = Vec[ClosureInput, u16].load(data)
-        instructions = Vec[Instruction, u32].load(data)
-        outputs = Vec[ClosureOutput, u16].load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        inputs = Vec[ClosureInput, u16].read(data)
+        instructions = Vec[Instruction, u32].read(data)
+        outputs = Vec[ClosureOutput, u16].read(data)
         return cls(name=name, inputs=inputs, instructions=instructions, outputs=outputs)
 
     def instruction_feature_string(self) -> str:
@@ -278,6 +293,7 @@ class Closure(Serialize, Deserialize):
 
 
 class FinalizeCommand(Serialize, Deserialize):
+    __slots__ = ("operands",)
 
     # @type_check
     @generic_type_check
@@ -289,12 +305,13 @@ class FinalizeCommand(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        operands = Vec[Operand, u8].load(data)
+    def read(cls, data: Cursor):
+        operands = Vec[Operand, u8].read(data)
         return cls(operands=operands)
 
 
 class Decrement(Serialize, Deserialize):
+    __slots__ = ("mapping", "first", "second")
 
     # @type_check
     def __init__(self, *, mapping: Identifier, first: Operand, second: Operand):
@@ -307,14 +324,15 @@ class Decrement(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping = Identifier.load(data)
-        first = Operand.load(data)
-        second = Operand.load(data)
+    def read(cls, data: Cursor):
+        mapping = Identifier.read(data)
+        first = Operand.read(data)
+        second = Operand.read(data)
         return cls(mapping=mapping, first=first, second=second)
 
 
 class Increment(Serialize, Deserialize):
+    __slots__ = ("mapping", "first", "second")
 
     # @type_check
     def __init__(self, *, mapping: Identifier, first: Operand, second: Operand):
@@ -327,14 +345,15 @@ class Increment(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping = Identifier.load(data)
-        first = Operand.load(data)
-        second = Operand.load(data)
+    def read(cls, data: Cursor):
+        mapping = Identifier.read(data)
+        first = Operand.read(data)
+        second = Operand.read(data)
         return cls(mapping=mapping, first=first, second=second)
 
 
 class Command(Serialize, Deserialize):  # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Instruction = 0
@@ -342,6 +361,8 @@ class Command(Serialize, Deserialize):  # enum
         GetOrInit = 2
         Set = 3
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -349,20 +370,12 @@ class Command(Serialize, Deserialize):  # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        if type_ == cls.Type.Instruction:
-            return InstructionCommand.load(data)
-        elif type_ == cls.Type.Get:
-            return GetCommand.load(data)
-        elif type_ == cls.Type.GetOrInit:
-            return GetOrInitCommand.load(data)
-        elif type_ == cls.Type.Set:
-            return SetCommand.load(data)
-        else:
-            raise ValueError("Invalid variant")
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 class InstructionCommand(Command):
+    __slots__ = ("instruction",)
     type = Command.Type.Instruction
 
     # @type_check
@@ -374,12 +387,13 @@ class InstructionCommand(Command):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        instruction = Instruction.load(data)
+    def read(cls, data: Cursor):
+        instruction = Instruction.read(data)
         return cls(instruction=instruction)
 
 
 class GetCommand(Command):
+    __slots__ = ("mapping", "key", "destination")
     type = Command.Type.Get
 
     # @type_check
@@ -393,14 +407,15 @@ class GetCommand(Command):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping = Identifier.load(data)
-        key = Operand.load(data)
-        destination = Register.load(data)
+    def read(cls, data: Cursor):
+        mapping = Identifier.read(data)
+        key = Operand.read(data)
+        destination = Register.read(data)
         return cls(mapping=mapping, key=key, destination=destination)
 
 
 class GetOrInitCommand(Command):
+    __slots__ = ("mapping", "key", "default", "destination")
     type = Command.Type.GetOrInit
 
     # @type_check
@@ -415,14 +430,15 @@ class GetOrInitCommand(Command):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping = Identifier.load(data)
-        key = Operand.load(data)
-        default = Operand.load(data)
-        destination = Register.load(data)
+    def read(cls, data: Cursor):
+        mapping = Identifier.read(data)
+        key = Operand.read(data)
+        default = Operand.read(data)
+        destination = Register.read(data)
         return cls(mapping=mapping, key=key, default=default, destination=destination)
 
 class SetCommand(Command):
+    __slots__ = ("mapping", "key", "value")
     type = Command.Type.Set
 
     # @type_check
@@ -436,14 +452,15 @@ class SetCommand(Command):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping = Identifier.load(data)
-        key = Operand.load(data)
-        value = Operand.load(data)
+    def read(cls, data: Cursor):
+        mapping = Identifier.read(data)
+        key = Operand.read(data)
+        value = Operand.read(data)
         return cls(mapping=mapping, key=key, value=value)
 
 
 class FinalizeInput(Serialize, Deserialize):
+    __slots__ = ("register", "plaintext_type")
 
     # @type_check
     def __init__(self, *, register: Register, plaintext_type: PlaintextType):
@@ -455,12 +472,13 @@ class FinalizeInput(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        register = Register.load(data)
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        register = Register.read(data)
+        plaintext_type = PlaintextType.read(data)
         return cls(register=register, plaintext_type=plaintext_type)
 
 class Finalize(Serialize, Deserialize):
+    __slots__ = ("name", "inputs", "commands")
 
     # @type_check
     @generic_type_check
@@ -474,14 +492,15 @@ class Finalize(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        inputs = Vec[FinalizeInput, u16].load(data)
-        commands = Vec[Command, u16].load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        inputs = Vec[FinalizeInput, u16].read(data)
+        commands = Vec[Command, u16].read(data)
         return cls(name=name, inputs=inputs, commands=commands)
 
 
 class ValueType(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Constant = 0
@@ -490,6 +509,8 @@ class ValueType(Serialize, Deserialize): # enum
         Record = 3
         ExternalRecord = 4
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -497,23 +518,13 @@ class ValueType(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        if type_ == cls.Type.Constant:
-            return ConstantValueType.load(data)
-        elif type_ == cls.Type.Public:
-            return PublicValueType.load(data)
-        elif type_ == cls.Type.Private:
-            return PrivateValueType.load(data)
-        elif type_ == cls.Type.Record:
-            return RecordValueType.load(data)
-        elif type_ == cls.Type.ExternalRecord:
-            return ExternalRecordValueType.load(data)
-        else:
-            raise ValueError("Invalid variant")
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 
 class ConstantValueType(ValueType):
+    __slots__ = ("plaintext_type",)
     type = ValueType.Type.Constant
 
     # @type_check
@@ -525,12 +536,13 @@ class ConstantValueType(ValueType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        plaintext_type = PlaintextType.read(data)
         return cls(plaintext_type=plaintext_type)
 
 
 class PublicValueType(ValueType):
+    __slots__ = ("plaintext_type",)
     type = ValueType.Type.Public
 
     # @type_check
@@ -542,12 +554,13 @@ class PublicValueType(ValueType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        plaintext_type = PlaintextType.read(data)
         return cls(plaintext_type=plaintext_type)
 
 
 class PrivateValueType(ValueType):
+    __slots__ = ("plaintext_type",)
     type = ValueType.Type.Private
 
     # @type_check
@@ -559,12 +572,13 @@ class PrivateValueType(ValueType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        plaintext_type = PlaintextType.read(data)
         return cls(plaintext_type=plaintext_type)
 
 
 class RecordValueType(ValueType):
+    __slots__ = ("identifier",)
     type = ValueType.Type.Record
 
     # @type_check
@@ -576,12 +590,13 @@ class RecordValueType(ValueType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        identifier = Identifier.load(data)
+    def read(cls, data: Cursor):
+        identifier = Identifier.read(data)
         return cls(identifier=identifier)
 
 
 class ExternalRecordValueType(ValueType):
+    __slots__ = ("locator",)
     type = ValueType.Type.ExternalRecord
 
     # @type_check
@@ -593,12 +608,13 @@ class ExternalRecordValueType(ValueType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        locator = Locator.load(data)
+    def read(cls, data: Cursor):
+        locator = Locator.read(data)
         return cls(locator=locator)
 
 
 class FunctionInput(Serialize, Deserialize):
+    __slots__ = ("register", "value_type")
 
     # @type_check
     def __init__(self, *, register: Register, value_type: ValueType):
@@ -610,13 +626,14 @@ class FunctionInput(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        register = Register.load(data)
-        value_type = ValueType.load(data)
+    def read(cls, data: Cursor):
+        register = Register.read(data)
+        value_type = ValueType.read(data)
         return cls(register=register, value_type=value_type)
 
 
 class FunctionOutput(Serialize, Deserialize):
+    __slots__ = ("operand", "value_type")
 
     # @type_check
     def __init__(self, *, operand: Operand, value_type: ValueType):
@@ -628,13 +645,14 @@ class FunctionOutput(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        operand = Operand.load(data)
-        value_type = ValueType.load(data)
+    def read(cls, data: Cursor):
+        operand = Operand.read(data)
+        value_type = ValueType.read(data)
         return cls(operand=operand, value_type=value_type)
 
 
 class Function(Serialize, Deserialize):
+    __slots__ = ("name", "inputs", "instructions", "outputs", "finalize")
 
     # @type_check
     @generic_type_check
@@ -657,12 +675,12 @@ class Function(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        inputs = Vec[FunctionInput, u16].load(data)
-        instructions = Vec[Instruction, u32].load(data)
-        outputs = Vec[FunctionOutput, u16].load(data)
-        finalize = Option[Tuple[FinalizeCommand, Finalize]].load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        inputs = Vec[FunctionInput, u16].read(data)
+        instructions = Vec[Instruction, u32].read(data)
+        outputs = Vec[FunctionOutput, u16].read(data)
+        finalize = Option[Tuple[FinalizeCommand, Finalize]].read(data)
         return cls(name=name, inputs=inputs, instructions=instructions, outputs=outputs, finalize=finalize)
 
     def instruction_feature_string(self) -> str:
@@ -678,8 +696,18 @@ class ProgramDefinition(IntEnumu8):
 
 
 class Program(Serialize, Deserialize):
+    __slots__ = ("id", "imports", "mappings", "structs", "records", "closures", "functions", "identifiers")
     version = u8()
 
+    # definition tag -> (type, attribute / keyword holding the definitions by name)
+    definition_map = {
+        ProgramDefinition.Mapping: (Mapping, "mappings"),
+        ProgramDefinition.Struct: (Struct, "structs"),
+        ProgramDefinition.Record: (RecordType, "records"),
+        ProgramDefinition.Closure: (Closure, "closures"),
+        ProgramDefinition.Function: (Function, "functions"),
+    }
+
     # @type_check
     @generic_type_check
     def __init__(self, *, id_: ProgramID, imports: Vec[Import, u8], mappings: dict[Identifier, Mapping],
@@ -705,58 +733,34 @@ class Program(Serialize, Deserialize):
             self.identifiers[i] = ProgramDefinition.Function
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.id.dump()
-        res += self.imports.dump()
-        res += u16(len(self.identifiers)).dump()
+        buf = bytearray()
+        self.write(buf)
+        return bytes(buf)
+
+    def write(self, buf: bytearray):
+        self.version.write(buf)
+        self.id.write(buf)
+        self.imports.write(buf)
+        u16(len(self.identifiers)).write(buf)
         for i, d in self.identifiers.items():
-            res += d.dump()
-            if d == ProgramDefinition.Mapping:
-                res += self.mappings[i].dump()
-            elif d == ProgramDefinition.Struct:
-                res += self.structs[i].dump()
-            elif d == ProgramDefinition.Record:
-                res += self.records[i].dump()
-            elif d == ProgramDefinition.Closure:
-                res += self.closures[i].dump()
-            elif d == ProgramDefinition.Function:
-                res += self.functions[i].dump()
-        return res
+            d.write(buf)
+            getattr(self, self.definition_map[d][1])[i].write(buf)
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
         if version != cls.version:
             raise ValueError("Invalid version")
-        id_ = ProgramID.load(data)
-        imports = Vec[Import, u8].load(data)
-        mappings = {}
-        structs = {}
-        records = {}
-        closures = {}
-        functions = {}
-        n = u16.load(data)
+        id_ = ProgramID.read(data)
+        imports = Vec[Import, u8].read(data)
+        definitions = {attr: {} for _, attr in cls.definition_map.values()}
+        n = u16.read(data)
         for _ in range(n):
-            d = ProgramDefinition.load(data)
-            if d == ProgramDefinition.Mapping:
-                m = Mapping.load(data)
-                mappings[m.name] = m
-            elif d == ProgramDefinition.Struct:
-                i = Struct.load(data)
-                structs[i.name] = i
-            elif d == ProgramDefinition.Record:
-                r = RecordType.load(data)
-                records[r.name] = r
-            elif d == ProgramDefinition.Closure:
-                c = Closure.load(data)
-                closures[c.name] = c
-            elif d == ProgramDefinition.Function:
-                f = Function.load(data)
-                functions[f.name] = f
-        return cls(id_=id_, imports=imports, mappings=mappings, structs=structs, records=records,
-                   closures=closures, functions=functions)
+            type_, attr = cls.definition_map[ProgramDefinition.read(data)]
+            definition = type_.read(data)
+            definitions[attr][definition.name] = definition
+        return cls(id_=id_, imports=imports, **definitions)
 
     def is_helloworld(self) -> bool:
         header_length = len(self.version.dump() + self.id.dump())
@@ -779,6 +783,10 @@ class Program(Serialize, Deserialize):
 
 
 class CircuitInfo(Serialize, Deserialize):
+    __slots__ = (
+        "num_public_inputs", "num_variables", "num_constraints", "num_non_zero_a", "num_non_zero_b",
+        "num_non_zero_c",
+    )
 
     # @type_check
     def __init__(self, *, num_public_inputs: usize, num_variables: usize, num_constraints: usize,
@@ -802,18 +810,21 @@ class CircuitInfo(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        num_public_inputs = usize.load(data)
-        num_variables = usize.load(data)
-        num_constraints = usize.load(data)
-        num_non_zero_a = usize.load(data)
-        num_non_zero_b = usize.load(data)
-        num_non_zero_c = usize.load(data)
+    def read(cls, data: Cursor):
+        num_public_inputs = usize.read(data)
+        num_variables = usize.read(data)
+        num_constraints = usize.read(data)
+        num_non_zero_a = usize.read(data)
+        num_non_zero_b = usize.read(data)
+        num_non_zero_c = usize.read(data)
         return cls(num_public_inputs=num_public_inputs, num_variables=num_variables, num_constraints=num_constraints,
                    num_non_zero_a=num_non_zero_a, num_non_zero_b=num_non_zero_b, num_non_zero_c=num_non_zero_c)
 
 
-class KZGCommitment(Serialize, Deserialize):
+class KZGCommitment(Sized, Serialize, Deserialize):
+    __slots__ = ("element",)
+    size = G1Affine.size
+
     # Compressed for serde
     # @type_check
     def __init__(self, *, element: G1Affine):
@@ -824,11 +835,12 @@ class KZGCommitment(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(element=G1Affine.load(data))
+    def read(cls, data: Cursor):
+        return cls(element=G1Affine.read(data))
 
 
 class KZGVerifierKey(Serialize, Deserialize):
+    __slots__ = ("g", "gamma_g", "h", "beta_h")
 
     # @type_check
     def __init__(self, *, g: G1Affine, gamma_g: G1Affine, h: G2Affine, beta_h: G2Affine):
@@ -847,15 +859,16 @@ class KZGVerifierKey(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        g = G1Affine.load(data)
-        gamma_g = G1Affine.load(data)
-        h = G2Affine.load(data)
-        beta_h = G2Affine.load(data)
+    def read(cls, data: Cursor):
+        g = G1Affine.read(data)
+        gamma_g = G1Affine.read(data)
+        h = G2Affine.read(data)
+        beta_h = G2Affine.read(data)
         return cls(g=g, gamma_g=gamma_g, h=h, beta_h=beta_h)
 
 
 class SonicVerifierKey(Serialize, Deserialize):
+    __slots__ = ("vk", "degree_bounds_and_neg_powers_of_h", "supported_degree", "max_degree")
 
     # @type_check
     @generic_type_check
@@ -877,16 +890,17 @@ class SonicVerifierKey(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        vk = KZGVerifierKey.load(data)
-        degree_bounds_and_neg_powers_of_h = Option[Vec[Tuple[usize, G2Affine], u64]].load(data)
-        supported_degree = usize.load(data)
-        max_degree = usize.load(data)
+    def read(cls, data: Cursor):
+        vk = KZGVerifierKey.read(data)
+        degree_bounds_and_neg_powers_of_h = Option[Vec[Tuple[usize, G2Affine], u64]].read(data)
+        supported_degree = usize.read(data)
+        max_degree = usize.read(data)
         return cls(vk=vk, degree_bounds_and_neg_powers_of_h=degree_bounds_and_neg_powers_of_h,
                    supported_degree=supported_degree, max_degree=max_degree)
 
 
 class VerifyingKey(Serialize, Deserialize):
+    __slots__ = ("circuit_info", "circuit_commitments", "verifier_key", "id")
     version = u8()
 
     # Skipping a layer of marlin::CircuitVerifyingKey
@@ -910,18 +924,19 @@ class VerifyingKey(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
         if version != cls.version:
             raise ValueError("Invalid version")
-        circuit_info = CircuitInfo.load(data)
-        circuit_commitments = Vec[KZGCommitment, u64].load(data)
-        verifier_key = SonicVerifierKey.load(data)
-        id_ = Vec[u8, 32].load(data)
+        circuit_info = CircuitInfo.read(data)
+        circuit_commitments = Vec[KZGCommitment, u64].read(data)
+        verifier_key = SonicVerifierKey.read(data)
+        id_ = Vec[u8, 32].read(data)
         return cls(circuit_info=circuit_info, circuit_commitments=circuit_commitments, verifier_key=verifier_key, id_=id_)
 
 
 class KZGProof(Serialize, Deserialize):
+    __slots__ = ("w", "random_v")
 
     # @type_check
     def __init__(self, *, w: G1Affine, random_v: Option[Field]):
@@ -933,12 +948,18 @@ class KZGProof(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        w = G1Affine.load(data)
-        random_v = Option[Field].load(data)
+    def read(cls, data: Cursor):
+        w = G1Affine.read(data)
+        random_v = Option[Field].read(data)
         return cls(w=w, random_v=random_v)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        G1Affine.skip(data)
+        Option[Field].skip(data)
+
 class BatchProof(Serialize, Deserialize):
+    __slots__ = ("proof",)
 
     # @type_check
     def __init__(self, *, proof: Vec[KZGProof, u64]):
@@ -949,12 +970,17 @@ class BatchProof(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        proof = Vec[KZGProof, u64].load(data)
+    def read(cls, data: Cursor):
+        proof = Vec[KZGProof, u64].read(data)
         return cls(proof=proof)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Vec[KZGProof, u64].skip(data)
+
 
 class BatchLCProof(Serialize, Deserialize):
+    __slots__ = ("proof", "evaluations")
 
     # @type_check
     @generic_type_check
@@ -967,13 +993,19 @@ class BatchLCProof(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        proof = BatchProof.load(data)
-        evaluations = Option[Vec[Field, u64]].load(data)
+    def read(cls, data: Cursor):
+        proof = BatchProof.read(data)
+        evaluations = Option[Vec[Field, u64]].read(data)
         return cls(proof=proof, evaluations=evaluations)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        BatchProof.skip(data)
+        Option[Vec[Field, u64]].skip(data)
+
 
 class Certificate(Serialize, Deserialize):
+    __slots__ = ("pc_proof",)
     version = u8()
 
     # Skipping a layer of marlin::Certificate
@@ -986,17 +1018,25 @@ class Certificate(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
         if version != cls.version:
             raise ValueError("Invalid version")
-        pc_proof = BatchLCProof.load(data)
+        pc_proof = BatchLCProof.read(data)
         return cls(pc_proof=pc_proof)
 
 
 class Deployment(Serialize, Deserialize):
+    __slots__ = ("edition", "program", "verifying_keys")
     version = u8()
 
+    layout = (
+        "version",
+        ("edition", u16),
+        ("program", Program),
+        ("verifying_keys", Vec[Tuple[Identifier, VerifyingKey, Certificate], u16]),
+    )
+
     # @type_check
     @generic_type_check
     def __init__(self, *, edition: u16, program: Program,
@@ -1005,27 +1045,10 @@ class Deployment(Serialize, Deserialize):
         self.program = program
         self.verifying_keys = verifying_keys
 
-    def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.edition.dump()
-        res += self.program.dump()
-        res += self.verifying_keys.dump()
-        return res
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        if version != cls.version:
-            raise ValueError("Invalid version")
-        edition = u16.load(data)
-        program = Program.load(data)
-        verifying_keys = Vec[Tuple[Identifier, VerifyingKey, Certificate], u16].load(data)
-        return cls(edition=edition, program=program, verifying_keys=verifying_keys)
-
 
-class WitnessCommitments(Serialize, Deserialize):
+class WitnessCommitments(Sized, Serialize, Deserialize):
+    __slots__ = ("w", "z_a", "z_b")
+    size = 3 * KZGCommitment.size
 
     # @type_check
     def __init__(self, *, w: KZGCommitment, z_a: KZGCommitment, z_b: KZGCommitment):
@@ -1038,14 +1061,18 @@ class WitnessCommitments(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        w = KZGCommitment.load(data)
-        z_a = KZGCommitment.load(data)
-        z_b = KZGCommitment.load(data)
+    def read(cls, data: Cursor):
+        w = KZGCommitment.read(data)
+        z_a = KZGCommitment.read(data)
+        z_b = KZGCommitment.read(data)
         return cls(w=w, z_a=z_a, z_b=z_b)
 
 
 class Commitments(Serialize, Deserialize):
+    __slots__ = (
+        "witness_commitments", "mask_poly", "g_1", "h_1", "g_a_commitments", "g_b_commitments",
+        "g_c_commitments", "h_2",
+    )
 
     # @type_check
     @generic_type_check
@@ -1080,33 +1107,34 @@ class Commitments(Serialize, Deserialize):
     # noinspection PyMethodOverriding
     @classmethod
     # @type_check
-    def load(cls, data: bytearray, batch_sizes: Vec[u64, u64]):
+    def read(cls, data: Cursor, batch_sizes: Vec[u64, u64]):
         witness_commitments = []
         for _ in range(sum(batch_sizes)):
-            witness_commitments.append(WitnessCommitments.load(data))
+            witness_commitments.append(WitnessCommitments.read(data))
         witness_commitments = Vec[WitnessCommitments, u64](witness_commitments)
-        mask_poly = Option[KZGCommitment].load(data)
-        g_1 = KZGCommitment.load(data)
-        h_1 = KZGCommitment.load(data)
+        mask_poly = Option[KZGCommitment].read(data)
+        g_1 = KZGCommitment.read(data)
+        h_1 = KZGCommitment.read(data)
         commitments = []
         for _ in range(len(batch_sizes)):
-            commitments.append(KZGCommitment.load(data))
+            commitments.append(KZGCommitment.read(data))
         g_a_commitments = Vec[KZGCommitment, u64](commitments)
         commitments = []
         for _ in range(len(batch_sizes)):
-            commitments.append(KZGCommitment.load(data))
+            commitments.append(KZGCommitment.read(data))
         g_b_commitments = Vec[KZGCommitment, u64](commitments)
         commitments = []
         for _ in range(len(batch_sizes)):
-            commitments.append(KZGCommitment.load(data))
+            commitments.append(KZGCommitment.read(data))
         g_c_commitments = Vec[KZGCommitment, u64](commitments)
-        h_2 = KZGCommitment.load(data)
+        h_2 = KZGCommitment.read(data)
         return cls(witness_commitments=witness_commitments, mask_poly=mask_poly, g_1=g_1, h_1=h_1,
                    g_a_commitments=g_a_commitments, g_b_commitments=g_b_commitments,
                    g_c_commitments=g_c_commitments, h_2=h_2)
 
 
 class Evaluations(Serialize, Deserialize):
+    __slots__ = ("z_b_evals", "g_1_eval", "g_a_evals", "g_b_evals", "g_c_evals")
 
     # @type_check
     @generic_type_check
@@ -1135,31 +1163,33 @@ class Evaluations(Serialize, Deserialize):
     # noinspection PyMethodOverriding
     @classmethod
     # @type_check
-    def load(cls, data: bytearray, batch_sizes: Vec[u64, u64]):
+    def read(cls, data: Cursor, batch_sizes: Vec[u64, u64]):
         z_b_evals = []
         for batch_size in batch_sizes:
             batch = []
             for _ in range(batch_size):
-                batch.append(Field.load(data))
+                batch.append(Field.read(data))
             z_b_evals.append(Vec[Field, u64](batch))
         z_b_evals = Vec[Vec[Field, u64], u64](z_b_evals)
-        g_1_eval = Field.load(data)
+        g_1_eval = Field.read(data)
         evals = []
         for _ in range(len(batch_sizes)):
-            evals.append(Field.load(data))
+            evals.append(Field.read(data))
         g_a_evals = Vec[Field, u64](evals)
         evals = []
         for _ in range(len(batch_sizes)):
-            evals.append(Field.load(data))
+            evals.append(Field.read(data))
         g_b_evals = Vec[Field, u64](evals)
         evals = []
         for _ in range(len(batch_sizes)):
-            evals.append(Field.load(data))
+            evals.append(Field.read(data))
         g_c_evals = Vec[Field, u64](evals)
         return cls(z_b_evals=z_b_evals, g_1_eval=g_1_eval, g_a_evals=g_a_evals, g_b_evals=g_b_evals, g_c_evals=g_c_evals)
 
 
-class MatrixSums(Serialize, Deserialize):
+class MatrixSums(Sized, Serialize, Deserialize):
+    __slots__ = ("sum_a", "sum_b", "sum_c")
+    size = 3 * Field.size
 
     # @type_check
     def __init__(self, *, sum_a: Field, sum_b: Field, sum_c: Field):
@@ -1172,14 +1202,15 @@ class MatrixSums(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        sum_a = Field.load(data)
-        sum_b = Field.load(data)
-        sum_c = Field.load(data)
+    def read(cls, data: Cursor):
+        sum_a = Field.read(data)
+        sum_b = Field.read(data)
+        sum_c = Field.read(data)
         return cls(sum_a=sum_a, sum_b=sum_b, sum_c=sum_c)
 
 
 class ThirdMessage(Serialize, Deserialize):
+    __slots__ = ("sums",)
 
     # @type_check
     def __init__(self, *, sums: Vec[MatrixSums, u64]):
@@ -1190,12 +1221,17 @@ class ThirdMessage(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        sums = Vec[MatrixSums, u64].load(data)
+    def read(cls, data: Cursor):
+        sums = Vec[MatrixSums, u64].read(data)
         return cls(sums=sums)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Vec[MatrixSums, u64].skip(data)
+
 
 class Proof(Serialize, Deserialize):
+    __slots__ = ("batch_sizes", "commitments", "evaluations", "msg", "pc_proof")
     version = u8()
 
     # Skipping a layer of marlin::Proof
@@ -1220,17 +1256,33 @@ class Proof(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
         if version != cls.version:
             raise Exception("Invalid proof version")
-        batch_sizes = Vec[u64, u64].load(data)
-        commitments = Commitments.load(data, batch_sizes=batch_sizes)
-        evaluations = Evaluations.load(data, batch_sizes=batch_sizes)
-        msg = ThirdMessage.load(data)
-        pc_proof = BatchLCProof.load(data)
+        batch_sizes = Vec[u64, u64].read(data)
+        commitments = Commitments.read(data, batch_sizes=batch_sizes)
+        evaluations = Evaluations.read(data, batch_sizes=batch_sizes)
+        msg = ThirdMessage.read(data)
+        pc_proof = BatchLCProof.read(data)
         return cls(batch_sizes=batch_sizes, commitments=commitments, evaluations=evaluations, msg=msg, pc_proof=pc_proof)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        version = u8.read(data)
+        if version != cls.version:
+            raise Exception("Invalid proof version")
+        batch_sizes = Vec[u64, u64].read(data)
+        total = sum(batch_sizes)
+        n = len(batch_sizes)
+        # commitments and evaluations have no length prefixes, their sizes follow from batch_sizes
+        data.read(total * WitnessCommitments.size)
+        Option[KZGCommitment].skip(data)
+        data.read((3 + 3 * n) * KZGCommitment.size)
+        data.read((total + 1 + 3 * n) * Field.size)
+        ThirdMessage.skip(data)
+        BatchLCProof.skip(data)
+
     @classmethod
     # @type_check
     def loads(cls, data: str):
@@ -1242,6 +1294,7 @@ class Proof(Serialize, Deserialize):
 
 
 class Ciphertext(Serialize, Deserialize):
+    __slots__ = ("ciphertext",)
 
     # @type_check
     def __init__(self, *, ciphertext: Vec[Field, u16]):
@@ -1252,10 +1305,14 @@ class Ciphertext(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        ciphertext = Vec[Field, u16].load(data)
+    def read(cls, data: Cursor):
+        ciphertext = Vec[Field, u16].read(data)
         return cls(ciphertext=ciphertext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Vec[Field, u16].skip(data)
+
     @classmethod
     # @type_check
     def loads(cls, data: str):
@@ -1266,11 +1323,14 @@ class Ciphertext(Serialize, Deserialize):
 
 
 class Plaintext(Serialize, Deserialize):  # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Literal = 0
         Struct = 1
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -1278,17 +1338,13 @@ class Plaintext(Serialize, Deserialize):  # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = Plaintext.Type.load(data)
-        if type_ == Plaintext.Type.Literal:
-            return LiteralPlaintext.load(data)
-        elif type_ == Plaintext.Type.Struct:
-            return StructPlaintext.load(data)
-        else:
-            raise ValueError("invalid type")
+    def read(cls, data: Cursor):
+        type_ = Plaintext.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 
 class LiteralPlaintext(Plaintext):
+    __slots__ = ("literal",)
     type = Plaintext.Type.Literal
 
     # @type_check
@@ -1300,8 +1356,8 @@ class LiteralPlaintext(Plaintext):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        literal = Literal.load(data)
+    def read(cls, data: Cursor):
+        literal = Literal.read(data)
         return cls(literal=literal)
 
     def __str__(self):
@@ -1318,6 +1374,7 @@ class LiteralPlaintext(Plaintext):
 
 
 class StructPlaintext(Plaintext):
+    __slots__ = ("members",)
     type = Plaintext.Type.Struct
 
     # @type_check
@@ -1337,14 +1394,13 @@ class StructPlaintext(Plaintext):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         members = []
-        num_members = u8.load(data)
+        num_members = u8.read(data)
         for _ in range(num_members):
-            identifier = Identifier.load(data)
-            num_bytes = u16.load(data)
-            plaintext = Plaintext.load(data[:num_bytes])
-            del data[:num_bytes]
+            identifier = Identifier.read(data)
+            num_bytes = u16.read(data)
+            plaintext = Plaintext.read(data.take(num_bytes))
             members.append(Tuple[Identifier, Plaintext]([identifier, plaintext]))
         return cls(members=Vec[Tuple[Identifier, Plaintext], u8](members))
 
@@ -1377,6 +1433,8 @@ class StructPlaintext(Plaintext):
 
 
 class Owner(TypeParameter, Serialize, Deserialize):  # enum
+    __slots__ = ("Private",)
+    _params = ("Private",)
 
     def __init__(self, types):
         if len(types) != 1:
@@ -1395,17 +1453,18 @@ class Owner(TypeParameter, Serialize, Deserialize):  # enum
         raise NotImplementedError
 
     # @type_check
-    def load(self, data: bytearray):
-        type_ = Owner.Type.load(data)
+    def read(self, data: Cursor):
+        type_ = Owner.Type.read(data)
         if type_ == Owner.Type.Public:
-            return PublicOwner.load(data)
+            return PublicOwner.read(data)
         elif type_ == Owner.Type.Private:
-            return PrivateOwner[self.Private].load(data)
+            return PrivateOwner[self.Private].read(data)
         else:
             raise ValueError("invalid type")
 
 
 class PublicOwner(Owner):
+    __slots__ = ("owner",)
     type = Owner.Type.Public
 
     # This subtype is not generic
@@ -1419,8 +1478,8 @@ class PublicOwner(Owner):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        owner = Address.load(data)
+    def read(cls, data: Cursor):
+        owner = Address.read(data)
         return cls(owner=owner)
 
     def __str__(self):
@@ -1428,6 +1487,7 @@ class PublicOwner(Owner):
 
 
 class PrivateOwner(Owner):
+    __slots__ = ("owner",)
     type = Owner.Type.Private
 
     # noinspection PyMissingConstructor
@@ -1440,14 +1500,17 @@ class PrivateOwner(Owner):
     def __call__(self, *, owner):
         if not isinstance(owner, self.Private):
             raise ValueError(f"owner must be of type {self.Private}")
+        self = self._instance()
         self.owner = owner
+        return self
 
     def dump(self) -> bytes:
         return self.type.dump() + self.owner.dump()
 
     # @type_check
-    def load(self, data: bytearray):
-        self.owner = self.Private.load(data)
+    def read(self, data: Cursor):
+        self = self._instance()
+        self.owner = self.Private.read(data)
         return self
 
     def __str__(self):
@@ -1455,6 +1518,8 @@ class PrivateOwner(Owner):
 
 
 class Balance(TypeParameter, Serialize, Deserialize):  # enum
+    __slots__ = ("Private",)
+    _params = ("Private",)
 
     def __init__(self, types):
         if len(types) != 1:
@@ -1473,17 +1538,18 @@ class Balance(TypeParameter, Serialize, Deserialize):  # enum
         raise NotImplementedError
 
     # @type_check
-    def load(self, data: bytearray):
-        type_ = Balance.Type.load(data)
+    def read(self, data: Cursor):
+        type_ = Balance.Type.read(data)
         if type_ == Balance.Type.Public:
-            return PublicBalance.load(data)
+            return PublicBalance.read(data)
         elif type_ == Balance.Type.Private:
-            return PrivateBalance[self.Private].load(data)
+            return PrivateBalance[self.Private].read(data)
         else:
             raise ValueError("invalid type")
 
 
 class PublicBalance(Balance):
+    __slots__ = ("balance",)
     type = Balance.Type.Public
 
     # noinspection PyMissingConstructor
@@ -1495,8 +1561,8 @@ class PublicBalance(Balance):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        balance = u64.load(data)
+    def read(cls, data: Cursor):
+        balance = u64.read(data)
         return cls(balance=balance)
 
     def __str__(self):
@@ -1504,6 +1570,7 @@ class PublicBalance(Balance):
 
 
 class PrivateBalance(Balance):
+    __slots__ = ("balance",)
     type = Balance.Type.Private
 
     # noinspection PyMissingConstructor
@@ -1516,14 +1583,17 @@ class PrivateBalance(Balance):
     def __call__(self, *, balance):
         if not isinstance(balance, self.Private):
             raise ValueError(f"balance must be of type {self.Private}")
+        self = self._instance()
         self.balance = balance
+        return self
 
     def dump(self) -> bytes:
         return self.type.dump() + self.balance.dump()
 
     # @type_check
-    def load(self, data: bytearray):
-        self.balance = self.Private.load(data)
+    def read(self, data: Cursor):
+        self = self._instance()
+        self.balance = self.Private.read(data)
         return self
 
     def __str__(self):
@@ -1531,6 +1601,8 @@ class PrivateBalance(Balance):
 
 
 class Entry(Generic, Serialize, Deserialize):  # enum
+    __slots__ = ("Private",)
+    _params = ("Private",)
 
     def __init__(self, types):
         if len(types) != 1:
@@ -1550,14 +1622,14 @@ class Entry(Generic, Serialize, Deserialize):  # enum
         raise NotImplementedError
 
     # @type_check
-    def load(self, data: bytearray):
-        type_ = Entry.Type.load(data)
+    def read(self, data: Cursor):
+        type_ = Entry.Type.read(data)
         if type_ == Entry.Type.Constant:
-            return ConstantEntry.load(data)
+            return ConstantEntry.read(data)
         elif type_ == Entry.Type.Public:
-            return PublicEntry.load(data)
+            return PublicEntry.read(data)
         elif type_ == Entry.Type.Private:
-            return PrivateEntry[self.Private].load(data)
+            return PrivateEntry[self.Private].read(data)
         else:
             raise ValueError("invalid type")
 
@@ -1567,6 +1639,7 @@ class Entry(Generic, Serialize, Deserialize):  # enum
 
 
 class ConstantEntry(Entry):
+    __slots__ = ("plaintext",)
     type = Entry.Type.Constant
 
     # noinspection PyMissingConstructor
@@ -1578,8 +1651,8 @@ class ConstantEntry(Entry):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext = Plaintext.load(data)
+    def read(cls, data: Cursor):
+        plaintext = Plaintext.read(data)
         return cls(plaintext=plaintext)
 
     def __str__(self):
@@ -1587,6 +1660,7 @@ class ConstantEntry(Entry):
 
 
 class PublicEntry(Entry):
+    __slots__ = ("plaintext",)
     type = Entry.Type.Public
 
     # noinspection PyMissingConstructor
@@ -1598,8 +1672,8 @@ class PublicEntry(Entry):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext = Plaintext.load(data)
+    def read(cls, data: Cursor):
+        plaintext = Plaintext.read(data)
         return cls(plaintext=plaintext)
 
     def __str__(self):
@@ -1607,6 +1681,7 @@ class PublicEntry(Entry):
 
 
 class PrivateEntry(Entry):
+    __slots__ = ("plaintext",)
     type = Entry.Type.Private
 
     # noinspection PyMissingConstructor
@@ -1619,14 +1694,17 @@ class PrivateEntry(Entry):
     def __call__(self, *, plaintext):
         if not isinstance(plaintext, self.Private):
             raise ValueError(f"plaintext must be of type {self.Private}")
+        self = self._instance()
         self.plaintext = plaintext
+        return self
 
     def dump(self) -> bytes:
         return self.type.dump() + self.plaintext.dump()
 
     # @type_check
-    def load(self, data: bytearray):
-        self.plaintext = self.Private.load(data)
+    def read(self, data: Cursor):
+        self = self._instance()
+        self.plaintext = self.Private.read(data)
         return self
 
     def __str__(self):
@@ -1634,6 +1712,9 @@ class PrivateEntry(Entry):
 
 
 class Record(Generic, Serialize, Deserialize):
+    __slots__ = ("Private", "owner", "data", "nonce")
+    _params = ("Private",)
+
     # Generic for the Private type parameter
     def __init__(self, types):
         if len(types) != 1:
@@ -1643,9 +1724,11 @@ class Record(Generic, Serialize, Deserialize):
     # @type_check
     @generic_type_check
     def __call__(self, *, owner: Owner, data: Vec[Tuple[Identifier, Entry], u8], nonce: Group):
+        self = self._instance()
         self.owner = owner
         self.data = data
         self.nonce = nonce
+        return self
 
     def dump(self) -> bytes:
         res = b""
@@ -1660,20 +1743,27 @@ class Record(Generic, Serialize, Deserialize):
         return res
 
     # @type_check
-    def load(self, data: bytearray):
-        self.owner = Owner[self.Private].load(data)
-        data_len = u8.load(data)
+    def read(self, data: Cursor):
+        self = self._instance()
+        self.owner = Owner[self.Private].read(data)
+        data_len = u8.read(data)
         d = []
         for _ in range(data_len):
-            identifier = Identifier.load(data)
-            entry_len = u16.load(data)
-            entry = Entry[self.Private].load(data[:entry_len])
+            identifier = Identifier.read(data)
+            entry_len = u16.read(data)
+            entry = Entry[self.Private].read(data.take(entry_len))
             d.append(Tuple[Identifier, Entry]([identifier, entry]))
-            del data[:entry_len]
         self.data = Vec[Tuple[Identifier, Entry], u8](d)
-        self.nonce = Group.load(data)
+        self.nonce = Group.read(data)
         return self
 
+    def skip(self, data: Cursor):
+        Owner[self.Private].skip(data)
+        for _ in range(u8.read(data)):
+            Identifier.skip(data)
+            data.read(u16.read(data))
+        Group.skip(data)
+
     # @type_check
     def loads(self, data: str):
         return self.load(bech32_to_bytes(data))
@@ -1683,11 +1773,14 @@ class Record(Generic, Serialize, Deserialize):
 
 
 class Value(Serialize, Deserialize):  # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Plaintext = 0
         Record = 1
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -1695,17 +1788,13 @@ class Value(Serialize, Deserialize):  # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = Value.Type.load(data)
-        if type_ == Value.Type.Plaintext:
-            return PlaintextValue.load(data)
-        elif type_ == Value.Type.Record:
-            return RecordValue.load(data)
-        else:
-            raise ValueError("unknown value type")
+    def read(cls, data: Cursor):
+        type_ = Value.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 
 class PlaintextValue(Value):
+    __slots__ = ("plaintext",)
     type = Value.Type.Plaintext
 
     # @type_check
@@ -1717,8 +1806,8 @@ class PlaintextValue(Value):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext = Plaintext.load(data)
+    def read(cls, data: Cursor):
+        plaintext = Plaintext.read(data)
         return cls(plaintext=plaintext)
 
     def __str__(self):
@@ -1726,6 +1815,7 @@ class PlaintextValue(Value):
 
 
 class RecordValue(Value):
+    __slots__ = ("record",)
     type = Value.Type.Record
 
     # @type_check
@@ -1739,12 +1829,13 @@ class RecordValue(Value):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        record = Record[Plaintext].load(data)
+    def read(cls, data: Cursor):
+        record = Record[Plaintext].read(data)
         return cls(record=record)
 
 
 class TransitionInput(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Constant = 0
@@ -1753,6 +1844,8 @@ class TransitionInput(Serialize, Deserialize): # enum
         Record = 3
         ExternalRecord = 4
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -1760,20 +1853,14 @@ class TransitionInput(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = TransitionInput.Type.load(data)
-        if type_ == TransitionInput.Type.Constant:
-            return ConstantTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.Public:
-            return PublicTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.Private:
-            return PrivateTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.Record:
-            return RecordTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.ExternalRecord:
-            return ExternalRecordTransitionInput.load(data)
-        else:
-            raise ValueError("unknown transition input type")
+    def read(cls, data: Cursor):
+        type_ = TransitionInput.Type.read(data)
+        return cls.type_map[type_].read(data)
+
+    @classmethod
+    def skip(cls, data: Cursor):
+        type_ = TransitionInput.Type.read(data)
+        cls.type_map[type_].skip(data)
 
     @classmethod
     # @type_check
@@ -1788,6 +1875,7 @@ class TransitionInput(Serialize, Deserialize): # enum
 
 
 class ConstantTransitionInput(TransitionInput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionInput.Type.Constant
 
     # @type_check
@@ -1800,13 +1888,19 @@ class ConstantTransitionInput(TransitionInput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_hash = Field.load(data)
-        plaintext = Option[Plaintext].load(data)
+    def read(cls, data: Cursor):
+        plaintext_hash = Field.read(data)
+        plaintext = Option[Plaintext].read(data)
         return cls(plaintext_hash=plaintext_hash, plaintext=plaintext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+        Option[Plaintext].skip(data)
+
 
 class PublicTransitionInput(TransitionInput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionInput.Type.Public
 
     # @type_check
@@ -1819,13 +1913,19 @@ class PublicTransitionInput(TransitionInput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_hash = Field.load(data)
-        plaintext = Option[Plaintext].load(data)
+    def read(cls, data: Cursor):
+        plaintext_hash = Field.read(data)
+        plaintext = Option[Plaintext].read(data)
         return cls(plaintext_hash=plaintext_hash, plaintext=plaintext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+        Option[Plaintext].skip(data)
+
 
 class PrivateTransitionInput(TransitionInput):
+    __slots__ = ("ciphertext_hash", "ciphertext")
     type = TransitionInput.Type.Private
 
     # @type_check
@@ -1838,11 +1938,16 @@ class PrivateTransitionInput(TransitionInput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        ciphertext_hash = Field.load(data)
-        ciphertext = Option[Ciphertext].load(data)
+    def read(cls, data: Cursor):
+        ciphertext_hash = Field.read(data)
+        ciphertext = Option[Ciphertext].read(data)
         return cls(ciphertext_hash=ciphertext_hash, ciphertext=ciphertext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+        Option[Ciphertext].skip(data)
+
     @classmethod
     # @type_check
     def load_json(cls, data: dict):
@@ -1855,6 +1960,7 @@ class PrivateTransitionInput(TransitionInput):
 
 
 class RecordTransitionInput(TransitionInput):
+    __slots__ = ("serial_number", "tag")
     type = TransitionInput.Type.Record
 
     # @type_check
@@ -1867,11 +1973,15 @@ class RecordTransitionInput(TransitionInput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        serial_number = Field.load(data)
-        tag = Field.load(data)
+    def read(cls, data: Cursor):
+        serial_number = Field.read(data)
+        tag = Field.read(data)
         return cls(serial_number=serial_number, tag=tag)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        data.read(2 * Field.size)
+
     @classmethod
     # @type_check
     def load_json(cls, data: dict):
@@ -1881,6 +1991,7 @@ class RecordTransitionInput(TransitionInput):
 
 
 class ExternalRecordTransitionInput(TransitionInput):
+    __slots__ = ("input_commitment",)
     type = TransitionInput.Type.ExternalRecord
 
     # @type_check
@@ -1892,12 +2003,17 @@ class ExternalRecordTransitionInput(TransitionInput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        input_commitment = Field.load(data)
+    def read(cls, data: Cursor):
+        input_commitment = Field.read(data)
         return cls(input_commitment=input_commitment)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+
 
 class TransitionOutput(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Constant = 0
@@ -1906,6 +2022,8 @@ class TransitionOutput(Serialize, Deserialize): # enum
         Record = 3
         ExternalRecord = 4
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -1913,20 +2031,14 @@ class TransitionOutput(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = TransitionOutput.Type.load(data)
-        if type_ == TransitionOutput.Type.Constant:
-            return ConstantTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Public:
-            return PublicTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Private:
-            return PrivateTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Record:
-            return RecordTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.ExternalRecord:
-            return ExternalRecordTransitionOutput.load(data)
-        else:
-            raise ValueError("unknown transition output type")
+    def read(cls, data: Cursor):
+        type_ = TransitionOutput.Type.read(data)
+        return cls.type_map[type_].read(data)
+
+    @classmethod
+    def skip(cls, data: Cursor):
+        type_ = TransitionOutput.Type.read(data)
+        cls.type_map[type_].skip(data)
 
     @classmethod
     # @type_check
@@ -1939,6 +2051,7 @@ class TransitionOutput(Serialize, Deserialize): # enum
 
 
 class ConstantTransitionOutput(TransitionOutput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionOutput.Type.Constant
 
     # @type_check
@@ -1951,13 +2064,19 @@ class ConstantTransitionOutput(TransitionOutput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_hash = Field.load(data)
-        plaintext = Option[Plaintext].load(data)
+    def read(cls, data: Cursor):
+        plaintext_hash = Field.read(data)
+        plaintext = Option[Plaintext].read(data)
         return cls(plaintext_hash=plaintext_hash, plaintext=plaintext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+        Option[Plaintext].skip(data)
+
 
 class PublicTransitionOutput(TransitionOutput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionOutput.Type.Public
 
     # @type_check
@@ -1970,13 +2089,19 @@ class PublicTransitionOutput(TransitionOutput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_hash = Field.load(data)
-        plaintext = Option[Plaintext].load(data)
+    def read(cls, data: Cursor):
+        plaintext_hash = Field.read(data)
+        plaintext = Option[Plaintext].read(data)
         return cls(plaintext_hash=plaintext_hash, plaintext=plaintext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+        Option[Plaintext].skip(data)
+
 
 class PrivateTransitionOutput(TransitionOutput):
+    __slots__ = ("ciphertext_hash", "ciphertext")
     type = TransitionOutput.Type.Private
 
     # @type_check
@@ -1989,13 +2114,19 @@ class PrivateTransitionOutput(TransitionOutput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        ciphertext_hash = Field.load(data)
-        ciphertext = Option[Ciphertext].load(data)
+    def read(cls, data: Cursor):
+        ciphertext_hash = Field.read(data)
+        ciphertext = Option[Ciphertext].read(data)
         return cls(ciphertext_hash=ciphertext_hash, ciphertext=ciphertext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+        Option[Ciphertext].skip(data)
+
 
 class RecordTransitionOutput(TransitionOutput):
+    __slots__ = ("commitment", "checksum", "record_ciphertext")
     type = TransitionOutput.Type.Record
 
     # @type_check
@@ -2009,12 +2140,17 @@ class RecordTransitionOutput(TransitionOutput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        commitment = Field.load(data)
-        checksum = Field.load(data)
-        record_ciphertext = Option[Record[Ciphertext]].load(data)
+    def read(cls, data: Cursor):
+        commitment = Field.read(data)
+        checksum = Field.read(data)
+        record_ciphertext = Option[Record[Ciphertext]].read(data)
         return cls(commitment=commitment, checksum=checksum, record_ciphertext=record_ciphertext)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        data.read(2 * Field.size)
+        Option[Record[Ciphertext]].skip(data)
+
     @classmethod
     # @type_check
     def load_json(cls, data: dict):
@@ -2028,6 +2164,7 @@ class RecordTransitionOutput(TransitionOutput):
 
 
 class ExternalRecordTransitionOutput(TransitionOutput):
+    __slots__ = ("commitment",)
     type = TransitionOutput.Type.ExternalRecord
 
     # @type_check
@@ -2039,14 +2176,32 @@ class ExternalRecordTransitionOutput(TransitionOutput):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        commitment = Field.load(data)
+    def read(cls, data: Cursor):
+        commitment = Field.read(data)
         return cls(commitment=commitment)
 
+    @classmethod
+    def skip(cls, data: Cursor):
+        Field.skip(data)
+
 
 class Transition(Serialize, Deserialize):
+    __slots__ = ("id", "program_id", "function_name", "inputs", "outputs", "finalize", "proof", "tpk", "tcm")
     version = u8()
 
+    layout = (
+        "version",
+        ("id", TransitionID, "id_"),
+        ("program_id", ProgramID),
+        ("function_name", Identifier),
+        ("inputs", Vec[TransitionInput, u8]),
+        ("outputs", Vec[TransitionOutput, u8]),
+        ("finalize", Option[Vec[Value, u8]]),
+        ("proof", Proof),
+        ("tpk", Group),
+        ("tcm", Field),
+    )
+
     @generic_type_check
     def __init__(self, *, id_: TransitionID, program_id: ProgramID, function_name: Identifier,
                  inputs: Vec[TransitionInput, u8], outputs: Vec[TransitionOutput, u8], finalize: Option[Vec[Value, u8]],
@@ -2061,71 +2216,36 @@ class Transition(Serialize, Deserialize):
         self.tpk = tpk
         self.tcm = tcm
 
-    def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.id.dump()
-        res += self.program_id.dump()
-        res += self.function_name.dump()
-        res += self.inputs.dump()
-        res += self.outputs.dump()
-        res += self.finalize.dump()
-        res += self.proof.dump()
-        res += self.tpk.dump()
-        res += self.tcm.dump()
-        return res
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        if version != cls.version:
-            raise ValueError(f"version mismatch: expected {cls.version}, got {version}")
-        id_ = TransitionID.load(data)
-        program_id = ProgramID.load(data)
-        function_name = Identifier.load(data)
-        inputs = Vec[TransitionInput, u8].load(data)
-        outputs = Vec[TransitionOutput, u8].load(data)
-        finalize = Option[Vec[Value, u8]].load(data)
-        proof = Proof.load(data)
-        tpk = Group.load(data)
-        tcm = Field.load(data)
-        return cls(id_=id_, program_id=program_id, function_name=function_name, inputs=inputs, outputs=outputs,
-                   finalize=finalize, proof=proof, tpk=tpk, tcm=tcm)
-
 
 class Fee(Serialize, Deserialize):
+    __slots__ = ("transition", "global_state_root", "inclusion_proof")
     version = u8()
 
+    layout = (
+        "version",
+        ("transition", Transition),
+        ("global_state_root", StateRoot),
+        ("inclusion_proof", Option[Proof]),
+    )
+
     # @type_check
     def __init__(self, *, transition: Transition, global_state_root: StateRoot, inclusion_proof: Option[Proof]):
         self.transition = transition
         self.global_state_root = global_state_root
         self.inclusion_proof = inclusion_proof
 
-    def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.transition.dump()
-        res += self.global_state_root.dump()
-        res += self.inclusion_proof.dump()
-        return res
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        if version != cls.version:
-            raise ValueError(f"version mismatch: expected {cls.version}, got {version}")
-        transition = Transition.load(data)
-        global_state_root = StateRoot.load(data)
-        inclusion_proof = Option[Proof].load(data)
-        return cls(transition=transition, global_state_root=global_state_root, inclusion_proof=inclusion_proof)
-
 
 class Execution(Serialize, Deserialize):
+    __slots__ = ("transitions", "global_state_root", "inclusion_proof")
     version = u8()
 
+    layout = (
+        "version",
+        ("transitions", Vec[Transition, u8]),
+        ("global_state_root", StateRoot),
+        ("inclusion_proof", Option[Proof]),
+    )
+
     # @type_check
     @generic_type_check
     def __init__(self, *, transitions: Vec[Transition, u8], global_state_root: StateRoot,
@@ -2134,27 +2254,9 @@ class Execution(Serialize, Deserialize):
         self.global_state_root = global_state_root
         self.inclusion_proof = inclusion_proof
 
-    def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.transitions.dump()
-        res += self.global_state_root.dump()
-        res += self.inclusion_proof.dump()
-        return res
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        if version != cls.version:
-            raise ValueError(f"version mismatch: expected {cls.version}, got {version}")
-        transitions = Vec[Transition, u8].load(data)
-        global_state_root = StateRoot.load(data)
-        inclusion_proof = Option[Proof].load(data)
-        return cls(transitions=transitions, global_state_root=global_state_root, inclusion_proof=inclusion_proof)
-
 
 class Transaction(Serialize, Deserialize):  # Enum
+    __slots__ = ()
     version = u8()
 
     class Type(IntEnumu8):
@@ -2162,6 +2264,8 @@ class Transaction(Serialize, Deserialize):  # Enum
         Execute = 1
         Fee = 2
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -2169,29 +2273,21 @@ class Transaction(Serialize, Deserialize):  # Enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        if len(data) < 1:
+    def read(cls, data: Cursor):
+        if len(data) < 2:
             raise ValueError("incorrect length")
-        version = u8.load(data)
-        type_ = cls.Type(data[0])
-        del data[0]
-        if type_ == cls.Type.Deploy:
-            if version != DeployTransaction.version:
-                raise ValueError("incorrect version")
-            return DeployTransaction.load(data)
-        elif type_ == cls.Type.Execute:
-            if version != ExecuteTransaction.version:
-                raise ValueError("incorrect version")
-            return ExecuteTransaction.load(data)
-        elif type_ == cls.Type.Fee:
-            if version != FeeTransaction.version:
-                raise ValueError("incorrect version")
-            return FeeTransaction.load(data)
-        else:
-            raise ValueError("incorrect type")
+        # version and type are part of the subtype layouts, so only peek at the type here
+        type_ = enum_member(cls.Type, data.peek_byte(1))
+        return cls.type_map[type_].read(data)
+
+    @classmethod
+    def skip(cls, data: Cursor):
+        type_ = enum_member(cls.Type, data.peek_byte(1))
+        cls.type_map[type_].skip(data)
 
 
 class ProgramOwner(Serialize, Deserialize):
+    __slots__ = ("address", "signature")
     version = u8()
 
     # @type_check
@@ -2204,18 +2300,28 @@ class ProgramOwner(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
+    def read(cls, data: Cursor):
+        version = u8.read(data)
         if version != cls.version:
             raise ValueError(f"version mismatch: expected {cls.version}, got {version}")
-        address = Address.load(data)
-        signature = Signature.load(data)
+        address = Address.read(data)
+        signature = Signature.read(data)
         return cls(address=address, signature=signature)
 
 
 class DeployTransaction(Transaction):
+    __slots__ = ("id", "owner", "deployment", "fee")
     type = Transaction.Type.Deploy
 
+    layout = (
+        "version",
+        "type",
+        ("id", TransactionID, "id_"),
+        ("owner", ProgramOwner),
+        ("deployment", Deployment),
+        ("fee", Fee),
+    )
+
     # @type_check
     def __init__(self, *, id_: TransactionID, owner: ProgramOwner, deployment: Deployment, fee: Fee):
         self.id = id_
@@ -2223,65 +2329,54 @@ class DeployTransaction(Transaction):
         self.deployment = deployment
         self.fee = fee
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.type.dump() + self.id.dump() \
-            + self.owner.dump() + self.deployment.dump() + self.fee.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        id_ = TransactionID.load(data)
-        owner = ProgramOwner.load(data)
-        deployment = Deployment.load(data)
-        fee = Fee.load(data)
-        return cls(id_=id_, owner=owner, deployment=deployment, fee=fee)
-
 
 class ExecuteTransaction(Transaction):
+    __slots__ = ("id", "execution", "additional_fee")
     type = Transaction.Type.Execute
 
+    layout = (
+        "version",
+        "type",
+        ("id", TransactionID, "id_"),
+        ("execution", Execution),
+        ("additional_fee", Option[Fee]),
+    )
+
     # @type_check
     def __init__(self, *, id_: TransactionID, execution: Execution, additional_fee: Option[Fee]):
         self.id = id_
         self.execution = execution
         self.additional_fee = additional_fee
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.type.dump() + self.id.dump() + self.execution.dump() + self.additional_fee.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        id_ = TransactionID.load(data)
-        execution = Execution.load(data)
-        additional_fee = Option[Fee].load(data)
-        return cls(id_=id_, execution=execution, additional_fee=additional_fee)
 
 class FeeTransaction(Transaction):
+    __slots__ = ("id", "fee")
     type = Transaction.Type.Fee
 
+    layout = (
+        "version",
+        "type",
+        ("id", TransactionID, "id_"),
+        ("fee", Fee),
+    )
+
     # @type_check
     def __init__(self, *, id_: TransactionID, fee: Fee):
         self.id = id_
         self.fee = fee
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.type.dump() + self.id.dump() + self.fee.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        id_ = TransactionID.load(data)
-        fee = Fee.load(data)
-        return cls(id_=id_, fee=fee)
 
 class ConfirmedTransaction(Serialize, Deserialize):
+    __slots__ = ()
+
     class Type(IntEnumu8):
         AcceptedDeploy = 0
         AcceptedExecute = 1
         RejectedDeploy = 2
         RejectedExecute = 3
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -2289,22 +2384,19 @@ class ConfirmedTransaction(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type(data[0])
-        del data[0]
-        if type_ == cls.Type.AcceptedDeploy:
-            return AcceptedDeploy.load(data)
-        elif type_ == cls.Type.AcceptedExecute:
-            return AcceptedExecute.load(data)
-        elif type_ == cls.Type.RejectedDeploy:
-            return RejectedDeploy.load(data)
-        elif type_ == cls.Type.RejectedExecute:
-            return RejectedExecute.load(data)
-        else:
-            raise ValueError("incorrect type")
+    def read(cls, data: Cursor):
+        type_ = enum_member(cls.Type, data.peek_byte())
+        return cls.type_map[type_].read(data)
+
+    @classmethod
+    def skip(cls, data: Cursor):
+        type_ = enum_member(cls.Type, data.peek_byte())
+        cls.type_map[type_].skip(data)
 
 
 class FinalizeOperation(Serialize, Deserialize):
+    __slots__ = ()
+
     class Type(IntEnumu8):
         InitializeMapping = 0
         InsertKeyValue = 1
@@ -2312,6 +2404,8 @@ class FinalizeOperation(Serialize, Deserialize):
         RemoveKeyValue = 3
         RemoveMapping = 4
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -2319,24 +2413,13 @@ class FinalizeOperation(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type(data[0])
-        del data[0]
-        if type_ == cls.Type.InitializeMapping:
-            return InitializeMapping.load(data)
-        elif type_ == cls.Type.InsertKeyValue:
-            return InsertKeyValue.load(data)
-        elif type_ == cls.Type.UpdateKeyValue:
-            return UpdateKeyValue.load(data)
-        elif type_ == cls.Type.RemoveKeyValue:
-            return RemoveKeyValue.load(data)
-        elif type_ == cls.Type.RemoveMapping:
-            return RemoveMapping.load(data)
-        else:
-            raise ValueError("incorrect type")
+    def read(cls, data: Cursor):
+        type_ = enum_member(cls.Type, data.read_byte())
+        return cls.type_map[type_].read(data)
 
 
 class InitializeMapping(FinalizeOperation):
+    __slots__ = ("mapping_id",)
     type = FinalizeOperation.Type.InitializeMapping
 
     # @type_check
@@ -2348,12 +2431,13 @@ class InitializeMapping(FinalizeOperation):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping_id = Field.load(data)
+    def read(cls, data: Cursor):
+        mapping_id = Field.read(data)
         return cls(mapping_id=mapping_id)
 
 
 class InsertKeyValue(FinalizeOperation):
+    __slots__ = ("mapping_id", "key_id", "value_id")
     type = FinalizeOperation.Type.InsertKeyValue
 
     # @type_check
@@ -2367,14 +2451,15 @@ class InsertKeyValue(FinalizeOperation):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping_id = Field.load(data)
-        key_id = Field.load(data)
-        value_id = Field.load(data)
+    def read(cls, data: Cursor):
+        mapping_id = Field.read(data)
+        key_id = Field.read(data)
+        value_id = Field.read(data)
         return cls(mapping_id=mapping_id, key_id=key_id, value_id=value_id)
 
 
 class UpdateKeyValue(FinalizeOperation):
+    __slots__ = ("mapping_id", "index", "key_id", "value_id")
     type = FinalizeOperation.Type.UpdateKeyValue
 
     # @type_check
@@ -2389,15 +2474,16 @@ class UpdateKeyValue(FinalizeOperation):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping_id = Field.load(data)
-        index = u64.load(data)
-        key_id = Field.load(data)
-        value_id = Field.load(data)
+    def read(cls, data: Cursor):
+        mapping_id = Field.read(data)
+        index = u64.read(data)
+        key_id = Field.read(data)
+        value_id = Field.read(data)
         return cls(mapping_id=mapping_id, index=index, key_id=key_id, value_id=value_id)
 
 
 class RemoveKeyValue(FinalizeOperation):
+    __slots__ = ("mapping_id", "index")
     type = FinalizeOperation.Type.RemoveKeyValue
 
     # @type_check
@@ -2410,13 +2496,14 @@ class RemoveKeyValue(FinalizeOperation):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping_id = Field.load(data)
-        index = u64.load(data)
+    def read(cls, data: Cursor):
+        mapping_id = Field.read(data)
+        index = u64.read(data)
         return cls(mapping_id=mapping_id, index=index)
 
 
 class RemoveMapping(FinalizeOperation):
+    __slots__ = ("mapping_id",)
     type = FinalizeOperation.Type.RemoveMapping
 
     # @type_check
@@ -2428,123 +2515,122 @@ class RemoveMapping(FinalizeOperation):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        mapping_id = Field.load(data)
+    def read(cls, data: Cursor):
+        mapping_id = Field.read(data)
         return cls(mapping_id=mapping_id)
 
 
 class AcceptedDeploy(ConfirmedTransaction):
+    __slots__ = ("index", "transaction", "finalize")
     type = ConfirmedTransaction.Type.AcceptedDeploy
 
+    layout = (
+        "type",
+        ("index", u32),
+        ("transaction", Transaction),
+        ("finalize", Vec[FinalizeOperation, u16]),
+    )
+
     # @type_check
     def __init__(self, *, index: u32, transaction: Transaction, finalize: Vec[FinalizeOperation, u16]):
         self.index = index
         self.transaction = transaction
         self.finalize = finalize
 
-    def dump(self) -> bytes:
-        return self.type.dump() + self.index.dump() + self.transaction.dump() + self.finalize.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        index = u32.load(data)
-        transaction = Transaction.load(data)
-        finalize = Vec[FinalizeOperation, u16].load(data)
-        return cls(index=index, transaction=transaction, finalize=finalize)
-
 
 class AcceptedExecute(ConfirmedTransaction):
+    __slots__ = ("index", "transaction", "finalize")
     type = ConfirmedTransaction.Type.AcceptedExecute
 
+    layout = (
+        "type",
+        ("index", u32),
+        ("transaction", Transaction),
+        ("finalize", Vec[FinalizeOperation, u16]),
+    )
+
     # @type_check
     def __init__(self, *, index: u32, transaction: Transaction, finalize: Vec[FinalizeOperation, u16]):
         self.index = index
         self.transaction = transaction
         self.finalize = finalize
 
-    def dump(self) -> bytes:
-        return self.type.dump() + self.index.dump() + self.transaction.dump() + self.finalize.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        index = u32.load(data)
-        transaction = Transaction.load(data)
-        finalize = Vec[FinalizeOperation, u16].load(data)
-        return cls(index=index, transaction=transaction, finalize=finalize)
-
 
 class RejectedDeploy(ConfirmedTransaction):
+    __slots__ = ("index", "transaction", "rejected")
     type = ConfirmedTransaction.Type.RejectedDeploy
 
+    layout = (
+        "type",
+        ("index", u32),
+        ("transaction", Transaction),
+        ("rejected", Deployment),
+    )
+
     # @type_check
     def __init__(self, *, index: u32, transaction: Transaction, rejected: Deployment):
         self.index = index
         self.transaction = transaction
         self.rejected = rejected
 
-    def dump(self) -> bytes:
-        return self.type.dump() + self.index.dump() + self.transaction.dump() + self.rejected.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        index = u32.load(data)
-        transaction = Transaction.load(data)
-        rejected = Deployment.load(data)
-        return cls(index=index, transaction=transaction, rejected=rejected)
-
 
 class RejectedExecute(ConfirmedTransaction):
+    __slots__ = ("index", "transaction", "rejected")
     type = ConfirmedTransaction.Type.RejectedExecute
 
+    layout = (
+        "type",
+        ("index", u32),
+        ("transaction", Transaction),
+        ("rejected", Execution),
+    )
+
     # @type_check
     def __init__(self, *, index: u32, transaction: Transaction, rejected: Execution):
         self.index = index
         self.transaction = transaction
         self.rejected = rejected
 
-    def dump(self) -> bytes:
-        return self.type.dump() + self.index.dump() + self.transaction.dump() + self.rejected.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        index = u32.load(data)
-        transaction = Transaction.load(data)
-        rejected = Execution.load(data)
-        return cls(index=index, transaction=transaction, rejected=rejected)
-
 
 class Transactions(Serialize, Deserialize):
+    __slots__ = ("transactions",)
     version = u8()
 
+    layout = (
+        "version",
+        ("transactions", Vec[ConfirmedTransaction, u32]),
+    )
+
     # @type_check
     @generic_type_check
     def __init__(self, *, transactions: Vec[ConfirmedTransaction, u32]):  # we probably don't need IDs here so using Vec
         self.transactions = transactions
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.transactions.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        if version != cls.version:
-            raise ValueError("invalid transactions version")
-        # noinspection PyArgumentList
-        transactions = Vec[ConfirmedTransaction, u32].load(data)
-        return cls(transactions=transactions)
-
     def __iter__(self):
         return iter(self.transactions)
 
 
 class BlockHeaderMetadata(Serialize, Deserialize):
+    __slots__ = (
+        "network", "round", "height", "total_supply_in_microcredits", "cumulative_weight", "coinbase_target",
+        "proof_target", "last_coinbase_target", "last_coinbase_timestamp", "timestamp",
+    )
     version = u8()
 
+    layout = (
+        "version",
+        ("network", u16),
+        ("round", u64, "round_"),
+        ("height", u32),
+        ("total_supply_in_microcredits", u64),
+        ("cumulative_weight", u128),
+        ("coinbase_target", u64),
+        ("proof_target", u64),
+        ("last_coinbase_target", u64),
+        ("last_coinbase_timestamp", i64),
+        ("timestamp", i64),
+    )
+
     # @type_check
     def __init__(self, *, network: u16, round_: u64, height: u32, total_supply_in_microcredits: u64,
                  cumulative_weight: u128, coinbase_target: u64, proof_target: u64, last_coinbase_target: u64,
@@ -2560,39 +2646,23 @@ class BlockHeaderMetadata(Serialize, Deserialize):
         self.last_coinbase_timestamp = last_coinbase_timestamp
         self.timestamp = timestamp
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.network.dump() + self.round.dump() + self.height.dump() + \
-            self.total_supply_in_microcredits.dump() + self.cumulative_weight.dump() + \
-            self.coinbase_target.dump() + self.proof_target.dump() + self.last_coinbase_target.dump() + \
-            self.last_coinbase_timestamp.dump() + self.timestamp.dump()
-
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        if version != cls.version:
-            raise ValueError("invalid metadata version")
-        network = u16.load(data)
-        round_ = u64.load(data)
-        height = u32.load(data)
-        total_supply_in_microcredits = u64.load(data)
-        cumulative_weight = u128.load(data)
-        coinbase_target = u64.load(data)
-        proof_target = u64.load(data)
-        last_coinbase_target = u64.load(data)
-        last_coinbase_timestamp = i64.load(data)
-        timestamp = i64.load(data)
-        return cls(network=network, round_=round_, height=height,
-                   total_supply_in_microcredits=total_supply_in_microcredits,
-                   cumulative_weight=cumulative_weight, coinbase_target=coinbase_target,
-                   proof_target=proof_target, last_coinbase_target=last_coinbase_target,
-                   last_coinbase_timestamp=last_coinbase_timestamp, timestamp=timestamp)
-
 
 class BlockHeader(Serialize, Deserialize):
+    __slots__ = (
+        "previous_state_root", "transactions_root", "finalize_root", "coinbase_accumulator_point",
+        "metadata",
+    )
     version = u8()
 
+    layout = (
+        "version",
+        ("previous_state_root", Field),
+        ("transactions_root", Field),
+        ("finalize_root", Field),
+        ("coinbase_accumulator_point", Field),
+        ("metadata", BlockHeaderMetadata),
+    )
+
     # @type_check
     def __init__(self, *, previous_state_root: Field, transactions_root: Field, coinbase_accumulator_point: Field,
                  finalize_root: Field, metadata: BlockHeaderMetadata):
@@ -2602,27 +2672,9 @@ class BlockHeader(Serialize, Deserialize):
         self.coinbase_accumulator_point = coinbase_accumulator_point
         self.metadata = metadata
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.previous_state_root.dump() + self.transactions_root.dump() \
-               + self.finalize_root.dump() + self.coinbase_accumulator_point.dump() + self.metadata.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        previous_state_root = Field.load(data)
-        transactions_root = Field.load(data)
-        finalize_root = Field.load(data)
-        coinbase_accumulator_point = Field.load(data)
-        metadata = BlockHeaderMetadata.load(data)
-        if version != cls.version:
-            raise ValueError("invalid header version")
-        return cls(previous_state_root=previous_state_root, transactions_root=transactions_root,
-                   finalize_root=finalize_root, coinbase_accumulator_point=coinbase_accumulator_point,
-                   metadata=metadata)
-
 
 class PuzzleCommitment(Serialize, Deserialize):
+    __slots__ = ("commitment",)
 
     # @type_check
     def __init__(self, *, commitment: KZGCommitment):
@@ -2633,8 +2685,8 @@ class PuzzleCommitment(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        commitment = KZGCommitment.load(data)
+    def read(cls, data: Cursor):
+        commitment = KZGCommitment.read(data)
         return cls(commitment=commitment)
 
     @classmethod
@@ -2650,6 +2702,7 @@ class PuzzleCommitment(Serialize, Deserialize):
 
 
 class PartialSolution(Serialize, Deserialize):
+    __slots__ = ("address", "nonce", "commitment")
 
     # @type_check
     def __init__(self, *, address: Address, nonce: u64, commitment: PuzzleCommitment):
@@ -2662,10 +2715,10 @@ class PartialSolution(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        address = Address.load(data)
-        nonce = u64.load(data)
-        commitment = PuzzleCommitment.load(data)
+    def read(cls, data: Cursor):
+        address = Address.read(data)
+        nonce = u64.read(data)
+        commitment = PuzzleCommitment.read(data)
         return cls(address=address, nonce=nonce, commitment=commitment)
 
     @classmethod
@@ -2684,6 +2737,7 @@ PuzzleProof = KZGProof
 
 
 class ProverSolution(Serialize, Deserialize):
+    __slots__ = ("partial_solution", "proof")
 
     # @type_check
     def __init__(self, *, partial_solution: PartialSolution, proof: PuzzleProof):
@@ -2695,13 +2749,14 @@ class ProverSolution(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        partial_solution = PartialSolution.load(data)
-        proof = PuzzleProof.load(data)
+    def read(cls, data: Cursor):
+        partial_solution = PartialSolution.read(data)
+        proof = PuzzleProof.read(data)
         return cls(partial_solution=partial_solution, proof=proof)
 
 
 class CoinbaseSolution(Serialize, Deserialize):
+    __slots__ = ("partial_solutions", "proof")
 
     # @type_check
     @generic_type_check
@@ -2714,13 +2769,14 @@ class CoinbaseSolution(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        partial_solutions = Vec[PartialSolution, u32].load(data)
-        proof = PuzzleProof.load(data)
+    def read(cls, data: Cursor):
+        partial_solutions = Vec[PartialSolution, u32].read(data)
+        proof = PuzzleProof.read(data)
         return cls(partial_solutions=partial_solutions, proof=proof)
 
 
 class ComputeKey(Serialize, Deserialize):
+    __slots__ = ("pk_sig", "pr_sig")
 
     # @type_check
     def __init__(self, *, pk_sig: Group, pr_sig: Group):
@@ -2732,13 +2788,14 @@ class ComputeKey(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        pk_sig = Group.load(data)
-        pr_sig = Group.load(data)
+    def read(cls, data: Cursor):
+        pk_sig = Group.read(data)
+        pr_sig = Group.read(data)
         return cls(pk_sig=pk_sig, pr_sig=pr_sig)
 
 
 class Signature(Serialize, Deserialize):
+    __slots__ = ("challange", "response", "compute_key")
 
     # @type_check
     def __init__(self, *, challange: Scalar, response: Scalar, compute_key: ComputeKey):
@@ -2751,10 +2808,10 @@ class Signature(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        challange = Scalar.load(data)
-        response = Scalar.load(data)
-        compute_key = ComputeKey.load(data)
+    def read(cls, data: Cursor):
+        challange = Scalar.read(data)
+        response = Scalar.read(data)
+        compute_key = ComputeKey.read(data)
         return cls(challange=challange, response=response, compute_key=compute_key)
 
     @classmethod
@@ -2787,8 +2844,19 @@ def retarget(prev_target, prev_block_timestamp, block_timestamp, half_life, inve
 
 
 class Block(Serialize, Deserialize):
+    __slots__ = ("block_hash", "previous_hash", "header", "transactions", "coinbase", "signature")
     version = u8()
 
+    layout = (
+        "version",
+        ("block_hash", BlockHash),
+        ("previous_hash", BlockHash),
+        ("header", BlockHeader),
+        ("transactions", Transactions),
+        ("coinbase", Option[CoinbaseSolution]),
+        ("signature", Signature),
+    )
+
     # @type_check
     def __init__(self, *, block_hash: BlockHash, previous_hash: BlockHash, header: BlockHeader,
                  transactions: Transactions, coinbase: Option[CoinbaseSolution], signature: Signature):
@@ -2799,26 +2867,6 @@ class Block(Serialize, Deserialize):
         self.coinbase = coinbase
         self.signature = signature
 
-    def dump(self) -> bytes:
-        return self.version.dump() + self.block_hash.dump() + self.previous_hash.dump() + self.header.dump() \
-               + self.transactions.dump() + self.coinbase.dump() + self.signature.dump()
-
-    @classmethod
-    # @type_check
-    def load(cls, data: bytearray):
-        version = u8.load(data)
-        block_hash = BlockHash.load(data)
-        previous_hash = BlockHash.load(data)
-        header = BlockHeader.load(data)
-        transactions = Transactions.load(data)
-        coinbase = Option[CoinbaseSolution].load(data)
-        signature = Signature.load(data)
-        if version != cls.version:
-            raise ValueError("invalid block version")
-        return cls(block_hash=block_hash, previous_hash=previous_hash, header=header, transactions=transactions,
-                   coinbase=coinbase, signature=signature)
-
-
     def __str__(self):
         return f"Block {self.header.metadata.height} ({str(self.block_hash)[:16]}...)"
 
@@ -2833,4 +2881,97 @@ class Block(Serialize, Deserialize):
         return retarget(remaining_blocks * anchor_reward, last_timestamp, self.header.metadata.timestamp, 25, True, 25)
 
     def get_epoch_number(self) -> int:
-        return self.header.metadata.height // 256
\ No newline at end of file
+        return self.header.metadata.height // 256
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self.transactions.transactions)
+
+
+class LazyBlock(Block):
+    __slots__ = (
+        "_data", "_transaction_offsets", "_coinbase_offset", "_decoded", "_transactions", "_coinbase",
+    )
+
+    # Block as received from the network. The hashes, header and signature are decoded right away,
+    # transactions and the coinbase solution are only located and get decoded on first access.
+    # Blocks are immutable once received, so dump() returns the original bytes.
+
+    # noinspection PyMissingConstructor
+    def __init__(self, *, block_hash: BlockHash, previous_hash: BlockHash, header: BlockHeader, signature: Signature,
+                 data: bytes, transaction_offsets: list[int], coinbase_offset: int):
+        self.block_hash = block_hash
+        self.previous_hash = previous_hash
+        self.header = header
+        self.signature = signature
+        self._data = data
+        self._transaction_offsets = transaction_offsets
+        self._coinbase_offset = coinbase_offset
+        self._decoded: list[ConfirmedTransaction | None] = [None] * len(transaction_offsets)
+        self._transactions = None
+        self._coinbase = None
+
+    def dump(self) -> bytes:
+        return self._data
+
+    def write(self, buf: bytearray):
+        buf += self._data
+
+    def __reduce__(self):
+        # transactions and coinbase shadow Block slots, so the slot state cannot be restored, parse the bytes again
+        return type(self).load, (bytearray(self._data),)
+
+    @classmethod
+    # @type_check
+    def read(cls, data: Cursor):
+        start = data.offset
+        version = u8.read(data)
+        if version != cls.version:
+            raise ValueError(f"version mismatch: expected {cls.version}, got {version}")
+        block_hash = BlockHash.read(data)
+        previous_hash = BlockHash.read(data)
+        header = BlockHeader.read(data)
+        version = u8.read(data)
+        if version != Transactions.version:
+            raise ValueError(f"version mismatch: expected {Transactions.version}, got {version}")
+        transaction_offsets = []
+        for _ in range(u32.read(data)):
+            transaction_offsets.append(data.offset - start)
+            ConfirmedTransaction.skip(data)
+        coinbase_offset = data.offset - start
+        Option[CoinbaseSolution].skip(data)
+        signature = Signature.read(data)
+        return cls(block_hash=block_hash, previous_hash=previous_hash, header=header, signature=signature,
+                   data=bytes(data.view[start:data.offset]), transaction_offsets=transaction_offsets,
+                   coinbase_offset=coinbase_offset)
+
+    def _cursor_at(self, offset: int) -> Cursor:
+        cursor = Cursor(self._data)
+        cursor.offset = offset
+        return cursor
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self._transaction_offsets)
+
+    def get_transaction(self, index: int) -> ConfirmedTransaction:
+        transaction = self._decoded[index]
+        if transaction is None:
+            transaction = ConfirmedTransaction.read(self._cursor_at(self._transaction_offsets[index]))
+            self._decoded[index] = transaction
+        return transaction
+
+    @property
+    def transactions(self) -> Transactions:
+        if self._transactions is None:
+            transactions = [self.get_transaction(i) for i in range(len(self._transaction_offsets))]
+            self._transactions = Transactions(transactions=Vec[ConfirmedTransaction, u32](transactions))
+        return self._transactions
+
+    @property
+    def coinbase(self) -> Option[CoinbaseSolution]:
+        if self._coinbase is None:
+            self._coinbase = Option[CoinbaseSolution].read(self._cursor_at(self._coinbase_offset))
+        return self._coinbase
+
+
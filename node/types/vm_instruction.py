@@ -4,6 +4,7 @@ from .vm_basic import *
 
 
 class StringType(Serialize, Deserialize):
+    __slots__ = ("string",)
 
     # @type_check
     def __init__(self, *, string: str):
@@ -17,10 +18,9 @@ class StringType(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        length = u16.load(data)
-        string = data[:length].decode("utf-8")
-        del data[:length]
+    def read(cls, data: Cursor):
+        length = u16.read(data)
+        string = bytes(data.read(length)).decode("utf-8")
         return cls(string=string)
 
     @classmethod
@@ -31,6 +31,7 @@ class StringType(Serialize, Deserialize):
         return self.string
 
 class Literal(Serialize, Deserialize): # enum
+    __slots__ = ("type", "primitive")
 
     class Type(IntEnumu16):
         Address = 0
@@ -98,9 +99,9 @@ class Literal(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        primitive = cls.primitive_type_map[type_].load(data)
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        primitive = cls.primitive_type_map[type_].read(data)
         return cls(type_=type_, primitive=primitive)
 
     @classmethod
@@ -122,6 +123,7 @@ class Literal(Serialize, Deserialize): # enum
 
 
 class Identifier(Serialize, Deserialize):
+    __slots__ = ("data",)
 
     # @type_check
     def __init__(self, *, value: str):
@@ -141,15 +143,13 @@ class Identifier(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 1:
             raise ValueError("incorrect length")
-        length = data[0]
-        del data[0]
+        length = data.read_byte()
         if len(data) < length:
             raise ValueError("incorrect length")
-        value = data[:length].decode("ascii") # let the exception propagate
-        del data[:length]
+        value = bytes(data.read(length)).decode("ascii") # let the exception propagate
         return cls(value=value)
 
     @classmethod
@@ -167,6 +167,7 @@ class Identifier(Serialize, Deserialize):
         return hash(self.data)
 
 class ProgramID(Serialize, Deserialize):
+    __slots__ = ("name", "network")
 
     # @type_check
     def __init__(self, *, name: Identifier, network: Identifier):
@@ -178,9 +179,9 @@ class ProgramID(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        name = Identifier.load(data)
-        network = Identifier.load(data)
+    def read(cls, data: Cursor):
+        name = Identifier.read(data)
+        network = Identifier.read(data)
         return cls(name=name, network=network)
 
     @classmethod
@@ -194,6 +195,7 @@ class ProgramID(Serialize, Deserialize):
 
 
 class Import(Serialize, Deserialize):
+    __slots__ = ("program_id",)
 
     # @type_check
     def __init__(self, *, program_id: ProgramID):
@@ -204,16 +206,19 @@ class Import(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        program_id = ProgramID.load(data)
+    def read(cls, data: Cursor):
+        program_id = ProgramID.read(data)
         return cls(program_id=program_id)
 
 class Register(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Locator = 0
         Member = 1
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -221,17 +226,13 @@ class Register(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        if type_ == cls.Type.Locator:
-            return LocatorRegister.load(data)
-        elif type_ == cls.Type.Member:
-            return MemberRegister.load(data)
-        else:
-            raise ValueError(f"Invalid register type {type_}")
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 
 class LocatorRegister(Register):
+    __slots__ = ("locator",)
     type = Register.Type.Locator
 
     # @type_check
@@ -243,12 +244,13 @@ class LocatorRegister(Register):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        locator = VarInt[u64].load(data)
+    def read(cls, data: Cursor):
+        locator = VarInt[u64].read(data)
         return cls(locator=locator)
 
 
 class MemberRegister(Register):
+    __slots__ = ("locator", "identifiers")
     type = Register.Type.Member
 
     # @type_check
@@ -262,13 +264,14 @@ class MemberRegister(Register):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        locator = VarInt[u64].load(data)
-        identifiers = Vec[Identifier, u16].load(data)
+    def read(cls, data: Cursor):
+        locator = VarInt[u64].read(data)
+        identifiers = Vec[Identifier, u16].read(data)
         return cls(locator=locator, identifiers=identifiers)
 
 
 class Operand(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Literal = 0
@@ -276,6 +279,8 @@ class Operand(Serialize, Deserialize): # enum
         ProgramID = 2
         Caller = 3
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -283,22 +288,14 @@ class Operand(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 1:
             raise ValueError("incorrect length")
-        type_ = cls.Type.load(data)
-        if type_ == cls.Type.Literal:
-            return LiteralOperand.load(data)
-        elif type_ == cls.Type.Register:
-            return RegisterOperand.load(data)
-        elif type_ == cls.Type.ProgramID:
-            return ProgramIDOperand.load(data)
-        elif type_ == cls.Type.Caller:
-            return CallerOperand.load(data)
-        else:
-            raise ValueError("unknown operand type")
+        type_ = cls.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 class LiteralOperand(Operand):
+    __slots__ = ("literal",)
     type = Operand.Type.Literal
 
     # @type_check
@@ -310,11 +307,12 @@ class LiteralOperand(Operand):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(literal=Literal.load(data))
+    def read(cls, data: Cursor):
+        return cls(literal=Literal.read(data))
 
 
 class RegisterOperand(Operand):
+    __slots__ = ("register",)
     type = Operand.Type.Register
 
     # @type_check
@@ -326,11 +324,12 @@ class RegisterOperand(Operand):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(register=Register.load(data))
+    def read(cls, data: Cursor):
+        return cls(register=Register.read(data))
 
 
 class ProgramIDOperand(Operand):
+    __slots__ = ("program_id",)
     type = Operand.Type.ProgramID
 
     # @type_check
@@ -342,11 +341,12 @@ class ProgramIDOperand(Operand):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(program_id=ProgramID.load(data))
+    def read(cls, data: Cursor):
+        return cls(program_id=ProgramID.read(data))
 
 
 class CallerOperand(Operand):
+    __slots__ = ()
     type = Operand.Type.Caller
 
     # @type_check
@@ -358,11 +358,14 @@ class CallerOperand(Operand):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         return cls()
 
 
 class Literals(Generic, Serialize, Deserialize):
+    __slots__ = ("num_operands", "operands", "destination")
+    _params = ("num_operands",)
+
     # The generic here is for the number of the literals
     def __init__(self, types):
         if len(types) != 1:
@@ -375,6 +378,7 @@ class Literals(Generic, Serialize, Deserialize):
     @generic_type_check
     def __call__(self, *, operands: Vec[Operand | NoneType, 3], destination: Register):
         # the max operand count is 3, fill in the rest with None
+        self = self._instance()
         self.operands = operands
         self.destination = destination
         return self
@@ -387,15 +391,18 @@ class Literals(Generic, Serialize, Deserialize):
         return res
 
     # @type_check
-    def load(self, data: bytearray):
+    def read(self, data: Cursor):
         operands = [None] * 3
         for i in range(self.num_operands):
-            operands[i] = Operand.load(data)
-        destination = Register.load(data)
+            operands[i] = Operand.read(data)
+        destination = Register.read(data)
         return self(operands=Vec[Operand | NoneType, 3](operands), destination=destination)
 
 
 class AssertInstruction(Generic, Serialize, Deserialize):
+    __slots__ = ("variant", "operands")
+    _params = ("variant",)
+
     # The generic here is for the variant of the assert instruction
     def __init__(self, types):
         if len(types) != 1:
@@ -407,6 +414,7 @@ class AssertInstruction(Generic, Serialize, Deserialize):
     # @type_check
     @generic_type_check
     def __call__(self, *, operands: Vec[Operand, 2]):
+        self = self._instance()
         self.operands = operands
         return self
 
@@ -414,11 +422,12 @@ class AssertInstruction(Generic, Serialize, Deserialize):
         return self.operands.dump()
 
     # @type_check
-    def load(self, data: bytearray):
-        return self(operands=Vec[Operand, 2].load(data))
+    def read(self, data: Cursor):
+        return self(operands=Vec[Operand, 2].read(data))
 
 
 class Locator(Serialize, Deserialize):
+    __slots__ = ("id", "resource")
 
     # @type_check
     def __init__(self, *, id_: ProgramID, resource: Identifier):
@@ -430,9 +439,9 @@ class Locator(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        id_ = ProgramID.load(data)
-        resource = Identifier.load(data)
+    def read(cls, data: Cursor):
+        id_ = ProgramID.read(data)
+        resource = Identifier.read(data)
         return cls(id_=id_, resource=resource)
 
     def __str__(self):
@@ -441,11 +450,14 @@ class Locator(Serialize, Deserialize):
 
 
 class CallOperator(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Locator = 0
         Resource = 1
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -453,19 +465,15 @@ class CallOperator(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 1:
             raise ValueError("incorrect length")
-        type_ = cls.Type.load(data)
-        if type_ == cls.Type.Locator:
-            return LocatorCallOperator.load(data)
-        elif type_ == cls.Type.Resource:
-            return ResourceCallOperator.load(data)
-        else:
-            raise ValueError("unknown call operator type")
+        type_ = cls.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 
 class LocatorCallOperator(CallOperator):
+    __slots__ = ("locator",)
     type = CallOperator.Type.Locator
 
     # @type_check
@@ -477,11 +485,12 @@ class LocatorCallOperator(CallOperator):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(locator=Locator.load(data))
+    def read(cls, data: Cursor):
+        return cls(locator=Locator.read(data))
 
 
 class ResourceCallOperator(CallOperator):
+    __slots__ = ("resource",)
     type = CallOperator.Type.Resource
 
     # @type_check
@@ -493,11 +502,12 @@ class ResourceCallOperator(CallOperator):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        return cls(resource=Identifier.load(data))
+    def read(cls, data: Cursor):
+        return cls(resource=Identifier.read(data))
 
 
 class Call(Serialize, Deserialize):
+    __slots__ = ("operator", "operands", "destinations")
 
     # @type_check
     @generic_type_check
@@ -511,10 +521,10 @@ class Call(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        operator = CallOperator.load(data)
-        operands = Vec[Operand, u8].load(data)
-        destinations = Vec[Register, u8].load(data)
+    def read(cls, data: Cursor):
+        operator = CallOperator.read(data)
+        operands = Vec[Operand, u8].read(data)
+        destinations = Vec[Register, u8].read(data)
         return cls(operator=operator, operands=operands, destinations=destinations)
 
 class LiteralType(IntEnumu16):
@@ -577,11 +587,14 @@ class LiteralType(IntEnumu16):
 
 
 class PlaintextType(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Literal = 0
         Struct = 1
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -589,19 +602,15 @@ class PlaintextType(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
+    def read(cls, data: Cursor):
         if len(data) < 1:
             raise ValueError("incorrect length")
-        type_ = cls.Type(data[0])
-        del data[0]
-        if type_ == cls.Type.Literal:
-            return LiteralPlaintextType.load(data)
-        if type_ == cls.Type.Struct:
-            return StructPlaintextType.load(data)
-        raise ValueError("unknown type")
+        type_ = enum_member(cls.Type, data.read_byte())
+        return cls.type_map[type_].read(data)
 
 
 class LiteralPlaintextType(PlaintextType):
+    __slots__ = ("literal_type",)
     type = PlaintextType.Type.Literal
 
     # @type_check
@@ -613,8 +622,8 @@ class LiteralPlaintextType(PlaintextType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        literal_type = LiteralType.load(data)
+    def read(cls, data: Cursor):
+        literal_type = LiteralType.read(data)
         return cls(literal_type=literal_type)
 
     def __str__(self):
@@ -622,6 +631,7 @@ class LiteralPlaintextType(PlaintextType):
 
 
 class StructPlaintextType(PlaintextType):
+    __slots__ = ("struct",)
     type = PlaintextType.Type.Struct
 
     # @type_check
@@ -633,20 +643,23 @@ class StructPlaintextType(PlaintextType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        struct_ = Identifier.load(data)
+    def read(cls, data: Cursor):
+        struct_ = Identifier.read(data)
         return cls(struct_=struct_)
 
     def __str__(self):
         return str(self.struct)
 
 class RegisterType(Serialize, Deserialize): # enum
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Plaintext = 0
         Record = 1
         ExternalRecord = 2
 
+    type_map = {}
+
     @property
     @abstractmethod
     def type(self):
@@ -654,19 +667,13 @@ class RegisterType(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        if type_ == cls.Type.Plaintext:
-            return PlaintextRegisterType.load(data)
-        elif type_ == cls.Type.Record:
-            return RecordRegisterType.load(data)
-        elif type_ == cls.Type.ExternalRecord:
-            return ExternalRecordRegisterType.load(data)
-        else:
-            raise ValueError(f"Invalid register type {type_}")
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        return cls.type_map[type_].read(data)
 
 
 class PlaintextRegisterType(RegisterType):
+    __slots__ = ("plaintext_type",)
     type = RegisterType.Type.Plaintext
 
     # @type_check
@@ -678,12 +685,13 @@ class PlaintextRegisterType(RegisterType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        plaintext_type = PlaintextType.load(data)
+    def read(cls, data: Cursor):
+        plaintext_type = PlaintextType.read(data)
         return cls(plaintext_type=plaintext_type)
 
 
 class RecordRegisterType(RegisterType):
+    __slots__ = ("identifier",)
     type = RegisterType.Type.Record
 
     # @type_check
@@ -695,12 +703,13 @@ class RecordRegisterType(RegisterType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        identifier = Identifier.load(data)
+    def read(cls, data: Cursor):
+        identifier = Identifier.read(data)
         return cls(identifier=identifier)
 
 
 class ExternalRecordRegisterType(RegisterType):
+    __slots__ = ("locator",)
     type = RegisterType.Type.ExternalRecord
 
     # @type_check
@@ -712,12 +721,13 @@ class ExternalRecordRegisterType(RegisterType):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        locator = Locator.load(data)
+    def read(cls, data: Cursor):
+        locator = Locator.read(data)
         return cls(locator=locator)
 
 
 class Cast(Serialize, Deserialize):
+    __slots__ = ("operands", "destination", "register_type")
 
     # @type_check
     @generic_type_check
@@ -731,14 +741,15 @@ class Cast(Serialize, Deserialize):
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        operands = Vec[Operand, u8].load(data)
-        destination = Register.load(data)
-        register_type = RegisterType.load(data)
+    def read(cls, data: Cursor):
+        operands = Vec[Operand, u8].read(data)
+        destination = Register.read(data)
+        register_type = RegisterType.read(data)
         return cls(operands=operands, destination=destination, register_type=register_type)
 
 
 class Instruction(Serialize, Deserialize): # enum
+    __slots__ = ("type", "literals")
 
     class Type(IntEnumu16):
         Abs = 0
@@ -929,7 +940,7 @@ class Instruction(Serialize, Deserialize): # enum
 
     @classmethod
     # @type_check
-    def load(cls, data: bytearray):
-        type_ = cls.Type.load(data)
-        literals = deepcopy(cls.type_map[type_]).load(data)
+    def read(cls, data: Cursor):
+        type_ = cls.Type.read(data)
+        literals = cls.type_map[type_].read(data)
         return cls(type_=type_, literals=literals)
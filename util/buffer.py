@@ -26,4 +26,58 @@ class Buffer:
         self._buffer[key] = value
 
     def __len__(self):
-        return len(self._buffer)
\ No newline at end of file
+        return len(self._buffer)
+
+class FrameReader:
+    # Reads u32 length-prefixed frames from an asyncio stream into one reusable buffer.
+    # Complete frames are handed out as memoryviews into the buffer, which stay valid until the next read_frame
+    # call, so the decoder must copy anything it keeps. Unread bytes are moved back to the start once the end of
+    # the buffer is reached, and the buffer only grows for a frame larger than it. Compared to readexactly it is
+    # faster for small frames and frames of 128 KB and more, and even around 64 KB, see benchmark/frame_reader.py.
+
+    max_frame_size = 256 * 1024 * 1024
+
+    def __init__(self, reader, capacity: int = 1024 * 1024):
+        self.reader = reader
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._frame: memoryview | None = None
+
+    async def read_frame(self) -> memoryview:
+        if self._frame is not None:
+            self._frame.release()
+            self._frame = None
+        while True:
+            available = self._end - self._start
+            if available >= 4:
+                size = int.from_bytes(self._view[self._start:self._start + 4], "little")
+                if size > self.max_frame_size:
+                    raise ValueError(f"frame too large: {size}")
+                if available >= 4 + size:
+                    start = self._start + 4
+                    self._start = start + size
+                    self._frame = self._view[start:self._start]
+                    return self._frame
+                await self._fill(4 + size)
+            else:
+                await self._fill(4)
+
+    async def _fill(self, needed: int):
+        available = self._end - self._start
+        if self._start + needed > len(self._buffer):
+            if needed > len(self._buffer):
+                buffer = bytearray(max(needed, len(self._buffer) * 2))
+                buffer[:available] = self._view[self._start:self._end]
+                self._view.release()
+                self._buffer = buffer
+                self._view = memoryview(buffer)
+            else:
+                self._view[:available] = self._view[self._start:self._end]
+            self._start, self._end = 0, available
+        data = await self.reader.read(len(self._buffer) - self._end)
+        if not data:
+            raise Exception("connection closed")
+        self._view[self._end:self._end + len(data)] = data
+        self._end += len(data)
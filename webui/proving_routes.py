@@ -3,7 +3,7 @@ import time
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
 
-from db import Database
+from db import Database, CHAIN_TIP_MAX_AGE_IN_SECS
 from node.types import Transaction, ConfirmedTransaction
 from .template import templates
 from .utils import out_of_sync_check
@@ -11,7 +11,7 @@ from .utils import out_of_sync_check
 
 async def calc_route(request: Request):
     db: Database = request.app.state.db
-    proof_target = (await db.get_latest_block()).header.metadata.proof_target
+    proof_target = (await db.get_latest_header(max_age=CHAIN_TIP_MAX_AGE_IN_SECS)).metadata.proof_target
     ctx = {
         "request": request,
         "proof_target": proof_target,
@@ -2,7 +2,7 @@
 import os
 import time
 
-from db import Database
+from db import Database, CHAIN_TIP_MAX_AGE_IN_SECS
 
 credits_functions = {
     "mint": {
@@ -55,8 +55,8 @@ def get_relative_time(timestamp):
 
 
 async def out_of_sync_check(db: Database):
-    last_block = await db.get_latest_block()
-    last_timestamp = last_block.header.metadata.timestamp
+    last_header = await db.get_latest_header(max_age=CHAIN_TIP_MAX_AGE_IN_SECS)
+    last_timestamp = last_header.metadata.timestamp
     now = int(time.time())
     maintenance_info = os.environ.get("MAINTENANCE_INFO")
     if now - last_timestamp > 120: